@@ -0,0 +1,325 @@
+import argparse
+from collections import deque
+import json
+import multiprocessing
+from multiprocessing.connection import wait
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from api.cache.snapshot_cache import hash_file
+from api.comparators.houdini_base_comparator import HIP_FILE_FORMATS
+from api.headless import (
+    EXIT_DIFFERENT,
+    EXIT_ERROR,
+    EXIT_IDENTICAL,
+    create_comparator,
+    iter_changes,
+)
+
+
+# Statuses of compared file pairs.
+IDENTICAL = "identical"
+DIFFERENT = "different"
+CREATED = "created"
+DELETED = "deleted"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+BATCH_STATUSES = (IDENTICAL, DIFFERENT, CREATED, DELETED, TIMEOUT, ERROR)
+
+
+def find_hip_files(directory: str) -> Dict[str, str]:
+    """
+    Find HIP files inside of a directory recursively.
+
+    :param directory: The directory to search in.
+    :return: Dictionary with path relative to the directory as key
+             and full path as value.
+    """
+    hip_files = {}
+    for root, _, file_names in os.walk(directory):
+        for file_name in file_names:
+            _, extension = os.path.splitext(file_name)
+            if extension[1:] not in HIP_FILE_FORMATS:
+                continue
+            path = os.path.join(root, file_name)
+            relative_path = os.path.relpath(path, directory).replace(os.sep, "/")
+            hip_files[relative_path] = path
+    return hip_files
+
+
+def pair_hip_files(
+    source_dir: str, target_dir: str
+) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Pair HIP files of two directories by their relative paths.
+
+    :param source_dir: The source directory.
+    :param target_dir: The target directory.
+    :return: Sorted list of (relative path, source path, target path)
+             tuples, a path is None if the file is missing on that side.
+    """
+    source_files = find_hip_files(source_dir)
+    target_files = find_hip_files(target_dir)
+    return [
+        (
+            relative_path,
+            source_files.get(relative_path),
+            target_files.get(relative_path),
+        )
+        for relative_path in sorted(set(source_files) | set(target_files))
+    ]
+
+
+def are_files_identical(source_path: str, target_path: str) -> bool:
+    """
+    Check if two files have the same content.
+
+    Sizes are compared first, so files are hashed only if needed.
+    """
+    if os.path.getsize(source_path) != os.path.getsize(target_path):
+        return False
+    return hash_file(source_path) == hash_file(target_path)
+
+
+def compare_pair_in_worker(
+    connection, args: argparse.Namespace, source_path: str, target_path: str
+) -> None:
+    """
+    Compare a pair of files inside of a worker process.
+
+    Sends ("ok", changes) or ("error", message) through the connection.
+    """
+    try:
+        comparator = create_comparator(args, source_path, target_path)
+        comparator.compare()
+        connection.send(("ok", list(iter_changes(comparator))))
+    except Exception as error:
+        connection.send(("error", f"{type(error).__name__}: {error}"))
+    finally:
+        connection.close()
+
+
+class BatchComparator:
+    """
+    Compare all HIP files of two directories.
+
+    Files are paired by their relative paths. Pairs with the same size
+    and content hash are reported as identical without loading them,
+    the rest is compared in worker processes. Every worker compares
+    a single pair and is terminated if it exceeds the timeout, so
+    a hanging file doesn't block the whole batch.
+    """
+
+    def __init__(
+        self,
+        source_dir: str,
+        target_dir: str,
+        args: argparse.Namespace,
+        jobs: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the batch comparator.
+
+        :param source_dir: The source directory.
+        :param target_dir: The target directory.
+        :param args: Parsed arguments of main.py used to create
+                     comparators of each pair.
+        :param jobs: Maximum number of concurrent worker processes.
+                     Defaults to the number of CPUs.
+        :param timeout: Maximum number of seconds per pair.
+        """
+        for directory in (source_dir, target_dir):
+            if not os.path.isdir(directory):
+                raise ValueError(f"'{directory}' is not a directory.")
+
+        self.source_dir = source_dir
+        self.target_dir = target_dir
+        # Pairs are already compared concurrently.
+        self.args = argparse.Namespace(**dict(vars(args), parallel=False))
+        self.jobs = max(1, jobs or os.cpu_count() or 1)
+        self.timeout = timeout
+
+    def compare(self) -> List[Dict[str, Any]]:
+        """
+        Compare all file pairs.
+
+        :return: A list of file results with "path" and "status" keys,
+                 different files also have "changes" and failed ones
+                 have "error".
+        """
+        results = {}
+        pending = deque()
+        for relative_path, source_path, target_path in pair_hip_files(
+            self.source_dir, self.target_dir
+        ):
+            if source_path is None:
+                results[relative_path] = {"path": relative_path, "status": CREATED}
+            elif target_path is None:
+                results[relative_path] = {"path": relative_path, "status": DELETED}
+            elif are_files_identical(source_path, target_path):
+                results[relative_path] = {
+                    "path": relative_path,
+                    "status": IDENTICAL,
+                }
+            else:
+                pending.append((relative_path, source_path, target_path))
+
+        for result in self._compare_in_workers(pending):
+            results[result["path"]] = result
+
+        return [results[relative_path] for relative_path in sorted(results)]
+
+    def _compare_in_workers(self, pending: deque) -> List[Dict[str, Any]]:
+        """Compare pending pairs, running up to `jobs` workers at once."""
+        context = multiprocessing.get_context("spawn")
+        running = {}
+        results = []
+
+        while pending or running:
+            while pending and len(running) < self.jobs:
+                relative_path, source_path, target_path = pending.popleft()
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=compare_pair_in_worker,
+                    args=(sender, self.args, source_path, target_path),
+                    daemon=True,
+                )
+                process.start()
+                sender.close()
+                deadline = (
+                    time.monotonic() + self.timeout if self.timeout else None
+                )
+                running[receiver] = (relative_path, process, deadline)
+
+            deadlines = [
+                deadline for _, _, deadline in running.values() if deadline
+            ]
+            wait_time = (
+                max(0, min(deadlines) - time.monotonic()) if deadlines else None
+            )
+            for receiver in wait(list(running), timeout=wait_time):
+                relative_path, process, _ = running.pop(receiver)
+                results.append(self._receive_result(relative_path, receiver))
+                receiver.close()
+                process.join()
+
+            now = time.monotonic()
+            for receiver, (relative_path, process, deadline) in list(
+                running.items()
+            ):
+                if deadline and now >= deadline:
+                    process.terminate()
+                    process.join()
+                    receiver.close()
+                    del running[receiver]
+                    results.append(
+                        {
+                            "path": relative_path,
+                            "status": TIMEOUT,
+                            "error": f"Timed out after {self.timeout} s.",
+                        }
+                    )
+
+        return results
+
+    def _receive_result(self, relative_path: str, receiver) -> Dict[str, Any]:
+        """Build a file result from a message sent by a worker."""
+        try:
+            status, payload = receiver.recv()
+        except EOFError:
+            status, payload = "error", "Worker exited unexpectedly."
+
+        if status == "error":
+            return {"path": relative_path, "status": ERROR, "error": payload}
+        return {
+            "path": relative_path,
+            "status": DIFFERENT if payload else IDENTICAL,
+            "changes": payload,
+        }
+
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Return number of file results per status."""
+    summary = {status: 0 for status in BATCH_STATUSES}
+    for result in results:
+        summary[result["status"]] += 1
+    return summary
+
+
+def write_report(
+    results: List[Dict[str, Any]],
+    stream: TextIO,
+    output_format: str,
+    source_dir: str,
+    target_dir: str,
+) -> None:
+    """
+    Write an aggregated report of batch results.
+
+    :param results: Results returned by BatchComparator.compare.
+    :param stream: The stream to write to.
+    :param output_format: "json" for a single document or "ndjson"
+                          for one file result per line.
+    :param source_dir: The source directory.
+    :param target_dir: The target directory.
+    """
+    if output_format == "ndjson":
+        for result in results:
+            stream.write(json.dumps(result) + "\n")
+        return
+
+    json.dump(
+        {
+            "source": source_dir,
+            "target": target_dir,
+            "summary": summarize(results),
+            "files": results,
+        },
+        stream,
+        indent=2,
+    )
+    stream.write("\n")
+
+
+def run_batch(args, stream: Optional[TextIO] = None) -> int:
+    """
+    Compare directories given by parsed command line arguments.
+
+    :param args: Parsed arguments of main.py.
+    :param stream: The stream to write the report to, stdout by default.
+    :return: EXIT_IDENTICAL if all files are identical, EXIT_DIFFERENT
+             if any file differs, was created or deleted and EXIT_ERROR
+             if any pair failed or timed out.
+    """
+    stream = stream or sys.stdout
+    try:
+        batch_comparator = BatchComparator(
+            args.source_file_path,
+            args.target_file_path,
+            args,
+            jobs=args.jobs,
+            timeout=args.timeout,
+        )
+        results = batch_comparator.compare()
+    except (OSError, ValueError) as error:
+        sys.stderr.write(f"Error: {error}\n")
+        return EXIT_ERROR
+
+    write_report(
+        results,
+        stream,
+        args.output_format,
+        args.source_file_path,
+        args.target_file_path,
+    )
+
+    summary = summarize(results)
+    if summary[TIMEOUT] or summary[ERROR]:
+        return EXIT_ERROR
+    if summary[IDENTICAL] != len(results):
+        return EXIT_DIFFERENT
+    return EXIT_IDENTICAL
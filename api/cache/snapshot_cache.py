@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, Optional
+
+
+CACHE_DIR_ENV = "HOUDINI_HIP_DIFF_CACHE_DIR"
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "hip_file_diff_tool"
+)
+DEFAULT_MAX_SIZE = 2 * 1024 ** 3
+
+# Bump whenever NodeData/ParamData layout changes
+# to invalidate snapshots written by older versions.
+SNAPSHOT_FORMAT_VERSION = 8
+
+SNAPSHOT_EXTENSION = ".snapshot"
+STATS_FILE_NAME = "stats.json"
+HASH_CHUNK_SIZE = 1024 ** 2
+
+
+def hash_file(path: str) -> str:
+    """
+    Return a content hash of a given file, reading it in chunks.
+
+    :param path: The path to the file.
+    :return: Hex digest of the file content.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SnapshotCache:
+    """
+    Persistent content-addressed cache of extracted HIP file data.
+
+    Snapshots are keyed by a hash of the HIP file content and
+    the extraction settings, so renamed or copied files are still
+    cache hits while any edit of the file is a miss. The cache is
+    bounded by size, least recently used snapshots are evicted first.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ):
+        """
+        Initialize the cache.
+
+        :param cache_dir: Directory to store snapshots in. Defaults to
+                          HOUDINI_HIP_DIFF_CACHE_DIR environment variable
+                          or ~/.cache/hip_file_diff_tool.
+        :param max_size: Maximum total size of snapshots in bytes.
+        """
+        self.cache_dir = (
+            cache_dir or os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+        )
+        self.max_size = max_size
+
+    def make_key(self, hip_path: str, settings: Dict[str, Any]) -> str:
+        """
+        Build a cache key for a HIP file and extraction settings.
+
+        :param hip_path: The path to the HIP file.
+        :param settings: Settings which affect extracted data.
+        :return: The cache key.
+        """
+        settings = dict(settings, snapshot_version=SNAPSHOT_FORMAT_VERSION)
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(hash_file(hip_path).encode())
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Return a snapshot stored under a given key.
+
+        :param key: The cache key.
+        :return: The snapshot or None if there is no such snapshot.
+        """
+        path = self._get_snapshot_path(key)
+        try:
+            with open(path, "rb") as file:
+                data = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self._update_stats(misses=1)
+            return None
+
+        # Mark snapshot as recently used for the LRU eviction.
+        os.utime(path)
+        self._update_stats(hits=1)
+        return data
+
+    def put(self, key: str, data: dict) -> None:
+        """
+        Store a snapshot under a given key and evict old snapshots.
+
+        :param key: The cache key.
+        :param data: The snapshot, has to be picklable.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir)
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._get_snapshot_path(key))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used snapshots above the size limit."""
+        snapshots = self._list_snapshots()
+        total_size = sum(stat.st_size for _, stat in snapshots)
+
+        for path, stat in sorted(snapshots, key=lambda item: item[1].st_mtime):
+            if total_size <= self.max_size:
+                break
+            os.remove(path)
+            total_size -= stat.st_size
+
+    def clear(self) -> None:
+        """Remove all snapshots and reset statistics."""
+        for path, _ in self._list_snapshots():
+            os.remove(path)
+
+        stats_path = os.path.join(self.cache_dir, STATS_FILE_NAME)
+        if os.path.exists(stats_path):
+            os.remove(stats_path)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return cache statistics.
+
+        :return: Dictionary with hits, misses, number of snapshots
+                 and their total size in bytes.
+        """
+        snapshots = self._list_snapshots()
+        stats = self._read_stats()
+        stats["snapshots"] = len(snapshots)
+        stats["size"] = sum(stat.st_size for _, stat in snapshots)
+        return stats
+
+    def _get_snapshot_path(self, key: str) -> str:
+        """Return the path of a snapshot file for a given key."""
+        return os.path.join(self.cache_dir, key + SNAPSHOT_EXTENSION)
+
+    def _list_snapshots(self) -> list:
+        """Return (path, stat) tuples of all stored snapshots."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        return [
+            (entry.path, entry.stat())
+            for entry in os.scandir(self.cache_dir)
+            if entry.name.endswith(SNAPSHOT_EXTENSION)
+        ]
+
+    def _read_stats(self) -> Dict[str, int]:
+        """Read persisted hit/miss statistics."""
+        stats = {"hits": 0, "misses": 0}
+        try:
+            with open(os.path.join(self.cache_dir, STATS_FILE_NAME)) as file:
+                stats.update(json.load(file))
+        except (OSError, ValueError):
+            pass
+        return stats
+
+    def _update_stats(self, hits: int = 0, misses: int = 0) -> None:
+        """Increment persisted hit/miss statistics."""
+        stats = self._read_stats()
+        stats["hits"] += hits
+        stats["misses"] += misses
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(os.path.join(self.cache_dir, STATS_FILE_NAME), "w") as file:
+            json.dump(stats, file)
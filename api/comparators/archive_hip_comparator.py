@@ -0,0 +1,61 @@
+from typing import Any, Dict, Iterator, Tuple
+
+from api.comparators.houdini_base_comparator import HoudiniComparator
+from api.data.node_data import NodeData
+from api.readers.hip_archive_reader import HipArchiveReader
+
+
+class ArchiveHipFileComparator(HoudiniComparator):
+    """
+    Comparator class for comparing two HIP files without Houdini.
+
+    Node data is read straight from the HIP archive, so neither hython
+    nor a Houdini license is required. Parms are read as they are
+    stored in the file: parm tuples are not split into components
+    and expressions are compared instead of their evaluated values.
+    Values are always read raw, the extraction mode has no effect.
+    Parm defaults are not stored in the archive, so all stored parms
+    are recorded even if skip_defaults is set.
+    """
+
+    def get_extraction_settings(self) -> Dict[str, Any]:
+        """
+        Return settings which affect the extracted data.
+
+        The extraction mode and skip_defaults have no effect on read
+        archives, so they are left out and snapshots read with any of
+        them share cache keys.
+
+        :return: A dictionary used as a part of snapshot cache keys.
+        """
+        settings = super().get_extraction_settings()
+        del settings["mode"]
+        del settings["skip_defaults"]
+        return settings
+
+    def iter_hip_data(self, hip_path: str) -> Iterator[Tuple[str, NodeData]]:
+        """
+        Read nodes of a given HIP file one by one.
+
+        :param hip_path: The path to the HIP file.
+        :return: Iterator over (node path, NodeData) tuples.
+        """
+        if not hip_path:
+            raise ValueError("No source file specified!")
+
+        phase = self._get_extraction_phase(hip_path)
+        return HipArchiveReader(hip_path).iter_nodes(
+            lambda number: self._report_progress(phase, number)
+        )
+
+    def compare(self) -> None:
+        """Compare the source and target HIP files to identify differences."""
+        self._validate_file_paths()
+
+        self.source_nodes, self.target_nodes = (
+            self._get_source_and_target_data()
+        )
+
+        self._compare_data()
+
+        self.is_compared = True
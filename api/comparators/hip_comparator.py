@@ -1,28 +1,56 @@
+from contextlib import contextmanager
+from typing import Any, Iterator, Tuple
+
 import hou
 from api.comparators.houdini_base_comparator import HoudiniComparator
+from api.data.node_data import NodeData
 
 
 class HipFileComparator(HoudiniComparator):
     """Comparator class for comparing two Houdini HIP files."""
 
-    def get_hip_data(self, hip_path: str) -> dict:
+    def iter_hip_data(self, hip_path: str) -> Iterator[Tuple[str, NodeData]]:
         """
-        Retrieve data from a given HIP file.
+        Load a given HIP file and extract its nodes one by one.
+
+        The file stays loaded until the iterator is exhausted,
+        so nothing else may be loaded into Houdini meanwhile.
 
         :param hip_path: The path to the HIP file.
-        :return: A dictionary containing data extracted from the HIP file.
+        :return: Iterator over (node path, NodeData) tuples.
         """
         if not hip_path:
             raise ValueError("No source file specified!")
+        return self._iter_loaded_nodes(hip_path)
 
-        self._load_hip_file(hip_path)
-        data_dict = {}
-        for node in hou.node("/").allNodes():
-            if node.isInsideLockedHDA():
-                continue
-            data_dict[node.path()] = self._extract_node_data(node)
+    def _iter_loaded_nodes(
+        self, hip_path: str
+    ) -> Iterator[Tuple[str, NodeData]]:
+        """Load a HIP file and yield data of nodes outside of locked HDAs."""
+        phase = self._get_extraction_phase(hip_path)
+        with self._update_mode():
+            self._report_progress(phase, 0)
+            self._load_hip_file(hip_path)
+            nodes = hou.node("/").allNodes()
+            for number, node in enumerate(nodes, 1):
+                self._report_progress(phase, number, len(nodes))
+                if node.isInsideLockedHDA():
+                    continue
+                yield node.path(), self._extract_node_data(node)
 
-        return data_dict
+    @contextmanager
+    def _update_mode(self):
+        """Switch Houdini to manual update mode in the raw extraction mode."""
+        if self.extraction_mode != "raw":
+            yield
+            return
+
+        update_mode = hou.updateModeSetting()
+        hou.setUpdateMode(hou.updateMode.Manual)
+        try:
+            yield
+        finally:
+            hou.setUpdateMode(update_mode)
 
     def _load_hip_file(self, hip_path: str) -> None:
         """Load a specified HIP file into Houdini."""
@@ -31,18 +59,52 @@ class HipFileComparator(HoudiniComparator):
             hip_path, suppress_save_prompt=True, ignore_load_warnings=True
         )
 
+    def _get_parm_value(self, parm: "hou.Parm") -> Any:
+        """Return a parm value according to the extraction mode."""
+        if self.extraction_mode == "raw":
+            return self._get_raw_parm_value(parm)
+        return parm.eval()
+
+    def _get_raw_parm_value(self, parm: "hou.Parm") -> Any:
+        """
+        Return a parm value without evaluating it, so nothing is cooked.
+
+        A single expression is returned as is, other animated parms
+        are described by their keyframes. Static string parms return
+        their unexpanded string, the rest returns their raw value.
+
+        :param parm: The parm to read.
+        :return: An expression, a tuple of keyframes or a raw value.
+        """
+        keyframes = parm.keyframes()
+        if len(keyframes) == 1 and keyframes[0].isExpressionSet():
+            return keyframes[0].expression()
+        if keyframes:
+            return tuple(
+                self._describe_keyframe(keyframe) for keyframe in keyframes
+            )
+
+        if parm.parmTemplate().type() == hou.parmTemplateType.String:
+            return parm.unexpandedString()
+        return parm.rawValue()
+
+    def _describe_keyframe(self, keyframe: "hou.BaseKeyframe") -> str:
+        """Return a string with frame, value and expression of a keyframe."""
+        description = f"frame {keyframe.frame():g}"
+        if getattr(keyframe, "isValueSet", lambda: False)():
+            description += f", value {keyframe.value()}"
+        if keyframe.isExpressionSet():
+            description += f", expr {keyframe.expression()}"
+        return description
+
     def compare(self) -> None:
         """Compare the source and target HIP files to identify differences."""
         self._validate_file_paths()
 
-        self.source_nodes = self.get_hip_data(self.source_file)
-        self.target_nodes = self.get_hip_data(self.target_file)
-
-        self._handle_deleted_and_edited_nodes()
-        self._handle_created_nodes()
-        self._handle_created_params()
+        self.source_nodes, self.target_nodes = (
+            self._get_source_and_target_data()
+        )
 
-        self.source_data = self.source_nodes
-        self.target_data = self.target_nodes
+        self._compare_data()
 
         self.is_compared = True
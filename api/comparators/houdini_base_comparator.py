@@ -1,34 +1,175 @@
 from abc import ABC, abstractmethod
-from collections import OrderedDict
+from array import array
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from concurrent.futures import FIRST_EXCEPTION, wait
+import multiprocessing
 import os
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
+from api.cache.snapshot_cache import SnapshotCache
 from api.data.item_data import ItemState
 from api.data.node_data import NodeData
+from api.data.node_graph import Edge, diff_edges, iter_edges, iter_node_edges
+from api.data.node_hashes import compute_content_hash, compute_subtree_hashes
+from api.data.node_similarity import match_nodes
 from api.data.param_data import ParamData
-from api.utilities import ordered_dict_insert, get_ordered_dict_key_index
-
-import hou
+from api.diff_result import (
+    MISSING_INDEX,
+    USER_DATA_PARM_NAME,
+    ConnectionChange,
+    DiffResult,
+    NodeDiff,
+    ParmChange,
+)
+from api.utilities import (
+    compare_numeric_arrays,
+    get_numeric_components,
+    merge_ordered_keys,
+    values_equal,
+)
 
 
 COLORS = {
     "red": "#b50400",
     "green": "#6ba100",
+    "blue": "#2a6fb0",
 }
 
 HIP_FILE_FORMATS = {"hip", "hipnc", "hiplc", "hdt"}
 
+# "eval" compares evaluated parm values, "raw" compares expressions,
+# keyframes and unexpanded strings without cooking any node.
+EXTRACTION_MODES = ("eval", "raw")
+
+PICKLABLE_VALUE_TYPES = (str, int, float, bool, type(None), tuple, list, dict)
+
+# Numbers closer than these tolerances are not reported as edited,
+# so float noise of re-saved files doesn't show up in the diff.
+DEFAULT_ABS_TOLERANCE = 1e-9
+DEFAULT_REL_TOLERANCE = 1e-9
+
+# Progress callbacks are called once per this many processed items.
+PROGRESS_INTERVAL = 256
+# Seconds between cancellation checks while waiting for worker processes.
+CANCEL_POLL_INTERVAL = 0.1
+
+
+class ComparisonCancelled(Exception):
+    """Raised by compare() when the comparison was cancelled."""
+
+
+def make_hip_data_picklable(data_dict: dict) -> dict:
+    """
+    Convert extracted data so it can be pickled.
+
+    Houdini objects can't be pickled, so non-basic parm values
+    (e.g. ramps) are replaced by their string representation.
+    Node types are stored as names already by _extract_node_data.
+
+    :param data_dict: A dictionary containing data extracted from HIP file.
+    :return: The same dictionary, converted in place.
+    """
+    for node_data in data_dict.values():
+        for parm_name in node_data.parms:
+            value = node_data.get_parm_value(parm_name)
+            if not isinstance(value, PICKLABLE_VALUE_TYPES):
+                node_data.parms.set_value(parm_name, str(value))
+
+    return data_dict
+
+
+def _hashes_match(
+    source_node_data: NodeData, target_node_data: NodeData, attribute: str
+) -> bool:
+    """Check if given hashes of both nodes are computed and equal."""
+    source_hash = getattr(source_node_data, attribute, None)
+    return source_hash is not None and source_hash == getattr(
+        target_node_data, attribute, None
+    )
+
+
+def extract_hip_data_in_worker(
+    comparator: "HoudiniComparator", hip_path: str
+) -> dict:
+    """
+    Extract data from a given HIP file inside of a worker process.
+
+    :param comparator: The comparator used for extraction.
+    :param hip_path: The path to the HIP file.
+    :return: A picklable dictionary containing data extracted from HIP file.
+    """
+    return make_hip_data_picklable(comparator.get_hip_data(hip_path))
+
 
 class HoudiniComparator(ABC):
     """Comparator class for comparing two Houdini related files."""
-    def __init__(self, source_file: str, target_file: str):
+    def __init__(
+        self,
+        source_file: str,
+        target_file: str,
+        parallel: bool = False,
+        cache: Optional[SnapshotCache] = None,
+        extraction_mode: str = "eval",
+        skip_defaults: bool = False,
+        abs_tolerance: float = DEFAULT_ABS_TOLERANCE,
+        rel_tolerance: float = DEFAULT_REL_TOLERANCE,
+        detect_moves: bool = True,
+    ):
         """
         Initialize the comparator with source and target files.
 
         :param source_file: Path to the source file.
         :param target_file: Path to the target file.
+        :param parallel: Extract source and target files concurrently
+                         in two worker processes.
+        :param cache: Snapshot cache to reuse previously extracted data.
+        :param extraction_mode: One of EXTRACTION_MODES.
+        :param skip_defaults: Record only parms which are not at their
+                              defaults. Names of all parms are still kept,
+                              so a parm missing on one side is compared
+                              as a default value instead of deleted.
+        :param abs_tolerance: Maximum absolute difference of numeric
+                              parm values which are compared as equal.
+        :param rel_tolerance: Maximum relative difference of numeric
+                              parm values which are compared as equal.
+        :param detect_moves: Pair deleted and created nodes which were
+                             renamed or moved, see _handle_moved_nodes.
         """
+        if extraction_mode not in EXTRACTION_MODES:
+            raise ValueError(
+                f"Unknown extraction mode '{extraction_mode}'. "
+                f"Supported modes are: {', '.join(EXTRACTION_MODES)}."
+            )
+        if abs_tolerance < 0 or rel_tolerance < 0:
+            raise ValueError("Tolerances must not be negative.")
+
         self.source_file = source_file
         self.target_file = target_file
+        self.parallel = parallel
+        self.cache = cache
+        self.extraction_mode = extraction_mode
+        self.skip_defaults = skip_defaults
+        self.abs_tolerance = abs_tolerance
+        self.rel_tolerance = rel_tolerance
+        self.detect_moves = detect_moves
+        self._parm_name_layouts = {}
+
+        # Called with (phase, current, total) as the comparison goes,
+        # total is 0 if it isn't known upfront.
+        self.progress_callback: Optional[Callable[[str, int, int], None]] = None
+        self._cancel_event = threading.Event()
 
         self.source_nodes = OrderedDict()
         self.target_nodes = OrderedDict()
@@ -36,9 +177,50 @@ class HoudiniComparator(ABC):
 
         self.source_data = OrderedDict()
         self.target_data = OrderedDict()
+        self.diff_result: Optional[DiffResult] = None
 
         self.is_compared = False
 
+    def __getstate__(self) -> dict:
+        # Comparators are sent to worker processes for extraction,
+        # callbacks and synchronization primitives can't be pickled.
+        state = self.__dict__.copy()
+        state["progress_callback"] = None
+        del state["_cancel_event"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        """
+        Request cancellation of a running comparison.
+
+        Safe to call from another thread, compare() then raises
+        ComparisonCancelled at the next progress check.
+        """
+        self._cancel_event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def _report_progress(self, phase: str, current: int, total: int = 0) -> None:
+        """
+        Check for cancellation and report progress of a given phase.
+
+        :param phase: Human readable name of the current phase.
+        :param current: Number of items processed so far.
+        :param total: Total number of items, 0 if unknown.
+        """
+        if self._cancel_event.is_set():
+            raise ComparisonCancelled("Comparison was cancelled.")
+        if self.progress_callback and (
+            current % PROGRESS_INTERVAL == 0 or current == total
+        ):
+            self.progress_callback(phase, current, total)
+
     @property
     def source_file(self):
         return self._source_file
@@ -72,7 +254,7 @@ class HoudiniComparator(ABC):
                 "Supported formats are: {', '.join(HIP_FILE_FORMATS)}."
             )
 
-    def _extract_node_data(self, node: hou.Node) -> NodeData:
+    def _extract_node_data(self, node: "hou.Node") -> NodeData:
         """
         Extracts data from a given node.
 
@@ -81,22 +263,22 @@ class HoudiniComparator(ABC):
         """
         node_data = NodeData(node.name())
         node_data.path = node.path()
-        node_data.type = node.type()
-        node_data.icon = node.type().icon()
+        # types are kept as names, so freshly extracted nodes match
+        # nodes of cached snapshots, e.g. when pairing moved nodes
+        node_type = node.type()
+        node_data.type = node_type.name()
+        node_data.icon = node_type.icon()
         node_data.parent_path = self._get_parent_path(node)
 
-        input_connections = [inp_node.name() for inp_node in node.inputs() if inp_node]
-        if input_connections:
-            inp_conn_param = ParamData(
-                "-> input connections", 
-                ", ".join(input_connections), 
-                None
-            )
-            inp_conn_param.icon = False
-            node_data.add_parm(
-                "-> input connections", 
-                inp_conn_param
+        node_data.inputs = tuple(
+            (
+                connection.inputIndex(),
+                connection.inputNode().path(),
+                connection.outputIndex(),
             )
+            for connection in node.inputConnections()
+            if connection.inputNode() is not None
+        )
 
         user_data = node.userDataDict()
         param_user_data = ParamData("userData", None, None)
@@ -104,13 +286,138 @@ class HoudiniComparator(ABC):
             param_user_data.value = user_data
         node_data.user_data = param_user_data
 
-        for parm in node.parms():
+        parms = node.parms()
+        if self.skip_defaults:
+            node_data.present_parms = self._get_parm_name_layout(parms)
+            parms = [parm for parm in parms if not parm.isAtDefault()]
+
+        for parm in parms:
             node_data.add_parm(
-                parm.name(), ParamData(parm.name(), parm.eval(), None)
+                parm.name(),
+                ParamData(parm.name(), self._get_parm_value(parm), None),
             )
 
         return node_data
 
+    def _get_parm_name_layout(self, parms: Tuple["hou.Parm", ...]) -> frozenset:
+        """
+        Return names of given parms as a frozenset shared between nodes.
+
+        Nodes of the same type usually have the same parms, so equal
+        name sets are stored only once.
+        """
+        names = frozenset(parm.name() for parm in parms)
+        return self._parm_name_layouts.setdefault(names, names)
+
+    def _get_parm_value(self, parm: "hou.Parm") -> Any:
+        """Return an evaluated parm value, see HipFileComparator."""
+        return parm.eval()
+
+    def get_extraction_settings(self) -> Dict[str, Any]:
+        """
+        Return settings which affect the extracted data.
+
+        :return: A dictionary used as a part of snapshot cache keys.
+        """
+        comparator_class = type(self)
+        return {
+            "comparator": (
+                f"{comparator_class.__module__}.{comparator_class.__name__}"
+            ),
+            "mode": self.extraction_mode,
+            "skip_defaults": self.skip_defaults,
+        }
+
+    def _get_source_and_target_data(self) -> Tuple[dict, dict]:
+        """
+        Extract data from both source and target files.
+
+        Snapshots found in the cache are reused, the rest is extracted
+        concurrently if parallel extraction is enabled. Falls back to
+        sequential extraction if worker processes can't be started
+        in the current environment.
+
+        :return: A tuple with source and target data dictionaries.
+        """
+        hip_paths = [self.source_file, self.target_file]
+        cache_keys = [None, None]
+        hip_data = [None, None]
+        for index, hip_path in enumerate(hip_paths):
+            hip_data[index], cache_keys[index] = self._get_cached_data(hip_path)
+
+        missing = [index for index, data in enumerate(hip_data) if data is None]
+        extracted = None
+        if self.parallel and len(missing) > 1:
+            try:
+                extracted = self._get_hip_data_in_workers(
+                    [hip_paths[index] for index in missing]
+                )
+            except BrokenProcessPool:
+                pass
+
+        if extracted is None:
+            extracted = [self.get_hip_data(hip_paths[index]) for index in missing]
+
+        for number, (index, data) in enumerate(zip(missing, extracted), 1):
+            self._report_progress("Hashing extracted data", number, len(missing))
+            self._store_extracted_data(data, cache_keys[index])
+            hip_data[index] = data
+
+        return hip_data[0], hip_data[1]
+
+    def _get_cached_data(self, hip_path: str) -> Tuple[Optional[dict], Optional[str]]:
+        """
+        Look up a snapshot of a given file in the cache.
+
+        :param hip_path: The path to the HIP file.
+        :return: A tuple with the cached data, None on a miss,
+                 and the cache key, None if caching is disabled.
+        """
+        if not self.cache:
+            return None, None
+        cache_key = self.cache.make_key(hip_path, self.get_extraction_settings())
+        return self.cache.get(cache_key), cache_key
+
+    def _store_extracted_data(self, data: dict, cache_key: Optional[str]) -> None:
+        """Compute hashes of extracted data and put it into the cache."""
+        compute_subtree_hashes(data)
+        if cache_key:
+            self.cache.put(cache_key, make_hip_data_picklable(data))
+
+    def _get_hip_data_in_workers(self, hip_paths: List[str]) -> List[dict]:
+        """Extract given HIP files at once, each in its own worker process."""
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=len(hip_paths), mp_context=context
+        ) as executor:
+            futures = [
+                executor.submit(extract_hip_data_in_worker, self, hip_path)
+                for hip_path in hip_paths
+            ]
+            pending = set(futures)
+            while pending:
+                try:
+                    self._report_progress(
+                        "Extracting files in workers",
+                        len(futures) - len(pending),
+                        len(futures),
+                    )
+                except ComparisonCancelled:
+                    self._terminate_workers(executor)
+                    raise
+                _, pending = wait(
+                    pending,
+                    timeout=CANCEL_POLL_INTERVAL,
+                    return_when=FIRST_EXCEPTION,
+                )
+            return [future.result() for future in futures]
+
+    def _terminate_workers(self, executor: ProcessPoolExecutor) -> None:
+        """Stop worker processes of an executor without waiting for them."""
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.terminate()
+
     def _validate_file_paths(self) -> None:
         """Validate that both source and target file paths are set."""
         if not self.source_file:
@@ -118,173 +425,691 @@ class HoudiniComparator(ABC):
         if not self.target_file:
             raise ValueError("Error, no target file specified!")
 
-    def _mark_node_as_created(self, path: str):
+    def _compare_data(self) -> None:
         """
-        Mark a node as created and update source data accordingly.
+        Compare extracted source and target data into a DiffResult.
 
-        :param path: The path of the node.
+        Both snapshots are left untouched, the result refers to their
+        nodes by indices, see api.diff_result.
         """
-        new_data = NodeData("")
-        new_data.parent_path = self.target_nodes[path].parent_path
-        new_data.state = ItemState.CREATED
-        index = get_ordered_dict_key_index(self.target_nodes, path)
-
-        self.source_nodes = ordered_dict_insert(
-            self.source_nodes, index, path, new_data
+        self.diff_result = DiffResult(
+            list(self.source_nodes), list(self.target_nodes), []
         )
-        self.source_nodes[path].alpha = 55
-        self.source_nodes[path].is_hatched = True
+        self._handle_deleted_and_edited_nodes()
+        self._handle_created_nodes()
+        self._handle_connections(iter_edges(self.target_nodes))
+        self._handle_change_counts()
 
-        self.target_nodes[path].state = ItemState.CREATED
-        self.target_nodes[path].color = COLORS["green"]
-        self.target_nodes[path].alpha = 55
+        self.source_data = self.source_nodes
+        self.target_data = self.target_nodes
 
-    def _mark_node_as_deleted(self, path: str, source_node_data):
+    def iter_compare(self, keep_target: bool = True) -> Iterator[NodeDiff]:
         """
-        Mark a node as deleted and update target data accordingly.
+        Compare the source and target files, yielding changed nodes
+        as soon as they are found.
 
-        :param path: The path of the node.
-        :param source_node_data: The data associated with the source node.
+        The source snapshot is extracted first, the target is then
+        compared node by node while it's still being extracted, so
+        first changes are known long before the whole target is read.
+        Edited nodes are yielded in the target order, deleted nodes are
+        only known at the end and are yielded last. Created nodes are
+        yielded as they are found unless moves are detected, then they
+        are paired with deleted nodes at the end and yielded after
+        moved nodes. Wires are compared once the whole target is read,
+        nodes whose only changes are wires are yielded then, the target
+        node of such a NodeDiff is None if it isn't kept. Subtrees are
+        not pruned, numeric parms are not compared in bulk and
+        extraction is never parallel.
+
+        diff_result is complete only once the iterator is exhausted,
+        the comparator is then compared the same way as by compare().
+
+        :param keep_target: Keep all target nodes in target_data.
+                            If False, only created nodes are kept, so
+                            just the source snapshot is held in memory.
+                            Ignored if the target is read from or
+                            written to the cache.
+        :return: Iterator over NodeDiff tuples.
         """
-        new_data = NodeData("")
-        new_data.parent_path = source_node_data.parent_path
-        new_data.state = ItemState.DELETED
-        new_data.is_hatched = True
-        index = get_ordered_dict_key_index(self.source_nodes, path)
-        self.target_nodes = ordered_dict_insert(
-            self.target_nodes, index, path, new_data
+        self._validate_file_paths()
+        self.is_compared = False
+
+        source_nodes, source_cache_key = self._get_cached_data(self.source_file)
+        if source_nodes is None:
+            source_nodes = self.get_hip_data(self.source_file)
+            self._store_extracted_data(source_nodes, source_cache_key)
+
+        target_nodes, target_cache_key = self._get_cached_data(self.target_file)
+        if target_nodes is None:
+            target_items = self.iter_hip_data(self.target_file)
+            target_nodes = OrderedDict()
+            keep_target = keep_target or bool(target_cache_key)
+        else:
+            target_items = list(target_nodes.items())
+            keep_target = False
+
+        source_indices = {path: index for index, path in enumerate(source_nodes)}
+        is_matched = bytearray(len(source_indices))
+        self.source_nodes = source_nodes
+        self.target_nodes = target_nodes
+        self.diff_result = diff_result = DiffResult(list(source_nodes), [], [])
+        # target indices of created nodes paired with deleted ones at the end
+        created = []
+        # wires of target nodes, which may not be kept
+        target_edges = []
+
+        for target_index, (path, target_node_data) in enumerate(target_items):
+            self._report_progress("Comparing nodes", target_index + 1)
+            diff_result.target_paths.append(path)
+            target_edges.extend(iter_node_edges(path, target_node_data))
+            if keep_target:
+                target_nodes[path] = target_node_data
+
+            source_index = source_indices.get(path)
+            if source_index is None:
+                target_nodes[path] = target_node_data
+                if self.detect_moves:
+                    created.append(target_index)
+                    continue
+                self._record_created_node(target_index, target_node_data)
+                yield NodeDiff(
+                    path,
+                    ItemState.CREATED,
+                    None,
+                    target_node_data,
+                    dict.fromkeys(target_node_data.parms, ItemState.CREATED),
+                )
+                continue
+
+            is_matched[source_index] = True
+            source_node_data = source_nodes[path]
+            if target_node_data.content_hash is None:
+                target_node_data.content_hash = compute_content_hash(
+                    target_node_data
+                )
+            change_count = len(diff_result.parm_changes)
+            if self._compare_node(
+                source_index, target_index, source_node_data, target_node_data
+            ):
+                yield NodeDiff(
+                    path,
+                    ItemState.EDITED,
+                    source_node_data,
+                    target_node_data,
+                    {
+                        change.parm_name: change.state
+                        for change in diff_result.parm_changes[change_count:]
+                    },
+                )
+
+        diff_result.deleted = [
+            source_index
+            for source_index, is_source_matched in enumerate(is_matched)
+            if not is_source_matched
+        ]
+        if created:
+            created = self._handle_moved_nodes(created)
+            for target_index in created:
+                self._record_created_node(
+                    target_index,
+                    target_nodes[diff_result.target_paths[target_index]],
+                )
+
+        diff_result.paths = merge_ordered_keys(
+            diff_result.source_paths, diff_result.target_paths
         )
+        self._handle_connections(target_edges)
+        self._handle_change_counts()
+        if target_cache_key and target_nodes and keep_target:
+            self._store_extracted_data(target_nodes, target_cache_key)
 
-        source_node_data.state = ItemState.DELETED
-        source_node_data.color = COLORS["red"]
-        source_node_data.alpha = 100
+        for source_index, target_index in diff_result.iter_paired_moves():
+            path = diff_result.source_paths[source_index]
+            state = diff_result.get_node_state(path)
+            parm_states = diff_result.get_parm_states(path)
+            if state != ItemState.MOVED and not parm_states:
+                continue
+            target_path = diff_result.target_paths[target_index]
+            yield NodeDiff(
+                path,
+                state,
+                source_nodes[path],
+                target_nodes[target_path],
+                parm_states,
+                target_path,
+            )
+        for target_index in created:
+            path = diff_result.target_paths[target_index]
+            target_node_data = target_nodes[path]
+            yield NodeDiff(
+                path,
+                ItemState.CREATED,
+                None,
+                target_node_data,
+                dict.fromkeys(target_node_data.parms, ItemState.CREATED),
+            )
+        for source_index in diff_result.deleted:
+            path = diff_result.source_paths[source_index]
+            yield NodeDiff(
+                path, ItemState.DELETED, source_nodes[path], None, {}
+            )
+        edited_paths = {
+            diff_result.source_paths[source_index]
+            for source_index, _ in diff_result.edited
+        }
+        for path, _ in diff_result.iter_connection_rows():
+            if (
+                path not in edited_paths
+                and diff_result.get_node_state(path) == ItemState.EDITED
+            ):
+                target_path = diff_result.get_moved_path(path)
+                yield NodeDiff(
+                    path,
+                    ItemState.EDITED,
+                    source_nodes[path],
+                    target_nodes.get(target_path or path),
+                    {},
+                    target_path,
+                )
+
+        self.source_data = self.source_nodes
+        self.target_data = self.target_nodes
+        self.is_compared = True
+
+    def iter_node_diffs(self) -> Iterator[NodeDiff]:
+        """
+        Iterate over changed nodes of a finished comparison.
+
+        :return: Iterator over NodeDiff tuples in the aligned order,
+                 moved nodes and nodes below them are yielded once
+                 at their source paths.
+        """
+        diff_result = self.diff_result
+        for path in diff_result.iter_changed_paths():
+            if diff_result.get_row_path(path) != path:
+                continue
+            state = diff_result.get_node_state(path)
+            target_path = diff_result.get_moved_path(path)
+            yield NodeDiff(
+                path,
+                state,
+                self.source_data.get(path),
+                self.target_data.get(target_path or path),
+                diff_result.get_parm_states(path),
+                target_path,
+            )
 
     def _handle_deleted_and_edited_nodes(self):
-        """Handle nodes that are deleted or have edited parameters."""
-        for path, source_node_data in self.source_nodes.items():
-            if path not in self.target_nodes:
-                self._mark_node_as_deleted(path, source_node_data)
-            else:
-                self._compare_node_user_data(path, source_node_data)
-                self._compare_node_params(path, source_node_data)
+        """
+        Handle nodes that are deleted or have edited parameters.
 
-    def _compare_node_params(self, path: str, source_node_data: NodeData):
+        Subtrees with equal Merkle hashes on both sides are skipped
+        as a whole, nodes with equal content hashes are not compared
+        parm by parm. Numeric parms of the rest are compared in bulk
+        per node type, see _compare_numeric_parms.
         """
-        Compare parameters of nodes between source and target data.
+        diff_result = self.diff_result
+        pruned_paths = set()
+        # (source index, target index, source node, target node)
+        pairs = []
+        for source_index, (path, source_node_data) in enumerate(
+            self.source_nodes.items()
+        ):
+            self._report_progress(
+                "Comparing nodes", source_index + 1, len(self.source_nodes)
+            )
+            if source_node_data.parent_path in pruned_paths:
+                pruned_paths.add(path)
+                continue
 
-        :param path: The path of the node.
-        :param source_node_data: The data associated with the source node.
+            target_node_data = self.target_nodes.get(path)
+            if target_node_data is None:
+                diff_result.deleted.append(source_index)
+                continue
+
+            if _hashes_match(source_node_data, target_node_data, "subtree_hash"):
+                pruned_paths.add(path)
+                continue
+            if _hashes_match(source_node_data, target_node_data, "content_hash"):
+                continue
+
+            pairs.append(
+                (
+                    source_index,
+                    diff_result.get_target_index(path),
+                    source_node_data,
+                    target_node_data,
+                )
+            )
+
+        numeric_parms = self._compare_numeric_parms(
+            [(pair[2], pair[3]) for pair in pairs]
+        )
+        for pair, pair_numeric_parms in zip(pairs, numeric_parms):
+            self._compare_node(*pair, pair_numeric_parms)
+
+    def _compare_numeric_parms(
+        self, pairs: List[Tuple[NodeData, NodeData]]
+    ) -> List[Dict[str, bool]]:
+        """
+        Compare numeric parms of paired nodes in bulk, per node type.
+
+        Parms recorded on both sides with equal values are settled by
+        plain equality. Components of differing numbers and number
+        tuples are gathered into one pair of float arrays per node
+        type, which are compared within tolerances in a single pass,
+        see compare_numeric_arrays. Only the rest, e.g. differing
+        strings and expressions, is left to be compared parm by parm.
+
+        :param pairs: (source node, target node) tuples.
+        :return: Per pair, whether settled parms are equal by their names.
         """
-        for parm_name in list(source_node_data.parms):
-            source_parm = source_node_data.get_parm_by_name(parm_name)
+        results: List[Dict[str, bool]] = [{} for _ in pairs]
+        numbers_by_type: Dict[str, List[int]] = defaultdict(list)
+        for number, (source_node_data, _) in enumerate(pairs):
+            numbers_by_type[source_node_data.type].append(number)
 
-            # deleted param
-            if parm_name not in self.target_nodes[path].parms:
-                # add empty parm to target data
-                self.source_nodes[path].state = ItemState.EDITED
-                self.source_nodes[path].color = COLORS["red"]
-                self.source_nodes[path].alpha = 100
+        for numbers in numbers_by_type.values():
+            source_components = array("d")
+            target_components = array("d")
+            # (pair number, parm name, component count)
+            layout = []
+            for number in numbers:
+                source_node_data, target_node_data = pairs[number]
+                source_parms = source_node_data.parms
+                target_parms = target_node_data.parms
+                pair_results = results[number]
+                for parm_name in source_parms:
+                    if parm_name not in target_parms:
+                        continue
+                    source_value = source_parms.get_value(parm_name)
+                    target_value = target_parms.get_value(parm_name)
+                    if source_value == target_value:
+                        pair_results[parm_name] = True
+                        continue
+                    # tuples and lists are never equal, like in values_equal
+                    if type(source_value) in (tuple, list) and type(
+                        source_value
+                    ) is not type(target_value):
+                        continue
+                    source_items = get_numeric_components(source_value)
+                    target_items = get_numeric_components(target_value)
+                    if (
+                        source_items is None
+                        or target_items is None
+                        or len(source_items) != len(target_items)
+                    ):
+                        continue
+                    source_components.extend(source_items)
+                    target_components.extend(target_items)
+                    layout.append((number, parm_name, len(source_items)))
 
-                source_parm = self.source_nodes[path].get_parm_by_name(
-                    parm_name
+            is_equal = compare_numeric_arrays(
+                source_components,
+                target_components,
+                self.abs_tolerance,
+                self.rel_tolerance,
+            )
+            start = 0
+            for number, parm_name, count in layout:
+                results[number][parm_name] = all(
+                    is_equal[start:start + count]
                 )
-                source_parm.state = ItemState.EDITED
-                source_parm.color = "red"
-                source_parm.alpha = 55
+                start += count
+        return results
+
+    def _compare_node(
+        self,
+        source_index: int,
+        target_index: int,
+        source_node_data: NodeData,
+        target_node_data: NodeData,
+        numeric_parms: Optional[Dict[str, bool]] = None,
+    ) -> bool:
+        """
+        Record changes of a node present in source and target data.
 
-                self.source_nodes[path].state = ItemState.EDITED
-                self.target_nodes[path].color = COLORS["red"]
-                self.target_nodes[path].alpha = 100
+        Nodes with equal content hashes are not compared parm by parm.
 
-                parm = ParamData(parm_name, "", ItemState.DELETED)
-                parm.alpha = 55
-                parm.is_active = False
-                parm.is_hatched = True
+        :param source_index: The index of the node in source data.
+        :param target_index: The index of the node in target data.
+        :param source_node_data: The data associated with the source node.
+        :param target_node_data: The data associated with the target node.
+        :param numeric_parms: Parms compared by _compare_numeric_parms.
+        :return: True if the node is edited.
+        """
+        if _hashes_match(source_node_data, target_node_data, "content_hash"):
+            return False
 
-                self.target_nodes[path].add_parm(parm_name, parm)
+        diff_result = self.diff_result
+        change_count = len(diff_result.parm_changes)
+        self._compare_node_user_data(
+            source_index, target_index, source_node_data, target_node_data
+        )
+        self._compare_node_params(
+            source_index,
+            target_index,
+            source_node_data,
+            target_node_data,
+            numeric_parms,
+        )
+        if len(diff_result.parm_changes) == change_count:
+            return False
+
+        diff_result.edited.append((source_index, target_index))
+        return True
+
+    def _compare_node_params(
+        self,
+        source_index: int,
+        target_index: int,
+        source_node_data: NodeData,
+        target_node_data: NodeData,
+        numeric_parms: Optional[Dict[str, bool]] = None,
+    ):
+        """
+        Compare parameters of a node present in source and target data.
+
+        Parms at default on one side are compared as edited, other
+        parms missing on one side as deleted or created. Parms at
+        default on one side and missing on the other are deleted or
+        created as well, when both sides skipped defaults. Changes are
+        recorded in source parm order, followed by created parms.
+
+        :param source_index: The index of the node in source data.
+        :param target_index: The index of the node in target data.
+        :param source_node_data: The data associated with the source node.
+        :param target_node_data: The data associated with the target node.
+        :param numeric_parms: Parms compared by _compare_numeric_parms,
+                              the rest is compared by values_equal.
+        """
+        parm_changes = self.diff_result.parm_changes
+        target_parms = target_node_data.parms
+        numeric_parms = numeric_parms or {}
+        for parm_name in source_node_data.parms:
+            if parm_name not in target_parms:
+                state = (
+                    ItemState.EDITED
+                    if target_node_data.is_parm_at_default(parm_name)
+                    else ItemState.DELETED
+                )
+            elif numeric_parms.get(parm_name) or (
+                parm_name not in numeric_parms
+                # compare bare values, so no ParamData is created
+                and values_equal(
+                    source_node_data.get_parm_value(parm_name),
+                    target_node_data.get_parm_value(parm_name),
+                    self.abs_tolerance,
+                    self.rel_tolerance,
+                )
+            ):
                 continue
+            else:
+                state = ItemState.EDITED
 
-            target_parm = self.target_nodes[path].get_parm_by_name(parm_name)
+            parm_changes.append(
+                ParmChange(source_index, target_index, parm_name, state)
+            )
 
-            if str(source_parm.value) == str(target_parm.value):
+        source_parms = source_node_data.parms
+        for parm_name in target_parms:
+            if parm_name in source_parms:
                 continue
+            state = (
+                ItemState.EDITED
+                if source_node_data.is_parm_at_default(parm_name)
+                else ItemState.CREATED
+            )
+            parm_changes.append(
+                ParmChange(source_index, target_index, parm_name, state)
+            )
+
+        source_present = source_node_data.present_parms
+        target_present = target_node_data.present_parms
+        if source_present is None or target_present is None:
+            return
+        # recorded parms were compared above, sorted as sets are unordered
+        for parm_names, parms, state in (
+            (source_present - target_present, source_parms, ItemState.DELETED),
+            (target_present - source_present, target_parms, ItemState.CREATED),
+        ):
+            for parm_name in sorted(parm_names):
+                if parm_name in parms:
+                    continue
+                parm_changes.append(
+                    ParmChange(source_index, target_index, parm_name, state)
+                )
+
+    def _compare_node_user_data(
+        self,
+        source_index: int,
+        target_index: int,
+        source_node_data: NodeData,
+        target_node_data: NodeData,
+    ):
+        """
+        Compare userData dict of a node present in source and target data.
+
+        :param source_index: The index of the node in source data.
+        :param target_index: The index of the node in target data.
+        :param source_node_data: The data associated with the source node.
+        :param target_node_data: The data associated with the target node.
+        """
+        source_value = getattr(source_node_data.user_data, "value", None)
+        target_value = getattr(target_node_data.user_data, "value", None)
+        if source_value == target_value:
+            return
+
+        self.diff_result.parm_changes.append(
+            ParmChange(
+                source_index,
+                target_index,
+                USER_DATA_PARM_NAME,
+                ItemState.EDITED,
+            )
+        )
 
-            source_parm.state = ItemState.EDITED
-            source_parm.color = COLORS["red"]
-            source_parm.alpha = 55
+    def _handle_created_nodes(self):
+        """
+        Handle nodes that are newly created.
 
-            source_node_data.state = ItemState.EDITED
-            source_node_data.color = COLORS["red"]
-            source_node_data.alpha = 100
+        Renamed and moved nodes are paired first, parms of the rest
+        are recorded as created. Source and target orderings are merged
+        in a single linear pass, so views can show rows of both trees
+        aligned without any placeholders being stored in the data.
+        """
+        diff_result = self.diff_result
+        created = []
+        for target_index, path in enumerate(self.target_nodes):
+            self._report_progress(
+                "Aligning nodes", target_index + 1, len(self.target_nodes)
+            )
+            if path not in self.source_nodes:
+                created.append(target_index)
 
-            target_parm.state = ItemState.EDITED
-            target_parm.color = COLORS["green"]
-            target_parm.alpha = 55
+        if self.detect_moves:
+            created = self._handle_moved_nodes(created)
+        for target_index in created:
+            self._record_created_node(
+                target_index,
+                self.target_nodes[diff_result.target_paths[target_index]],
+            )
 
-            self.target_nodes[path].state = ItemState.EDITED
-            self.target_nodes[path].color = COLORS["green"]
-            self.target_nodes[path].alpha = 100
+        diff_result.paths = merge_ordered_keys(
+            self.source_nodes, self.target_nodes
+        )
 
-    def _compare_node_user_data(self, path: str, source_node_data: NodeData):
+    def _handle_moved_nodes(self, created: List[int]) -> List[int]:
         """
-        Compare userData dict of nodes between source and target data.
+        Pair deleted and created nodes which were renamed or moved.
 
-        :param path: The path of the node.
-        :param source_node_data: The data associated with the source node.
+        Nodes are paired by similarity of their types, parms, inputs
+        and children, see api.data.node_similarity. A moved subtree is
+        matched once by its root, nodes below it are paired by their
+        relative paths. Paired nodes are recorded with only their real
+        parm changes instead of a deleted node and a created node with
+        all its parms, but only roots of moved subtrees are recorded as
+        moved, nodes below them are edited or unchanged.
+
+        :param created: Target indices of nodes missing in the source.
+        :return: Target indices of nodes which remain created.
         """
-        source_user_data_parm = source_node_data.user_data
+        diff_result = self.diff_result
+        source_indices = {
+            diff_result.source_paths[index]: index
+            for index in diff_result.deleted
+        }
+        target_indices = {
+            diff_result.target_paths[index]: index for index in created
+        }
+        matches = match_nodes(
+            {path: self.source_nodes[path] for path in source_indices},
+            {path: self.target_nodes[path] for path in target_indices},
+        )
+        pairs = matches.moved + matches.descendants
+        if not pairs:
+            return created
 
-        node_from_target_scene = self.target_nodes[path]
-        target_user_data_parm = node_from_target_scene.user_data
+        node_pairs = [
+            (self.source_nodes[source_path], self.target_nodes[target_path])
+            for source_path, target_path in pairs
+        ]
+        numeric_parms = self._compare_numeric_parms(node_pairs)
+        for number, (source_path, target_path) in enumerate(pairs, 1):
+            self._report_progress("Matching moved nodes", number, len(pairs))
+            source_index = source_indices.pop(source_path)
+            target_index = target_indices.pop(target_path)
+            source_node_data, target_node_data = node_pairs[number - 1]
+            if number > len(matches.moved):
+                # nodes below moved ones are edited like nodes in place
+                self._compare_node(
+                    source_index,
+                    target_index,
+                    source_node_data,
+                    target_node_data,
+                    numeric_parms[number - 1],
+                )
+                diff_result.moved_descendants.append(
+                    (source_index, target_index)
+                )
+                continue
 
-        if source_user_data_parm.value == target_user_data_parm.value:
-            return
+            if not _hashes_match(
+                source_node_data, target_node_data, "content_hash"
+            ):
+                self._compare_node_user_data(
+                    source_index, target_index, source_node_data, target_node_data
+                )
+                self._compare_node_params(
+                    source_index,
+                    target_index,
+                    source_node_data,
+                    target_node_data,
+                    numeric_parms[number - 1],
+                )
+            diff_result.moved.append((source_index, target_index))
 
-        source_user_data_parm.state = ItemState.EDITED
-        source_user_data_parm.alpha = 100
-        source_user_data_parm.color = COLORS["red"]
-        self.source_nodes[path].user_data = source_user_data_parm
-
-        target_user_data_parm.state = ItemState.EDITED
-        target_user_data_parm.alpha = 55
-        target_user_data_parm.color = COLORS["green"]
-        self.target_nodes[path].user_data = target_user_data_parm
-
-    def _handle_created_params(self):
-        """Handle items for node params that are newly created."""
-        for path, target_data in self.target_nodes.items():
-            for parm_name in list(target_data.parms):
-                if parm_name in self.source_nodes[path].parms:
-                    continue
+        diff_result.deleted = list(source_indices.values())
+        return list(target_indices.values())
 
-                # created param
-                target_parm = target_data.get_parm_by_name(parm_name)
-                target_parm.state = ItemState.CREATED
-                target_parm.color = COLORS["green"]
-                target_parm.alpha = 55
+    def _handle_connections(self, target_edges: Iterable[Edge]) -> None:
+        """
+        Diff wires of the whole source and target graphs at once.
 
-                target_data.state = ItemState.EDITED
-                target_data.color = COLORS["green"]
-                target_data.alpha = 100
+        Wires of renamed and moved nodes, and of nodes below them, are
+        compared at their target paths, so only real rewiring is reported.
 
-                parm = ParamData(parm_name, "", ItemState.CREATED)
-                parm.alpha = 55
-                parm.is_hatched = True
-                parm.is_active = False
+        :param target_edges: All edges of the target graph.
+        """
+        diff_result = self.diff_result
+        moved_paths = {
+            diff_result.source_paths[source_index]: (
+                diff_result.target_paths[target_index]
+            )
+            for source_index, target_index in diff_result.iter_paired_moves()
+        }
+        changes = diff_edges(
+            iter_edges(self.source_nodes), target_edges, moved_paths
+        )
+        for number, (source_edge, target_edge) in enumerate(changes, 1):
+            self._report_progress(
+                "Comparing connections", number, len(changes)
+            )
+            if source_edge is None:
+                state = ItemState.CREATED
+            elif target_edge is None:
+                state = ItemState.DELETED
+            else:
+                state = ItemState.EDITED
+            diff_result.connection_changes.append(
+                ConnectionChange(source_edge, target_edge, state)
+            )
+
+    def _record_created_node(
+        self, target_index: int, target_node_data: NodeData
+    ) -> None:
+        """Record a created node and all its parms as created."""
+        diff_result = self.diff_result
+        diff_result.created.append(target_index)
+        for parm_name in target_node_data.parms:
+            diff_result.parm_changes.append(
+                ParmChange(
+                    MISSING_INDEX, target_index, parm_name, ItemState.CREATED
+                )
+            )
 
-                self.source_nodes[path].add_parm(parm_name, parm)
+    def _handle_change_counts(self):
+        """
+        Record change counts of changed nodes and all their ancestors.
+
+        Every changed parm and changed user data counts as a change,
+        as does every row of changed wires. A changed node without any
+        of them (e.g. an empty created node) and a deleted node count
+        as one change, a move counts as one more. Counts are added
+        to all ancestors, so views can tell if a subtree has changes
+        with a single lookup instead of walking it. Changes of a moved
+        node are added under both its paths, common ancestors count
+        them once.
+        """
+        diff_result = self.diff_result
+        node_changes = Counter(
+            diff_result.get_change_path(change)
+            for change in diff_result.parm_changes
+        )
+        for path, rows in diff_result.iter_connection_rows():
+            node_changes[path] += len(rows)
+        for index in diff_result.created:
+            path = diff_result.target_paths[index]
+            node_changes[path] = node_changes[path] or 1
+        for index in diff_result.deleted:
+            node_changes[diff_result.source_paths[index]] = 1
+        for source_index, _ in diff_result.moved:
+            node_changes[diff_result.source_paths[source_index]] += 1
 
-                self.source_nodes[path].state = ItemState.EDITED
-                self.source_nodes[path].alpha = 100
+        change_counts = {}
+        for number, (path, changes) in enumerate(node_changes.items(), 1):
+            self._report_progress("Counting changes", number, len(node_changes))
+            counted_paths = set()
+            for path in (path, diff_result.get_moved_path(path)):
+                while path is not None and path not in counted_paths:
+                    counted_paths.add(path)
+                    change_counts[path] = change_counts.get(path, 0) + changes
+                    path = self._get_node_parent_path(path)
+        diff_result.change_counts = change_counts
 
-    def _handle_created_nodes(self):
-        """Handle nodes that are newly created."""
-        source_paths = set(self.source_nodes.keys())
-        target_paths = set(self.target_nodes.keys())
+    def _get_node_parent_path(self, path: str) -> Optional[str]:
+        """Return the parent path of a node present on either side."""
+        node_data = self.source_nodes.get(path)
+        if node_data is None:
+            node_data = self.target_nodes[path]
+        parent_path = node_data.parent_path
+        if not parent_path or parent_path == path:
+            return None
+        return parent_path
 
-        # Faster set difference operation
-        for path in (target_paths - source_paths):  
-            self._mark_node_as_created(path)
+    def _get_extraction_phase(self, hip_path: str) -> str:
+        """Return the progress phase name of extracting a given file."""
+        return f"Extracting {os.path.basename(hip_path)}"
 
     def _get_parent_path(self, node) -> str:
         """Return the path of a node's parent or None if no parent is found."""
@@ -293,6 +1118,27 @@ class HoudiniComparator(ABC):
         except AttributeError:
             return None
 
+    def get_hip_data(self, hip_path: str) -> dict:
+        """
+        Retrieve data from a given HIP file.
+
+        :param hip_path: The path to the HIP file.
+        :return: A dictionary with node path as key and NodeData as value.
+        """
+        return OrderedDict(self.iter_hip_data(hip_path))
+
+    @abstractmethod
+    def iter_hip_data(self, hip_path: str) -> Iterator[Tuple[str, NodeData]]:
+        """
+        Abstract method for retrieving data from a given HIP file
+        node by node, parents before their children.
+        To be implemented by the child classes.
+        """
+        raise NotImplementedError(
+            "The iter_hip_data method is an abstract one "
+            "and should be implemented."
+        )
+
     @abstractmethod
     def compare(self) -> None:
         """
@@ -13,6 +13,7 @@ class ItemState(Enum):
     DELETED = auto()
     CREATED = auto()
     VALUE = auto()
+    MOVED = auto()
 
     def __str__(self):
         return f"{self.name.lower()}"
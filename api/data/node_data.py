@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Optional, Tuple
 from api.data.item_data import ItemData
+from api.data.parm_store import ParmStore
 
 
 @dataclass
@@ -15,17 +16,57 @@ class NodeData(ItemData):
 
         :param name: The name of the node.
         """
-        super().__init__(name)
+        super().__init__(name, parms=ParmStore())
+        # Merkle hashes, see api.data.node_hashes.compute_subtree_hashes.
+        self.content_hash: Optional[str] = None
+        self.subtree_hash: Optional[str] = None
+        # Names of all node parms if parms at default were not recorded.
+        self.present_parms: Optional[frozenset] = None
+        # Connected inputs as (input index, input node path, output index)
+        # ordered by input index, see api.data.node_graph.
+        self.inputs: Tuple[Tuple[int, str, int], ...] = ()
 
     def add_parm(self, name: str, param: Any) -> None:
         """
         Add a parameter to the node's parameter dictionary.
 
+        ParamData without any diff or UI state is stored compactly,
+        use get_parm_by_name to access the stored instance.
+
         :param name: The name of the parameter.
         :param param: The parameter data to be added.
         """
         self.parms[name] = param
 
+    def get_parm_value(self, name: str) -> Any:
+        """
+        Retrieve a parameter value by its name without creating ParamData.
+
+        :param name: The name of the parameter.
+        :return: The value of the parameter.
+        :raises ValueError: If the parameter name is not found
+                            in the dictionary.
+        """
+        if name not in self.parms:
+            raise ValueError(
+                f"Parameter '{name}' is not found in the dictionary."
+            )
+
+        return self.parms.get_value(name)
+
+    def is_parm_at_default(self, name: str) -> bool:
+        """
+        Check if a parm exists on the node but was skipped as default.
+
+        :param name: The name of the parameter.
+        :return: True if the parm is present but not recorded.
+        """
+        return (
+            self.present_parms is not None
+            and name not in self.parms
+            and name in self.present_parms
+        )
+
     def get_parm_by_name(self, name: str) -> Any:
         """
         Retrieve a parameter by its name from the node's parameter dictionary.
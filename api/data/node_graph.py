@@ -0,0 +1,82 @@
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from api.data.node_data import NodeData
+
+
+class Edge(NamedTuple):
+    """A wire from an output of one node to an input of another node."""
+
+    from_path: str
+    output_index: int
+    to_path: str
+    input_index: int
+
+
+def iter_node_edges(path: str, node_data: NodeData) -> Iterator[Edge]:
+    """Iterate over wires connected to inputs of a node."""
+    for input_index, from_path, output_index in node_data.inputs:
+        yield Edge(from_path, output_index, path, input_index)
+
+
+def iter_edges(nodes: Dict[str, NodeData]) -> Iterator[Edge]:
+    """
+    Iterate over all wires of a graph.
+
+    Every wire is recorded as an input of the node it leads to,
+    so output adjacency follows from the same set of edges.
+
+    :param nodes: A dictionary with node path as key and NodeData as value.
+    :return: Iterator over edges in node order.
+    """
+    for path, node_data in nodes.items():
+        yield from iter_node_edges(path, node_data)
+
+
+def diff_edges(
+    source_edges: Iterable[Edge],
+    target_edges: Iterable[Edge],
+    moved_paths: Optional[Dict[str, str]] = None,
+) -> List[Tuple[Optional[Edge], Optional[Edge]]]:
+    """
+    Diff wires of two graphs at once.
+
+    Edges are keyed by the input they lead to, as an input takes
+    a single wire, so both graphs are compared in a single pass
+    over each of them.
+
+    :param source_edges: Edges of the source graph.
+    :param target_edges: Edges of the target graph.
+    :param moved_paths: Source paths of renamed or moved nodes mapped
+                        to their target paths, so their wires are
+                        compared as if they were not moved.
+    :return: (source edge, target edge) pairs of changed inputs,
+             the source edge is None for added wires, the target
+             edge for removed ones, both are set for rewired inputs.
+    """
+    moved_paths = moved_paths or {}
+    source_inputs = {}
+    for edge in source_edges:
+        moved_edge = Edge(
+            moved_paths.get(edge.from_path, edge.from_path),
+            edge.output_index,
+            moved_paths.get(edge.to_path, edge.to_path),
+            edge.input_index,
+        )
+        source_inputs[(moved_edge.to_path, edge.input_index)] = (
+            edge,
+            moved_edge,
+        )
+
+    changes = []
+    target_inputs = set()
+    for edge in target_edges:
+        key = (edge.to_path, edge.input_index)
+        target_inputs.add(key)
+        source_edge, moved_edge = source_inputs.get(key, (None, None))
+        if moved_edge != edge:
+            changes.append((source_edge, edge))
+
+    for key, (source_edge, _) in source_inputs.items():
+        if key not in target_inputs:
+            changes.append((source_edge, None))
+    return changes
@@ -0,0 +1,79 @@
+from collections import defaultdict
+import hashlib
+from typing import Dict, List
+
+from api.data.node_data import NodeData
+
+
+HASH_DIGEST_SIZE = 16
+
+
+def compute_content_hash(node_data: NodeData) -> str:
+    """
+    Return a hash of node content which is compared by comparators.
+
+    Parms are hashed by their names and string values, the same way
+    they are compared, so nodes with equal hashes have no differences.
+
+    :param node_data: The node to hash.
+    :return: Hex digest of parms, input connections and user data.
+    """
+    digest = hashlib.blake2b(digest_size=HASH_DIGEST_SIZE)
+    for parm_name in node_data.parms:
+        value = node_data.get_parm_value(parm_name)
+        digest.update(f"{parm_name}\0{value}\0".encode("utf-8", "replace"))
+
+    for input_index, input_path, output_index in node_data.inputs:
+        digest.update(
+            f"\2{input_index}\0{input_path}\0{output_index}\0".encode(
+                "utf-8", "replace"
+            )
+        )
+
+    if node_data.present_parms is not None:
+        # parms skipped as default still exist on the node
+        for parm_name in sorted(node_data.present_parms):
+            digest.update(f"\3{parm_name}\0".encode("utf-8", "replace"))
+
+    user_data = getattr(node_data.user_data, "value", None)
+    digest.update(f"\1{user_data!r}".encode("utf-8", "replace"))
+    return digest.hexdigest()
+
+
+def compute_subtree_hashes(nodes: Dict[str, NodeData]) -> None:
+    """
+    Compute content and subtree hashes of all given nodes in place.
+
+    The subtree hash of a node rolls up its content hash with names
+    and subtree hashes of its children, so two nodes with equal subtree
+    hashes have identical networks below them.
+
+    :param nodes: A dictionary with node path as key and NodeData as value.
+    """
+    children: Dict[str, List[str]] = defaultdict(list)
+    roots = []
+    for path, node_data in nodes.items():
+        node_data.content_hash = compute_content_hash(node_data)
+        if node_data.parent_path in nodes and node_data.parent_path != path:
+            children[node_data.parent_path].append(path)
+        else:
+            roots.append(path)
+
+    # Iterative post-order, so deep networks don't hit recursion limit.
+    stack = [(path, False) for path in roots]
+    while stack:
+        path, children_done = stack.pop()
+        if not children_done:
+            stack.append((path, True))
+            stack.extend((child, False) for child in children[path])
+            continue
+
+        digest = hashlib.blake2b(digest_size=HASH_DIGEST_SIZE)
+        digest.update(nodes[path].content_hash.encode())
+        for child in sorted(children[path]):
+            digest.update(
+                f"\0{nodes[child].name}\0{nodes[child].subtree_hash}".encode(
+                    "utf-8", "replace"
+                )
+            )
+        nodes[path].subtree_hash = digest.hexdigest()
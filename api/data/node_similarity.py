@@ -0,0 +1,338 @@
+from collections import Counter, defaultdict
+import hashlib
+import itertools
+import operator
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from api.data.node_data import NodeData
+
+
+# Number of MinHash slots and LSH bands of a signature, two nodes
+# become candidates if all slots of at least one band are equal.
+SIGNATURE_SIZE = 32
+BAND_COUNT = 8
+BAND_SIZE = SIGNATURE_SIZE // BAND_COUNT
+
+# Minimum estimated Jaccard similarity of nodes paired as moved.
+SIMILARITY_THRESHOLD = 0.7
+
+# Inputs and children are counted this many times, as they tell
+# unrelated nodes of a type apart better than parm values.
+STRUCTURE_WEIGHT = 4
+
+# Parm values shared by this ratio of nodes of a type are treated
+# as its defaults, when there are enough nodes of the type.
+COMMON_VALUE_RATIO = 0.5
+COMMON_VALUE_MIN_NODES = 3
+
+# Candidates verified per node, bounds the work for many identical nodes.
+MAX_CANDIDATES = 64
+
+_EMPTY_SLOT = 1 << 64
+
+
+class NodeMatches(NamedTuple):
+    """
+    Nodes paired by match_nodes, as (source path, target path) pairs.
+
+    Moved pairs are renamed or moved nodes matched by their similarity,
+    descendant pairs are nodes below them, paired by their paths
+    relative to the moved nodes, which didn't move on their own.
+    """
+
+    moved: List[Tuple[str, str]]
+    descendants: List[Tuple[str, str]]
+
+
+def get_node_features(
+    node_data: NodeData,
+    children: Optional[List[NodeData]] = None,
+    common_features: Optional[Set[Tuple[str, str]]] = None,
+) -> Set[str]:
+    """
+    Return features of a node compared by its MinHash signature.
+
+    Parms are included by their names and string values the same way
+    they are hashed by compute_content_hash, except parms at defaults:
+    parms skipped as defaults are not recorded, and as defaults aren't
+    known otherwise, values common to a type are left out instead.
+    Inputs are included by names of connected nodes, so wires of nodes
+    which were moved along with their inputs still match. Inputs and
+    children are counted STRUCTURE_WEIGHT times.
+
+    :param node_data: The node to describe.
+    :param children: Child nodes, their names and types describe
+                     the shape of the subtree below the node.
+    :param common_features: (node type, parm feature) pairs to leave
+                            out, see get_common_features.
+    :return: Set of feature strings.
+    """
+    features = {f"type\0{node_data.type}"}
+    for feature in _iter_parm_features(node_data):
+        if (node_data.type, feature) not in (common_features or ()):
+            features.add(feature)
+
+    user_data = getattr(node_data.user_data, "value", None)
+    if user_data:
+        features.add(f"user_data\0{user_data!r}")
+
+    structure = [
+        f"input\0{input_index}\0{input_path.rsplit('/', 1)[-1]}"
+        f"\0{output_index}"
+        for input_index, input_path, output_index in node_data.inputs
+    ]
+    structure.extend(
+        f"child\0{child.name}\0{child.type}" for child in children or ()
+    )
+    for feature in structure:
+        features.update(
+            f"{feature}\0{copy}" for copy in range(STRUCTURE_WEIGHT)
+        )
+    return features
+
+
+def get_common_features(nodes: Iterable[NodeData]) -> Set[Tuple[str, str]]:
+    """
+    Return parm features shared by most nodes of their type.
+
+    Values which most nodes of a type share are likely its defaults,
+    which don't tell unrelated nodes apart. Types with fewer than
+    COMMON_VALUE_MIN_NODES nodes have no common features.
+
+    :param nodes: Nodes to be paired, of both sides.
+    :return: (node type, parm feature) pairs.
+    """
+    type_counts: Dict[str, int] = Counter()
+    feature_counts: Dict[Tuple[str, str], int] = Counter()
+    for node_data in nodes:
+        type_counts[node_data.type] += 1
+        for feature in _iter_parm_features(node_data):
+            feature_counts[(node_data.type, feature)] += 1
+
+    return {
+        key
+        for key, count in feature_counts.items()
+        if type_counts[key[0]] >= COMMON_VALUE_MIN_NODES
+        and count >= type_counts[key[0]] * COMMON_VALUE_RATIO
+    }
+
+
+def _iter_parm_features(node_data: NodeData) -> Iterator[str]:
+    """Iterate over features of recorded parms of a node."""
+    for parm_name in node_data.parms:
+        value = node_data.get_parm_value(parm_name)
+        yield f"parm\0{parm_name}\0{value}"
+
+
+def compute_signature(features: Set[str]) -> Tuple[int, ...]:
+    """
+    Compute a MinHash signature of given features.
+
+    Uses one permutation hashing: every feature is hashed once into
+    one of the slots, which keeps the minimum. Empty slots are filled
+    from the next filled slot, so signatures of small feature sets
+    stay comparable slot by slot.
+
+    :param features: Features returned by get_node_features.
+    :return: Tuple of SIGNATURE_SIZE integers.
+    """
+    slots = [_EMPTY_SLOT] * SIGNATURE_SIZE
+    for feature in features:
+        value = int.from_bytes(
+            hashlib.blake2b(
+                feature.encode("utf-8", "replace"), digest_size=8
+            ).digest(),
+            "little",
+        )
+        slot = value % SIGNATURE_SIZE
+        if value < slots[slot]:
+            slots[slot] = value
+
+    if all(value == _EMPTY_SLOT for value in slots):
+        return tuple(slots)
+
+    signature = []
+    for slot, value in enumerate(slots):
+        distance = 0
+        while value == _EMPTY_SLOT:
+            distance += 1
+            value = slots[(slot + distance) % SIGNATURE_SIZE]
+        signature.append(value + distance * _EMPTY_SLOT)
+    return tuple(signature)
+
+
+def estimate_similarity(
+    signature: Tuple[int, ...], other_signature: Tuple[int, ...]
+) -> float:
+    """Estimate Jaccard similarity of features of two signatures."""
+    return sum(map(operator.eq, signature, other_signature)) / SIGNATURE_SIZE
+
+
+def match_nodes(
+    source_nodes: Dict[str, NodeData], target_nodes: Dict[str, NodeData]
+) -> NodeMatches:
+    """
+    Pair renamed and moved nodes by their similarity.
+
+    Nodes are paired only with nodes of the same type. Source nodes
+    are paired in order, parents before their children: a child of
+    a paired node is paired with the same named child of its
+    counterpart as a descendant, so a moved subtree is matched once
+    by its root. Other nodes are paired with the most similar
+    candidate above SIMILARITY_THRESHOLD, preferring the counterpart
+    of their parent. Candidates are found through LSH buckets, so
+    pairing stays near-linear.
+
+    :param source_nodes: Source nodes missing in the target,
+                         parents before their children.
+    :param target_nodes: Target nodes missing in the source,
+                         parents before their children.
+    :return: Moved and descendant pairs, each in the source order.
+    """
+    matches = NodeMatches([], [])
+    if not source_nodes or not target_nodes:
+        return matches
+
+    common_features = get_common_features(
+        itertools.chain(source_nodes.values(), target_nodes.values())
+    )
+    source_signatures = _compute_signatures(source_nodes, common_features)
+    target_signatures = _compute_signatures(target_nodes, common_features)
+
+    buckets: Dict[tuple, Dict[str, None]] = defaultdict(dict)
+    target_keys: Dict[str, List[tuple]] = {}
+    named_targets: Dict[Tuple[str, str], str] = {}
+    for path, node_data in target_nodes.items():
+        keys = _get_band_keys(node_data, target_signatures[path])
+        target_keys[path] = keys
+        for key in keys:
+            # dicts keep candidates in the target order
+            buckets[key][path] = None
+        named_targets[(node_data.parent_path, node_data.name)] = path
+
+    counterparts: Dict[str, str] = {}
+    for path, node_data in source_nodes.items():
+        pairs = matches.moved
+        parent_path = counterparts.get(node_data.parent_path)
+        target_path = None
+        if parent_path is not None:
+            target_path = named_targets.get((parent_path, node_data.name))
+        if (
+            target_path is not None
+            and target_path in target_keys
+            and target_nodes[target_path].type == node_data.type
+        ):
+            # the same node below the moved one, whatever its changes
+            pairs = matches.descendants
+        else:
+            if parent_path is None:
+                parent_path = node_data.parent_path
+            target_path = _find_most_similar(
+                node_data,
+                parent_path,
+                source_signatures[path],
+                _iter_candidates(
+                    _get_band_keys(node_data, source_signatures[path]),
+                    buckets,
+                ),
+                target_nodes,
+                target_signatures,
+            )
+        if target_path is None:
+            continue
+
+        for key in target_keys.pop(target_path):
+            del buckets[key][target_path]
+        counterparts[path] = target_path
+        pairs.append((path, target_path))
+
+    return matches
+
+
+def _compute_signatures(
+    nodes: Dict[str, NodeData], common_features: Set[Tuple[str, str]]
+) -> Dict[str, Tuple[int, ...]]:
+    """Compute signatures of nodes including their unpaired children."""
+    children: Dict[str, List[NodeData]] = defaultdict(list)
+    for path, node_data in nodes.items():
+        if node_data.parent_path != path:
+            children[node_data.parent_path].append(node_data)
+
+    return {
+        path: compute_signature(
+            get_node_features(
+                node_data, children.get(path), common_features
+            )
+        )
+        for path, node_data in nodes.items()
+    }
+
+
+def _get_band_keys(
+    node_data: NodeData, signature: Tuple[int, ...]
+) -> List[tuple]:
+    """Return LSH bucket keys of a node, only nodes of a type share them."""
+    node_type = node_data.type
+    return [
+        (band, node_type, signature[band * BAND_SIZE:(band + 1) * BAND_SIZE])
+        for band in range(BAND_COUNT)
+    ]
+
+
+def _iter_candidates(
+    keys: List[tuple], buckets: Dict[tuple, Dict[str, None]]
+) -> Iterator[str]:
+    """Iterate over unique unpaired target paths sharing a bucket."""
+    seen = set()
+    for key in keys:
+        for path in buckets.get(key, ()):
+            if path in seen:
+                continue
+            seen.add(path)
+            yield path
+            if len(seen) >= MAX_CANDIDATES:
+                return
+
+
+def _find_most_similar(
+    node_data: NodeData,
+    parent_path: str,
+    signature: Tuple[int, ...],
+    candidates: Iterator[str],
+    target_nodes: Dict[str, NodeData],
+    target_signatures: Dict[str, Tuple[int, ...]],
+) -> Optional[str]:
+    """
+    Return the path of the best candidate above the threshold.
+
+    Among similar candidates, a node under the counterpart of the
+    parent wins, then a node of the same name.
+    """
+    best_path = None
+    best_score = None
+    for path in candidates:
+        similarity = estimate_similarity(signature, target_signatures[path])
+        if similarity < SIMILARITY_THRESHOLD:
+            continue
+
+        candidate = target_nodes[path]
+        score = (
+            candidate.parent_path == parent_path,
+            candidate.name == node_data.name,
+            similarity,
+        )
+        if best_score is None or score > best_score:
+            best_path, best_score = path, score
+            if score[0] and similarity == 1.0:
+                # identical nodes are paired in the target order
+                break
+    return best_path
@@ -22,6 +22,17 @@ class ParamData:
                            a hatched pattern. False by default.
     """
 
+    __slots__ = (
+        "name",
+        "_value",
+        "state",
+        "is_active",
+        "color",
+        "alpha",
+        "is_hatched",
+        "icon",
+    )
+
     def __init__(
         self,
         name: str,
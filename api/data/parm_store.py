@@ -0,0 +1,141 @@
+from collections.abc import MutableMapping
+import sys
+from typing import Any, Dict, Iterator, List, Tuple
+
+from api.data.item_data import ItemState
+from api.data.param_data import ParamData
+
+
+class ParmStore(MutableMapping):
+    """
+    Compact column based storage of node parameters.
+
+    Parameter names are interned and mapped to rows of a value column.
+    A ParamData record is only kept for parameters which carry some
+    diff or UI state, unchanged parameters are stored as bare values
+    and their ParamData is created on first access.
+    """
+
+    __slots__ = ("_rows", "_values", "_records")
+
+    def __init__(self):
+        self._rows: Dict[str, int] = {}
+        self._values: List[Any] = []
+        self._records: Dict[int, Any] = {}
+
+    def add(self, name: str, param: Any) -> None:
+        """
+        Add a parameter, storing it compactly if it has no state.
+
+        :param name: The name of the parameter.
+        :param param: The parameter data to be added.
+        """
+        name = sys.intern(name)
+        row = self._rows.get(name)
+        if row is None:
+            row = len(self._values)
+            self._rows[name] = row
+            self._values.append(None)
+
+        if _is_compactable(name, param):
+            self._values[row] = param.value
+            self._records.pop(row, None)
+        else:
+            self._values[row] = None
+            self._records[row] = param
+
+    def get_value(self, name: str) -> Any:
+        """
+        Return the value of a parameter without creating its record.
+
+        :param name: The name of the parameter.
+        :return: The value of the parameter.
+        """
+        row = self._rows[name]
+        record = self._records.get(row)
+        if record is None:
+            return self._values[row]
+        return getattr(record, "value", record)
+
+    def set_value(self, name: str, value: Any) -> None:
+        """
+        Set the value of a parameter without creating its record.
+
+        :param name: The name of the parameter.
+        :param value: The new value of the parameter.
+        """
+        row = self._rows[name]
+        record = self._records.get(row)
+        if record is None:
+            self._values[row] = value
+        else:
+            record.value = value
+
+    def get_record(self, name: str) -> Any:
+        """
+        Return the record of a parameter without creating it.
+
+        :param name: The name of the parameter.
+        :return: The stored record, None if the parameter is stored
+                 compactly or doesn't exist.
+        """
+        row = self._rows.get(name)
+        return None if row is None else self._records.get(row)
+
+    def iter_records(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterate over parameters which have a ParamData record.
+
+        Compactly stored parameters have no state, so this is
+        enough to find all parameters with a state without creating
+        records.
+
+        :return: Iterator over (name, record) tuples in parameter order.
+        """
+        for name, row in self._rows.items():
+            record = self._records.get(row)
+            if record is not None:
+                yield name, record
+
+    def __getitem__(self, name: str) -> Any:
+        row = self._rows[name]
+        record = self._records.get(row)
+        if record is None:
+            record = ParamData(name, self._values[row], None)
+            self._records[row] = record
+            self._values[row] = None
+        return record
+
+    def __setitem__(self, name: str, param: Any) -> None:
+        self.add(name, param)
+
+    def __delitem__(self, name: str) -> None:
+        row = self._rows.pop(name)
+        self._values[row] = None
+        self._records.pop(row, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __repr__(self) -> str:
+        return f"ParmStore({list(self._rows)!r})"
+
+
+def _is_compactable(name: str, param: Any) -> bool:
+    """Check if a parameter is a ParamData without any diff or UI state."""
+    return (
+        type(param) is ParamData
+        and param.name == name
+        and param.state in (None, ItemState.UNCHANGED)
+        and param.is_active
+        and param.color is None
+        and param.alpha == 255
+        and not param.is_hatched
+        and param.icon is True
+    )
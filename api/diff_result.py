@@ -0,0 +1,455 @@
+import itertools
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from api.data.item_data import ItemState
+from api.data.node_data import NodeData
+from api.data.node_graph import Edge
+
+
+# Name of the user data row, compared like a parm.
+USER_DATA_PARM_NAME = "userDataDict"
+
+# Value shown for parms which are skipped as being at their default.
+DEFAULT_PARM_VALUE = "<default>"
+
+# Index of a node which is missing in one of the snapshots.
+MISSING_INDEX = -1
+
+# Prefixes of rows showing changed wires, followed by the input
+# or output index, e.g. "-> input 0".
+INPUT_ROW_PREFIX = "-> input "
+OUTPUT_ROW_PREFIX = "<- output "
+
+
+class ParmChange(NamedTuple):
+    """
+    A changed parm or user data of a node.
+
+    The node is referred to by its indices in both snapshots, the state
+    is EDITED for parms present on both sides, CREATED for parms
+    missing in the source and DELETED for parms missing in the target.
+    """
+
+    source_index: int
+    target_index: int
+    parm_name: str
+    state: ItemState
+
+
+class NodeDiff(NamedTuple):
+    """
+    A changed node with its changed parms.
+
+    The node of the side where it's missing is None, parm states
+    are the same as returned by DiffResult.get_parm_states.
+    """
+
+    path: str
+    state: ItemState
+    source_node: Optional[NodeData]
+    target_node: Optional[NodeData]
+    parm_states: Dict[str, ItemState]
+    # target path of a MOVED node or of a node below it,
+    # path is its source path
+    target_path: Optional[str] = None
+
+
+class ConnectionChange(NamedTuple):
+    """
+    A changed input of a node.
+
+    The edge is None on the side where the input isn't connected,
+    the state is CREATED for added wires, DELETED for removed wires
+    and EDITED for rewired inputs.
+    """
+
+    source_edge: Optional[Edge]
+    target_edge: Optional[Edge]
+    state: ItemState
+
+
+class ConnectionRow(NamedTuple):
+    """
+    A row showing changed wires of a node input or output.
+
+    Values list the other ends of changed wires as "name:index",
+    None on the side where none of them is connected.
+    """
+
+    state: ItemState
+    source_value: Optional[str]
+    target_value: Optional[str]
+
+
+def has_parm_row(node_data: NodeData, parm_name: str) -> bool:
+    """
+    Check if a changed parm or user data exists on a node.
+
+    Parms missing on one side are shown as placeholders there.
+
+    :param node_data: The node of one snapshot.
+    :param parm_name: The name of the parm or USER_DATA_PARM_NAME.
+    """
+    return (
+        parm_name == USER_DATA_PARM_NAME
+        or parm_name in node_data.parms
+        or node_data.is_parm_at_default(parm_name)
+    )
+
+
+def get_shown_value(node_data: NodeData, parm_name: str) -> Any:
+    """
+    Return the value of a parm or user data as it is compared.
+
+    :param node_data: The node of one snapshot.
+    :param parm_name: The name of the parm or USER_DATA_PARM_NAME.
+    :return: The value, DEFAULT_PARM_VALUE for parms skipped as default.
+    """
+    if parm_name == USER_DATA_PARM_NAME:
+        return getattr(node_data.user_data, "value", None)
+    if node_data.is_parm_at_default(parm_name):
+        return DEFAULT_PARM_VALUE
+    return node_data.get_parm_value(parm_name)
+
+
+class DiffResult:
+    """
+    Changes between two snapshots of extracted node data.
+
+    Holds only what changed, nodes are referred to by their indices
+    in source_paths and target_paths, so the snapshots themselves are
+    left untouched. Lookups by path used by views are built lazily
+    on first use, presentation like colors or placeholder rows is
+    derived by the views.
+    """
+
+    def __init__(
+        self,
+        source_paths: List[str],
+        target_paths: List[str],
+        paths: List[str],
+    ):
+        """
+        Initialize an empty result.
+
+        :param source_paths: Node paths of the source snapshot, in order.
+        :param target_paths: Node paths of the target snapshot, in order.
+        :param paths: Node paths of both snapshots in the aligned order,
+                      source order wins for nodes present on both sides.
+        """
+        self.source_paths = source_paths
+        self.target_paths = target_paths
+        self.paths = paths
+
+        # target indices of created nodes
+        self.created: List[int] = []
+        # source indices of deleted nodes
+        self.deleted: List[int] = []
+        # (source index, target index) of nodes with parm changes
+        self.edited: List[tuple] = []
+        # (source index, target index) of renamed or moved nodes
+        self.moved: List[tuple] = []
+        # (source index, target index) of nodes below moved nodes,
+        # paired by their paths relative to them, see iter_paired_moves
+        self.moved_descendants: List[tuple] = []
+        self.parm_changes: List[ParmChange] = []
+        self.connection_changes: List[ConnectionChange] = []
+        # changes of nodes including their descendants, zeros are omitted
+        self.change_counts: Dict[str, int] = {}
+
+        self._source_indices: Optional[Dict[str, int]] = None
+        self._target_indices: Optional[Dict[str, int]] = None
+        self._node_states: Optional[Dict[str, ItemState]] = None
+        self._moved_paths: Optional[Dict[str, str]] = None
+        self._parm_states: Optional[Dict[str, Dict[str, ItemState]]] = None
+        self._connection_rows: Optional[
+            Dict[str, Dict[str, ConnectionRow]]
+        ] = None
+        self._row_paths: Optional[List[str]] = None
+
+    @property
+    def is_identical(self) -> bool:
+        """Check if there are no changes at all."""
+        return not (
+            self.created
+            or self.deleted
+            or self.moved
+            or self.parm_changes
+            or self.connection_changes
+        )
+
+    def get_source_index(self, path: str) -> int:
+        """Return the index of a source node, MISSING_INDEX if missing."""
+        if self._source_indices is None:
+            self._source_indices = {
+                path: index for index, path in enumerate(self.source_paths)
+            }
+        return self._source_indices.get(path, MISSING_INDEX)
+
+    def get_target_index(self, path: str) -> int:
+        """Return the index of a target node, MISSING_INDEX if missing."""
+        if self._target_indices is None:
+            self._target_indices = {
+                path: index for index, path in enumerate(self.target_paths)
+            }
+        return self._target_indices.get(path, MISSING_INDEX)
+
+    def get_change_path(self, change: ParmChange) -> str:
+        """Return the node path of a parm change."""
+        if change.source_index != MISSING_INDEX:
+            return self.source_paths[change.source_index]
+        return self.target_paths[change.target_index]
+
+    def get_node_state(self, path: str) -> ItemState:
+        """
+        Return the state of a node.
+
+        :return: CREATED or DELETED for nodes missing on one side,
+                 MOVED for both paths of a renamed or moved node,
+                 EDITED for nodes with parm or connection changes,
+                 UNCHANGED otherwise. Nodes below moved nodes have
+                 the same state under both their paths.
+        """
+        if self._node_states is None:
+            node_states = {}
+            for source_index, _ in self.edited:
+                node_states[self.source_paths[source_index]] = ItemState.EDITED
+            for source_index, target_index in self.moved:
+                node_states[self.source_paths[source_index]] = ItemState.MOVED
+                node_states[self.target_paths[target_index]] = ItemState.MOVED
+            for connected_path in self._get_connection_rows():
+                node_states.setdefault(connected_path, ItemState.EDITED)
+            for source_index, target_index in self.moved_descendants:
+                state = node_states.get(self.source_paths[source_index])
+                if state is not None:
+                    node_states[self.target_paths[target_index]] = state
+            for index in self.created:
+                node_states[self.target_paths[index]] = ItemState.CREATED
+            for index in self.deleted:
+                node_states[self.source_paths[index]] = ItemState.DELETED
+            self._node_states = node_states
+        return self._node_states.get(path, ItemState.UNCHANGED)
+
+    def get_parm_states(self, path: str) -> Dict[str, ItemState]:
+        """
+        Return changed parms of a node.
+
+        :return: Dictionary with parm names as keys and ParmChange
+                 states as values, in the aligned parm order.
+                 Both paths of a moved node have the same states.
+        """
+        if self._parm_states is None:
+            parm_states: Dict[str, Dict[str, ItemState]] = {}
+            for change in self.parm_changes:
+                parm_states.setdefault(self.get_change_path(change), {})[
+                    change.parm_name
+                ] = change.state
+            for source_index, target_index in self.iter_paired_moves():
+                states = parm_states.get(self.source_paths[source_index])
+                if states:
+                    parm_states[self.target_paths[target_index]] = states
+            self._parm_states = parm_states
+        return self._parm_states.get(path, {})
+
+    def get_connection_rows(self, path: str) -> Dict[str, ConnectionRow]:
+        """
+        Return rows of changed wires of a node.
+
+        A changed wire is shown on the node it leads to as an input row
+        and on the nodes it comes from as output rows.
+
+        :return: Dictionary with row names as keys and ConnectionRow
+                 as values, inputs first, in the order of changes.
+                 Both paths of a moved node have the same rows.
+        """
+        connection_rows = self._get_connection_rows()
+        rows = connection_rows.get(path)
+        if rows is None:
+            rows = connection_rows.get(self.get_moved_path(path), {})
+        return rows
+
+    def iter_connection_rows(self) -> Iterator[tuple]:
+        """
+        Iterate over (path, rows) of nodes with changed wires.
+
+        Moved nodes are listed by their source paths, paths of network
+        items which aren't nodes (e.g. dots) may be listed as well.
+        """
+        return iter(self._get_connection_rows().items())
+
+    def _get_connection_rows(self) -> Dict[str, Dict[str, ConnectionRow]]:
+        """Build connection rows of nodes, keyed by their source paths."""
+        if self._connection_rows is not None:
+            return self._connection_rows
+
+        # path -> row name -> (source values, target values)
+        values: Dict[str, Dict[str, tuple]] = {}
+        for change in self.connection_changes:
+            for side, edge in enumerate(
+                (change.source_edge, change.target_edge)
+            ):
+                if edge is None:
+                    continue
+                # wires may lead from network dots, which are not nodes
+                for path, row_name, value in (
+                    (
+                        edge.to_path,
+                        f"{INPUT_ROW_PREFIX}{edge.input_index}",
+                        f"{_get_name(edge.from_path)}:{edge.output_index}",
+                    ),
+                    (
+                        edge.from_path,
+                        f"{OUTPUT_ROW_PREFIX}{edge.output_index}",
+                        f"{_get_name(edge.to_path)}:{edge.input_index}",
+                    ),
+                ):
+                    if not self._has_node(path, side):
+                        continue
+                    values.setdefault(
+                        self.get_row_path(path), {}
+                    ).setdefault(row_name, ([], []))[side].append(value)
+
+        connection_rows = {}
+        for path, rows in values.items():
+            # input rows first, as inputs are what was rewired
+            row_names = sorted(
+                rows, key=lambda name: not name.startswith(INPUT_ROW_PREFIX)
+            )
+            connection_rows[path] = {
+                name: _create_connection_row(*rows[name])
+                for name in row_names
+            }
+        self._connection_rows = connection_rows
+        return connection_rows
+
+    def _has_node(self, path: str, side: int) -> bool:
+        """Return whether a node exists in the source or target side."""
+        if side == 0:
+            return self.get_source_index(path) != MISSING_INDEX
+        return self.get_target_index(path) != MISSING_INDEX
+
+    def get_row_path(self, path: str) -> str:
+        """
+        Return the path of the row which shows a node on both sides.
+
+        Both nodes of a moved pair are shown on a single row, under
+        the source path, other nodes are shown under their paths.
+
+        :param path: The source or target path of a node.
+        :return: The source path of a moved node, the path otherwise.
+        """
+        if self.get_source_index(path) != MISSING_INDEX:
+            return path
+        return self.get_moved_path(path) or path
+
+    def get_row_node(
+        self, nodes: Dict[str, NodeData], path: str
+    ) -> Optional[NodeData]:
+        """
+        Return the node of one side shown on a row.
+
+        :param nodes: Comparator data of one side.
+        :param path: The path of the row, see get_row_path.
+        :return: The node, None if it's missing on that side.
+        """
+        node_data = nodes.get(path)
+        if node_data is None:
+            moved_path = self.get_moved_path(path)
+            if moved_path is not None:
+                node_data = nodes.get(moved_path)
+        return node_data
+
+    def get_row_paths(self) -> List[str]:
+        """Return paths of rows in the aligned order, see get_row_path."""
+        if self._row_paths is None:
+            self._row_paths = [
+                path for path in self.paths if self.get_row_path(path) == path
+            ]
+        return self._row_paths
+
+    def iter_paired_moves(self) -> Iterator[tuple]:
+        """
+        Iterate over (source index, target index) of all moved pairs.
+
+        Moved nodes are followed by nodes below them, which are paired
+        the same way but aren't reported as moved themselves.
+        """
+        return itertools.chain(self.moved, self.moved_descendants)
+
+    def get_moved_path(self, path: str) -> Optional[str]:
+        """
+        Return the other path of a moved node or of a node below it.
+
+        A moved node is missing by path on both sides, so its source
+        and target paths never collide and are looked up together.
+
+        :param path: The source or target path of a node.
+        :return: The path on the other side, None if not moved.
+        """
+        return self._get_moved_paths().get(path)
+
+    def _get_moved_paths(self) -> Dict[str, str]:
+        """Return paths of moved nodes mapped to their other paths."""
+        if self._moved_paths is None:
+            moved_paths = {}
+            for source_index, target_index in self.iter_paired_moves():
+                source_path = self.source_paths[source_index]
+                target_path = self.target_paths[target_index]
+                moved_paths[source_path] = target_path
+                moved_paths[target_path] = source_path
+            self._moved_paths = moved_paths
+        return self._moved_paths
+
+    def get_change_count(self, path: str) -> int:
+        """Return the number of changes of a node and its descendants."""
+        return self.change_counts.get(path, 0)
+
+    def iter_changed_paths(self) -> Iterator[str]:
+        """Iterate over paths of changed nodes in the aligned order."""
+        for path in self.paths:
+            if self.get_node_state(path) != ItemState.UNCHANGED:
+                yield path
+
+
+def create_placeholder_node(other_node_data: NodeData) -> NodeData:
+    """
+    Create an empty node shown in place of a node of the other side.
+
+    :param other_node_data: The node missing on this side.
+    :return: A hatched node without a name, under the same parent.
+    """
+    node_data = NodeData("")
+    node_data.parent_path = other_node_data.parent_path
+    node_data.is_hatched = True
+    return node_data
+
+
+def get_connection_value(
+    connection_row: ConnectionRow, is_source: bool
+) -> Optional[str]:
+    """Return the value of a connection row on one side, None if missing."""
+    if is_source:
+        return connection_row.source_value
+    return connection_row.target_value
+
+
+def _create_connection_row(
+    source_values: List[str], target_values: List[str]
+) -> ConnectionRow:
+    """Create a row of wires changed on either side."""
+    if not source_values:
+        state = ItemState.CREATED
+    elif not target_values:
+        state = ItemState.DELETED
+    else:
+        state = ItemState.EDITED
+    return ConnectionRow(
+        state,
+        ", ".join(source_values) or None,
+        ", ".join(target_values) or None,
+    )
+
+
+def _get_name(path: str) -> str:
+    """Return the name of a node from its path."""
+    return path.rsplit("/", 1)[-1] or path
@@ -0,0 +1,271 @@
+import json
+import sys
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO
+
+from api.cache.snapshot_cache import SnapshotCache
+from api.data.item_data import ItemState
+from api.data.node_graph import Edge
+from api.diff_result import (
+    USER_DATA_PARM_NAME,
+    ConnectionChange,
+    NodeDiff,
+    get_shown_value,
+)
+
+
+EXIT_IDENTICAL = 0
+EXIT_DIFFERENT = 1
+EXIT_ERROR = 2
+
+OUTPUT_FORMATS = ("json", "ndjson")
+
+
+def get_comparator_class(backend: str) -> type:
+    """
+    Return the comparator class of a given backend.
+
+    Comparators are imported lazily, so the archive backend
+    works without hou being importable.
+
+    :param backend: Either "hython" or "archive".
+    :return: The comparator class.
+    """
+    if backend == "archive":
+        from api.comparators.archive_hip_comparator import (
+            ArchiveHipFileComparator,
+        )
+        return ArchiveHipFileComparator
+
+    from api.comparators.hip_comparator import HipFileComparator
+    return HipFileComparator
+
+
+def create_comparator(args, source_file: str, target_file: str):
+    """
+    Create a comparator configured by parsed command line arguments.
+
+    :param args: Parsed arguments of main.py.
+    :param source_file: Path to the source file.
+    :param target_file: Path to the target file.
+    :return: A comparator instance, not compared yet.
+    """
+    comparator_class = get_comparator_class(args.backend)
+    return comparator_class(
+        source_file,
+        target_file,
+        parallel=args.parallel,
+        cache=SnapshotCache() if args.cache else None,
+        extraction_mode=args.mode,
+        skip_defaults=args.skip_defaults,
+        abs_tolerance=args.abs_tolerance,
+        rel_tolerance=args.rel_tolerance,
+        detect_moves=args.detect_moves,
+    )
+
+
+def iter_changes(comparator) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over changes found by a compared comparator.
+
+    :param comparator: A comparator after compare() was called.
+    :return: Iterator over change dictionaries, see iter_node_changes
+             and iter_connection_changes.
+    """
+    for node_diff in comparator.iter_node_diffs():
+        yield from iter_node_changes(node_diff)
+    yield from iter_connection_changes(comparator.diff_result)
+
+
+def iter_streamed_changes(comparator) -> Iterator[Dict[str, Any]]:
+    """
+    Compare files of a comparator, yielding changes as they are found.
+
+    Only the source snapshot is kept in memory, deleted nodes
+    are yielded last, followed by changed wires, which are known only
+    once the whole graph was read, see HoudiniComparator.iter_compare.
+
+    :param comparator: A comparator, not compared yet.
+    :return: Iterator over change dictionaries, see iter_node_changes
+             and iter_connection_changes.
+    """
+    for node_diff in comparator.iter_compare(keep_target=False):
+        yield from iter_node_changes(node_diff)
+    yield from iter_connection_changes(comparator.diff_result)
+
+
+def iter_node_changes(node_diff: NodeDiff) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over changes of a single changed node.
+
+    :param node_diff: The changed node.
+    :return: Iterator over change dictionaries with "kind", "change"
+             and "path" keys, parm and user data changes also have
+             "parm", "source" and "target" keys. Renamed and moved
+             nodes have a "target_path" key, changes of their parms
+             are listed under the source path.
+    """
+    path = node_diff.path
+    if node_diff.state == ItemState.CREATED:
+        yield {"kind": "node", "change": "created", "path": path}
+        return
+    if node_diff.state == ItemState.DELETED:
+        yield {"kind": "node", "change": "deleted", "path": path}
+        return
+    if node_diff.state == ItemState.MOVED:
+        if node_diff.source_node.parent_path == node_diff.target_node.parent_path:
+            change = "renamed"
+        else:
+            change = "moved"
+        yield {
+            "kind": "node",
+            "change": change,
+            "path": path,
+            "target_path": node_diff.target_path,
+        }
+
+    for parm_name, state in node_diff.parm_states.items():
+        source = target = None
+        if state != ItemState.CREATED:
+            source = _to_text(get_shown_value(node_diff.source_node, parm_name))
+        if state != ItemState.DELETED:
+            target = _to_text(get_shown_value(node_diff.target_node, parm_name))
+
+        if parm_name == USER_DATA_PARM_NAME:
+            kind = "user_data"
+        else:
+            kind = "parm"
+        yield {
+            "kind": kind,
+            "change": str(state),
+            "path": path,
+            "parm": parm_name,
+            "source": source,
+            "target": target,
+        }
+
+
+def iter_connection_changes(diff_result) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over changed wires of a comparison.
+
+    :param diff_result: The DiffResult of a compared comparator.
+    :return: Iterator over change dictionaries with "kind" set to
+             "connection", "change" set to "added", "removed" or
+             "rewired", "path" and "input" of the changed input and
+             "source" and "target" wires as "<path>:<output index>"
+             strings, None if the input isn't connected.
+    """
+    for change in diff_result.connection_changes:
+        yield get_connection_change(change)
+
+
+def get_connection_change(change: ConnectionChange) -> Dict[str, Any]:
+    """Return the change dictionary of a single changed input."""
+    edge = change.source_edge or change.target_edge
+    if change.state == ItemState.CREATED:
+        kind = "added"
+    elif change.state == ItemState.DELETED:
+        kind = "removed"
+    else:
+        kind = "rewired"
+    return {
+        "kind": "connection",
+        "change": kind,
+        "path": edge.to_path,
+        "input": edge.input_index,
+        "source": _format_edge(change.source_edge),
+        "target": _format_edge(change.target_edge),
+    }
+
+
+def _format_edge(edge: Optional[Edge]) -> Optional[str]:
+    """Return the node output a wire leads from, None for no wire."""
+    if edge is None:
+        return None
+    return f"{edge.from_path}:{edge.output_index}"
+
+
+def _to_text(value: Any) -> str:
+    """Return a JSON friendly representation of a parm value."""
+    return value if isinstance(value, str) else str(value)
+
+
+def write_changes(
+    changes: Iterable[Dict[str, Any]],
+    stream: TextIO,
+    output_format: str,
+    source_file: str,
+    target_file: str,
+) -> int:
+    """
+    Write changes to a given stream.
+
+    :param changes: Changes returned by iter_changes, ndjson lines
+                    are written and flushed as changes are iterated.
+    :param stream: The stream to write to, e.g. sys.stdout.
+    :param output_format: "json" for a single document or "ndjson"
+                          for one change per line.
+    :param source_file: Path to the source file.
+    :param target_file: Path to the target file.
+    :return: The number of written changes.
+    """
+    if output_format == "ndjson":
+        count = 0
+        for change in changes:
+            stream.write(json.dumps(change) + "\n")
+            stream.flush()
+            count += 1
+        return count
+
+    changes = list(changes)
+    json.dump(
+        {
+            "source": source_file,
+            "target": target_file,
+            "identical": not changes,
+            "changes": changes,
+        },
+        stream,
+        indent=2,
+    )
+    stream.write("\n")
+    return len(changes)
+
+
+def run_headless(args, stream: Optional[TextIO] = None) -> int:
+    """
+    Compare files given by parsed command line arguments without UI.
+
+    Changes are streamed while the target file is being extracted,
+    so ndjson output starts before the comparison is finished.
+    Streaming extracts files one after another, so with parallel
+    extraction changes are written once both files are compared.
+
+    :param args: Parsed arguments of main.py.
+    :param stream: The stream to write changes to, stdout by default.
+    :return: EXIT_IDENTICAL, EXIT_DIFFERENT or EXIT_ERROR, any error
+             of a backend, e.g. hou.OperationFailed or a garbled
+             archive, is reported as EXIT_ERROR.
+    """
+    stream = stream or sys.stdout
+    try:
+        comparator = create_comparator(
+            args, args.source_file_path, args.target_file_path
+        )
+        if args.parallel:
+            comparator.compare()
+            changes = iter_changes(comparator)
+        else:
+            changes = iter_streamed_changes(comparator)
+        change_count = write_changes(
+            changes,
+            stream,
+            args.output_format,
+            args.source_file_path,
+            args.target_file_path,
+        )
+    except Exception as error:
+        sys.stderr.write(f"Error: {type(error).__name__}: {error}\n")
+        return EXIT_ERROR
+
+    return EXIT_DIFFERENT if change_count else EXIT_IDENTICAL
@@ -0,0 +1,438 @@
+from collections import OrderedDict
+import mmap
+import re
+import struct
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from api.data.node_data import NodeData
+from api.data.param_data import ParamData
+
+
+ODC_MAGIC = b"070707"
+# Non-commercial ("HouNC") and limited commercial ("HouLC") magics.
+OBFUSCATED_MAGICS = {b"HouNC\x1a", b"HouLC\x1a"}
+
+ODC_HEADER_SIZE = 76
+# hipnc headers are obfuscated, only their length is known.
+OBFUSCATED_HEADER_SIZE = 34
+TRAILER_NAME = "TRAILER!!!"
+
+NODE_SECTIONS = {"init", "def", "parm", "chn", "userdata"}
+USER_DATA_STRING_TYPE = 3
+
+TOKEN_PATTERN = re.compile(rb'"(?:[^"\\]|\\.)*"|\S+', re.DOTALL)
+ESCAPE_PATTERN = re.compile(r"\\(.)", re.DOTALL)
+
+
+class QuotedString(str):
+    """A token which was stored as a quoted string inside of the archive."""
+
+
+def _unquote(token: bytes) -> str:
+    """Decode a token and resolve quoted string escapes, if any."""
+    text = token.decode("utf-8", errors="replace")
+    if len(text) >= 2 and text[0] == '"' and text[-1] == '"':
+        return QuotedString(ESCAPE_PATTERN.sub(r"\1", text[1:-1]))
+    return text
+
+
+def tokenize(data: bytes) -> List[str]:
+    """
+    Split section data into whitespace separated tokens.
+
+    :param data: Raw section data.
+    :return: A list of tokens, quoted strings are returned unescaped
+             as QuotedString instances.
+    """
+    return [_unquote(token) for token in TOKEN_PATTERN.findall(data)]
+
+
+def convert_value(token: str) -> Any:
+    """
+    Convert a parm value token into python value.
+
+    :param token: The token to convert.
+    :return: str for quoted tokens, int or float for numbers
+             and the token itself otherwise.
+    """
+    if isinstance(token, QuotedString):
+        return str(token)
+    try:
+        return int(token)
+    except ValueError:
+        pass
+    try:
+        return float(token)
+    except ValueError:
+        return token
+
+
+def parse_init_section(data: bytes) -> Dict[str, str]:
+    """
+    Parse `.init` section into a dictionary.
+
+    :param data: Raw section data.
+    :return: Dictionary with node initialization values, e.g. type.
+    """
+    result = {}
+    for line in data.decode("utf-8", errors="replace").splitlines():
+        key, separator, value = line.partition("=")
+        if separator:
+            result[key.strip()] = value.strip()
+    return result
+
+
+def parse_def_connections(data: bytes) -> List[Tuple[int, str, int]]:
+    """
+    Parse indexed input connections from `.def` section.
+
+    Every line of the `inputs` block holds the input index, the name
+    of the connected node, the index of its output and a flag.
+
+    :param data: Raw section data.
+    :return: (input index, input node name, output index) tuples
+             of connected inputs ordered by input index.
+    """
+    tokens = tokenize(data)
+    try:
+        start = tokens.index("inputs") + 2
+    except ValueError:
+        return []
+
+    connections = []
+    index = start
+    while index + 3 < len(tokens) and tokens[index] != "}":
+        input_index, input_name, output_index = tokens[index:index + 3]
+        if input_name:
+            connections.append(
+                (int(input_index), input_name, int(output_index))
+            )
+        index += 4
+
+    return sorted(connections)
+
+
+def parse_channels(data: bytes) -> Dict[str, str]:
+    """
+    Parse `.chn` section and collect channel expressions.
+
+    Keyframed channels without any expression are left out,
+    their current value is stored inside of the `.parm` section.
+
+    :param data: Raw section data.
+    :return: Dictionary with channel name as key and expression as value.
+    """
+    tokens = tokenize(data)
+    expressions = {}
+    channel = None
+    depth = 0
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        if token == "channel" and depth == 1:
+            channel = tokens[index + 1]
+            index += 2
+            continue
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+        elif token == "expr" and tokens[index + 1] == "=" and channel:
+            index += 2
+            expression = []
+            while index < len(tokens) and tokens[index] != "}" and not (
+                index + 1 < len(tokens) and tokens[index + 1] == "="
+            ):
+                expression.append(tokens[index])
+                index += 1
+            expressions[channel] = ESCAPE_PATTERN.sub(
+                r"\1", " ".join(expression)
+            )
+            continue
+        index += 1
+
+    return expressions
+
+
+def parse_parm_section(
+    data: bytes, channels: Optional[Dict[str, str]] = None
+) -> "OrderedDict[str, Any]":
+    """
+    Parse `.parm` section into parm tuple values.
+
+    Parms are keyed by their parm tuple name, since component names
+    depend on the parm template which is not stored in the archive.
+    Single component tuples are unpacked into plain values.
+
+    :param data: Raw section data.
+    :param channels: Channel expressions from the `.chn` section.
+    :return: OrderedDict with parm tuple name as key and value as value.
+    """
+    channels = channels or {}
+    tokens = tokenize(data)
+    parms = OrderedDict()
+
+    index = 0
+    if tokens[:2] == ["{", "version"]:
+        index = 3
+    while index < len(tokens) and tokens[index] != "}":
+        name = tokens[index]
+        index = tokens.index("]", index) + 2
+
+        values = []
+        while tokens[index] != ")":
+            if tokens[index] == "[":
+                end = tokens.index("]", index)
+                channel = tokens[index + 1]
+                value = tokens[end - 1] if end - index > 2 else ""
+                values.append(channels.get(channel, convert_value(value)))
+                index = end + 1
+                continue
+            values.append(convert_value(tokens[index]))
+            index += 1
+        index += 1
+
+        if not values:
+            parms[name] = ""
+        elif len(values) == 1:
+            parms[name] = values[0]
+        else:
+            parms[name] = tuple(values)
+
+    return parms
+
+
+def parse_user_data(data: bytes) -> "OrderedDict[str, str]":
+    """
+    Parse binary `.userdata` section.
+
+    :param data: Raw section data.
+    :return: OrderedDict with user data keys and string values.
+    """
+    user_data = OrderedDict()
+    if len(data) < 4:
+        return user_data
+
+    (count,) = struct.unpack_from(">I", data, 0)
+    offset = 4
+    for _ in range(count):
+        (key_length,) = struct.unpack_from(">H", data, offset)
+        offset += 2
+        key = data[offset:offset + key_length].decode("utf-8", "replace")
+        offset += key_length
+
+        value_type, value_length = struct.unpack_from(">IH", data, offset)
+        offset += 6
+        value = data[offset:offset + value_length]
+        offset += value_length
+
+        if value_type == USER_DATA_STRING_TYPE:
+            user_data[key] = value.decode("utf-8", errors="replace")
+        else:
+            user_data[key] = value.hex()
+
+    return user_data
+
+
+class HipArchiveReader:
+    """
+    Houdini-free reader of .hip/.hipnc/.hiplc files.
+
+    Hip files are CPIO archives where every node is stored as a set
+    of `<node path>.<section>` entries. Commercial files use plain
+    "odc" CPIO headers, while non-commercial and limited commercial
+    files use obfuscated headers without a readable entry size, so
+    their entries are delimited by the header magic instead.
+    """
+
+    def __init__(self, hip_path: str):
+        """
+        Initialize the reader with a path to the HIP file.
+
+        :param hip_path: The path to the HIP file.
+        """
+        self.hip_path = hip_path
+
+    def iter_entries(self) -> Iterator[Tuple[str, bytes]]:
+        """
+        Iterate over archive entries.
+
+        :return: Iterator over (entry name, entry data) tuples.
+        """
+        with open(self.hip_path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                magic = data[:len(ODC_MAGIC)]
+                if magic == ODC_MAGIC:
+                    yield from self._iter_odc_entries(data)
+                elif magic in OBFUSCATED_MAGICS:
+                    yield from self._iter_obfuscated_entries(data, magic)
+                else:
+                    raise RuntimeError(
+                        f"Unsupported archive format of '{self.hip_path}'."
+                    )
+
+    def _iter_odc_entries(self, data) -> Iterator[Tuple[str, bytes]]:
+        """Iterate over entries of an archive with "odc" CPIO headers."""
+        offset = 0
+        while offset + ODC_HEADER_SIZE <= len(data):
+            header = data[offset:offset + ODC_HEADER_SIZE]
+            if header[:6] != ODC_MAGIC:
+                raise RuntimeError(
+                    f"Corrupted archive header at {offset} "
+                    f"in '{self.hip_path}'."
+                )
+            name_size = int(header[59:65], 8)
+            file_size = int(header[65:76], 8)
+
+            name_start = offset + ODC_HEADER_SIZE
+            data_start = name_start + name_size
+            name = data[name_start:data_start - 1].decode("utf-8", "replace")
+            if name == TRAILER_NAME:
+                return
+
+            yield name, data[data_start:data_start + file_size]
+            offset = data_start + file_size
+
+    def _iter_obfuscated_entries(
+        self, data, magic: bytes
+    ) -> Iterator[Tuple[str, bytes]]:
+        """Iterate over entries of an archive with obfuscated headers."""
+        offset = 0
+        while offset != -1 and offset < len(data):
+            name_start = offset + OBFUSCATED_HEADER_SIZE
+            name_end = data.find(b"\0", name_start)
+            if name_end == -1:
+                return
+
+            next_offset = data.find(magic, name_end + 1)
+            data_end = next_offset if next_offset != -1 else len(data)
+
+            name = data[name_start:name_end].decode("utf-8", "replace")
+            yield name, data[name_end + 1:data_end]
+            offset = next_offset
+
+    def iter_node_sections(self) -> Iterator[Tuple[str, Dict[str, bytes]]]:
+        """
+        Group archive entries into per node sections.
+
+        :return: Iterator over (node path, {section name: data}) tuples
+                 in the order nodes are stored in the archive.
+        """
+        current_path = None
+        sections = {}
+        for name, data in self.iter_entries():
+            entry_path, _, section = name.rpartition(".")
+            if (
+                not entry_path
+                or entry_path.startswith(".")
+                or section not in NODE_SECTIONS
+            ):
+                continue
+
+            path = "/" + entry_path
+            if path != current_path:
+                if current_path is not None:
+                    yield current_path, sections
+                current_path = path
+                sections = {}
+            sections[section] = data
+
+        if current_path is not None:
+            yield current_path, sections
+
+    def read_nodes(
+        self, node_callback: Optional[Callable[[int], None]] = None
+    ) -> "OrderedDict[str, NodeData]":
+        """
+        Read all nodes stored in the archive.
+
+        :param node_callback: See iter_nodes.
+        :return: OrderedDict with node path as key and NodeData as value.
+        """
+        return OrderedDict(self.iter_nodes(node_callback))
+
+    def iter_nodes(
+        self, node_callback: Optional[Callable[[int], None]] = None
+    ) -> Iterator[Tuple[str, NodeData]]:
+        """
+        Read nodes stored in the archive one by one.
+
+        Only top level managers are stored without `.init` section,
+        other such nodes and nodes without a stored parent are
+        editable nodes inside of locked HDAs. They are skipped
+        the same way as hython extraction skips them. Parents are
+        always yielded before their children.
+
+        :param node_callback: Called with the number of nodes read
+                              so far after every node, e.g. to report
+                              progress. The total isn't known upfront.
+        :return: Iterator over (node path, NodeData) tuples.
+        """
+        yield "/", self._create_root_node()
+        # only paths are kept, so nodes can be released by the caller
+        read_paths = {"/"}
+
+        for path, sections in self.iter_node_sections():
+            parent_path = path.rsplit("/", 1)[0] or "/"
+            if parent_path not in read_paths:
+                continue
+            if "init" not in sections and parent_path != "/":
+                continue
+            read_paths.add(path)
+            node_data = self._create_node_data(path, parent_path, sections)
+            if node_callback:
+                node_callback(len(read_paths))
+            yield path, node_data
+
+    def _create_root_node(self) -> NodeData:
+        """Create data for the root node which is not stored in archive."""
+        node_data = NodeData("/")
+        node_data.path = "/"
+        # named like the type of the root node of a loaded hip file
+        node_data.type = "root"
+        node_data.parent_path = None
+        node_data.user_data = ParamData("userData", None, None)
+        return node_data
+
+    def _create_node_data(
+        self, path: str, parent_path: str, sections: Dict[str, bytes]
+    ) -> NodeData:
+        """
+        Create NodeData from the node sections.
+
+        :param path: The path of the node.
+        :param parent_path: The path of the node's parent.
+        :param sections: Dictionary with raw data of node sections.
+        :return: A NodeData object containing extracted data.
+        """
+        name = path.rsplit("/", 1)[-1]
+        init = parse_init_section(sections.get("init", b""))
+
+        node_data = NodeData(name)
+        node_data.path = path
+        node_data.type = init.get("type", name)
+        node_data.parent_path = parent_path
+
+        # inputs are siblings, or network dots named like "(__dot1)"
+        connections = parse_def_connections(sections.get("def", b""))
+        network_path = parent_path.rstrip("/")
+        node_data.inputs = tuple(
+            (input_index, f"{network_path}/{input_name}", output_index)
+            for input_index, input_name, output_index in connections
+        )
+
+        user_data = parse_user_data(sections.get("userdata", b""))
+        param_user_data = ParamData("userData", None, None)
+        if user_data:
+            param_user_data.value = user_data
+        node_data.user_data = param_user_data
+
+        channels = parse_channels(sections.get("chn", b""))
+        if "parm" in sections:
+            parms = parse_parm_section(sections["parm"], channels)
+            for parm_name, value in parms.items():
+                node_data.add_parm(
+                    parm_name, ParamData(parm_name, value, None)
+                )
+
+        return node_data
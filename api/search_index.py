@@ -0,0 +1,340 @@
+from dataclasses import dataclass
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from api.data.item_data import ItemState
+from api.data.node_data import NodeData
+from api.diff_result import (
+    DiffResult,
+    create_placeholder_node,
+    get_connection_value,
+    get_shown_value,
+    has_parm_row,
+)
+
+
+# Searchable fields, unscoped queries match any of them.
+NAME_FIELD = "name"
+PARM_FIELD = "parm"
+VALUE_FIELD = "value"
+SEARCH_FIELDS = (NAME_FIELD, PARM_FIELD, VALUE_FIELD)
+
+# Length of indexed n-grams, shorter queries are matched by a scan.
+NGRAM_SIZE = 3
+
+
+def parse_query(query: str) -> Tuple[Optional[str], str, bool]:
+    """
+    Parse a search query.
+
+    A query may be scoped to a field with a "name:", "parm:" or
+    "value:" prefix and is a regular expression if it's enclosed
+    in slashes, e.g. "value:/^\\$HIP/". Other queries are matched
+    as case insensitive substrings.
+
+    :param query: The query typed by the user.
+    :return: A tuple with the field (None for any field),
+             the pattern and whether the pattern is a regex.
+    """
+    field = None
+    prefix, separator, rest = query.partition(":")
+    if separator and prefix.lower() in SEARCH_FIELDS:
+        field, query = prefix.lower(), rest
+
+    if len(query) > 1 and query.startswith("/") and query.endswith("/"):
+        return field, query[1:-1], True
+    return field, query.lower(), False
+
+
+def iter_ngrams(text: str) -> Iterable[str]:
+    """Iterate over unique n-grams of a given text."""
+    return {
+        text[index:index + NGRAM_SIZE]
+        for index in range(len(text) - NGRAM_SIZE + 1)
+    }
+
+
+class SearchIndex:
+    """
+    Inverted n-gram index over rows shown in diff tree views.
+
+    Node names, names of changed parms and their values are indexed
+    as separate rows. A query is resolved to row paths by intersecting
+    posting sets of its n-grams and verifying the candidates, then
+    ancestors of matched rows are added, so the result can be used
+    as a path filter directly.
+    """
+
+    def __init__(self):
+        self._paths: List[str] = []
+        self._fields: List[str] = []
+        self._texts: List[str] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._parents: Dict[str, Optional[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def iter_add_nodes(
+        self,
+        nodes: Dict[str, NodeData],
+        other_nodes: Dict[str, NodeData],
+        diff_result: DiffResult,
+        is_source: bool = True,
+    ) -> Iterator[int]:
+        """
+        Index rows of one side of a comparison, as shown in tree views.
+
+        Nodes missing on this side are indexed as placeholders, which
+        have no rows but keep their descendants linked to ancestors.
+        Moved nodes are indexed under their rows, see
+        DiffResult.get_row_path.
+
+        :param nodes: Comparator data of the indexed side.
+        :param other_nodes: Comparator data of the other side.
+        :param diff_result: The result of the comparison.
+        :param is_source: Whether nodes are of the source side.
+        :return: Iterator over the number of nodes indexed so far,
+                 e.g. to report progress.
+        """
+        for number, path in enumerate(diff_result.get_row_paths(), 1):
+            node_data = diff_result.get_row_node(nodes, path)
+            if node_data is None:
+                node_data = create_placeholder_node(other_nodes[path])
+            parent_path = node_data.parent_path
+            if parent_path is not None:
+                parent_path = diff_result.get_row_path(parent_path)
+            connection_rows = diff_result.get_connection_rows(path)
+            self.add_node(
+                path,
+                node_data,
+                diff_result.get_parm_states(path),
+                {
+                    name: get_connection_value(connection_row, is_source)
+                    for name, connection_row in connection_rows.items()
+                },
+                parent_path,
+            )
+            yield number
+
+    def add_node(
+        self,
+        path: str,
+        node_data: NodeData,
+        parm_states: Dict[str, ItemState],
+        connection_values: Optional[Dict[str, Optional[str]]] = None,
+        parent_path: Optional[str] = None,
+    ) -> None:
+        """
+        Index a node and its changed parms, as shown in tree views.
+
+        :param path: The path of the node.
+        :param node_data: The node of one side, empty for placeholders.
+        :param parm_states: Changed parms of the node,
+                            see DiffResult.get_parm_states.
+        :param connection_values: Values of changed connection rows on
+                                  this side, None for missing wires.
+        :param parent_path: The path of the parent row, the parent
+                            of the node by default.
+        """
+        if parent_path is None:
+            parent_path = node_data.parent_path
+        self._parents[path] = parent_path if parent_path != path else None
+        if not node_data.name:
+            return
+        self._add_row(path, NAME_FIELD, node_data.name)
+
+        for parm_name in parm_states:
+            # placeholders of parms missing on this side have no text
+            if not has_parm_row(node_data, parm_name):
+                continue
+            parm_path = f"{path}/{parm_name}"
+            value_path = f"{parm_path}/value"
+            self._parents[parm_path] = path
+            self._parents[value_path] = parm_path
+            self._add_row(parm_path, PARM_FIELD, parm_name)
+            self._add_row(
+                value_path,
+                VALUE_FIELD,
+                str(get_shown_value(node_data, parm_name)),
+            )
+
+        for row_name, value in (connection_values or {}).items():
+            if value is None:
+                continue
+            row_path = f"{path}/{row_name}"
+            value_path = f"{row_path}/value"
+            self._parents[row_path] = path
+            self._parents[value_path] = row_path
+            self._add_row(row_path, PARM_FIELD, row_name)
+            self._add_row(value_path, VALUE_FIELD, value)
+
+    def _add_row(self, path: str, field: str, text: str) -> None:
+        """Add a single searchable row."""
+        row = len(self._paths)
+        text = text.lower()
+        self._paths.append(path)
+        self._fields.append(field)
+        self._texts.append(text)
+        for ngram in iter_ngrams(text):
+            self._postings.setdefault(ngram, set()).add(row)
+
+    def search(self, query: str) -> Set[str]:
+        """
+        Find paths of rows matching a query, including their ancestors.
+
+        :param query: The query, see parse_query.
+        :return: Set of matching paths, empty if nothing matches.
+        :raises ValueError: If the query is an invalid regex.
+        """
+        return self.get_paths(self.match_rows(*parse_query(query)))
+
+    def match_rows(
+        self,
+        field: Optional[str],
+        pattern: str,
+        is_regex: bool,
+        rows: Optional[Iterable[int]] = None,
+    ) -> Set[int]:
+        """
+        Find rows matching a parsed query.
+
+        :param field: The field to search in, None for any field.
+        :param pattern: The pattern returned by parse_query.
+        :param is_regex: Whether the pattern is a regex.
+        :param rows: Candidate rows to verify instead of looking them up,
+                     e.g. rows matched by a less specific query.
+        :return: Set of matching rows.
+        :raises ValueError: If the pattern is an invalid regex.
+        """
+        if not pattern:
+            return set()
+
+        if is_regex:
+            try:
+                regex = re.compile(pattern, re.IGNORECASE)
+            except re.error as error:
+                raise ValueError(f"Invalid regex '{pattern}': {error}")
+            if rows is None:
+                rows = range(len(self._texts))
+            matches = (row for row in rows if regex.search(self._texts[row]))
+        else:
+            if rows is None:
+                rows = self._get_candidate_rows(pattern)
+            matches = (row for row in rows if pattern in self._texts[row])
+
+        return {
+            row
+            for row in matches
+            if field is None or self._fields[row] == field
+        }
+
+    def get_row_path(self, row: int) -> str:
+        """Return the path of a given row."""
+        return self._paths[row]
+
+    def _get_candidate_rows(self, pattern: str) -> Iterable[int]:
+        """Return rows which contain all n-grams of a substring pattern."""
+        if len(pattern) < NGRAM_SIZE:
+            return range(len(self._texts))
+
+        postings = []
+        for ngram in iter_ngrams(pattern):
+            posting = self._postings.get(ngram)
+            if not posting:
+                return ()
+            postings.append(posting)
+
+        postings.sort(key=len)
+        return set(postings[0]).intersection(*postings[1:])
+
+    def get_paths(self, rows: Iterable[int]) -> Set[str]:
+        """Return paths of given rows and of all their ancestors."""
+        paths = set()
+        for row in rows:
+            path = self._paths[row]
+            if self._fields[row] == PARM_FIELD:
+                # values are shown together with their parms
+                paths.add(f"{path}/value")
+            while path is not None and path not in paths:
+                paths.add(path)
+                path = self._parents.get(path)
+        return paths
+
+
+@dataclass
+class SearchResult:
+    """Result of a search, see IncrementalSearch.search."""
+
+    query: str
+    # matched rows, row order follows the tree order
+    rows: Set[int]
+    # matched paths and all their ancestors
+    paths: Set[str]
+
+    def iter_matches(self, index: SearchIndex) -> Iterator[str]:
+        """Iterate over paths of matched rows in tree order."""
+        for row in sorted(self.rows):
+            yield index.get_row_path(row)
+
+
+class IncrementalSearch:
+    """
+    Resolves queries typed character by character.
+
+    If a query extends the previous one, only rows matched by the
+    previous query are verified instead of looking up the index again.
+    Instances keep state between calls and must not be shared
+    between threads.
+    """
+
+    def __init__(self, index: SearchIndex):
+        """
+        Initialize the search.
+
+        :param index: The index to search in.
+        """
+        self.index = index
+        self._previous_query: Optional[Tuple[Optional[str], str, bool]] = None
+        self._previous_rows: Set[int] = set()
+
+    def search(self, query: str) -> SearchResult:
+        """
+        Find rows matching a query.
+
+        :param query: The query, see parse_query.
+        :return: The search result.
+        :raises ValueError: If the query is an invalid regex.
+        """
+        parsed_query = parse_query(query)
+        candidates = (
+            self._previous_rows if self._refines(parsed_query) else None
+        )
+        rows = self.index.match_rows(*parsed_query, rows=candidates)
+
+        self._previous_query = parsed_query
+        self._previous_rows = rows
+        return SearchResult(query, rows, self.index.get_paths(rows))
+
+    def _refines(self, parsed_query: Tuple[Optional[str], str, bool]) -> bool:
+        """
+        Check if a query can only match rows of the previous query.
+
+        Holds for substring queries of the same field whose pattern
+        contains the previous pattern, e.g. when a character is typed.
+        """
+        if self._previous_query is None:
+            return False
+
+        field, pattern, is_regex = parsed_query
+        previous_field, previous_pattern, previous_is_regex = (
+            self._previous_query
+        )
+        return (
+            not is_regex
+            and not previous_is_regex
+            and field == previous_field
+            and bool(previous_pattern)
+            and previous_pattern in pattern
+        )
+
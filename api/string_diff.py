@@ -0,0 +1,370 @@
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass, field
+import difflib
+import re
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+
+EQUAL = "equal"
+REPLACE = "replace"
+DELETE = "delete"
+INSERT = "insert"
+
+# Regions without unique common lines are aligned with a Myers diff,
+# a region needing more edits than this is shown as a single replace.
+MAX_EDIT_COST = 1000
+
+# Longer changed lines are highlighted as a whole instead of per word.
+MAX_INTRALINE_LENGTH = 2000
+
+WORD_PATTERN = re.compile(r"\w+|\s+|[^\w\s]")
+
+Opcode = Tuple[str, int, int, int, int]
+Span = Tuple[int, int]
+
+
+def hash_lines(
+    source_lines: Sequence[str], target_lines: Sequence[str]
+) -> Tuple[List[int], List[int]]:
+    """
+    Replace lines of both sides with integer ids.
+
+    Equal lines get equal ids, so the diff compares integers only.
+
+    :return: Tuple with ids of source and target lines.
+    """
+    ids: Dict[str, int] = {}
+    source_ids = [ids.setdefault(line, len(ids)) for line in source_lines]
+    target_ids = [ids.setdefault(line, len(ids)) for line in target_lines]
+    return source_ids, target_ids
+
+
+def diff_lines(
+    source_lines: Sequence[str],
+    target_lines: Sequence[str],
+    max_edit_cost: int = MAX_EDIT_COST,
+) -> List[Opcode]:
+    """
+    Compute a line diff of two texts.
+
+    Lines are hashed to integer ids and aligned with a patience diff,
+    common prefixes and suffixes are matched first, then lines which
+    occur exactly once on both sides are used as anchors. Regions
+    without such lines fall back to a Myers diff limited to
+    max_edit_cost edits, regions exceeding it are replaced as a whole.
+
+    :param source_lines: Lines of the source text.
+    :param target_lines: Lines of the target text.
+    :param max_edit_cost: Maximum number of edits of a Myers region.
+    :return: Opcodes in the format of difflib.SequenceMatcher.get_opcodes.
+    """
+    source_ids, target_ids = hash_lines(source_lines, target_lines)
+    matches = _match_lines(source_ids, target_ids, max_edit_cost)
+    return _get_opcodes(matches, len(source_ids), len(target_ids))
+
+
+def _match_lines(
+    a: Sequence[Hashable], b: Sequence[Hashable], max_edit_cost: int
+) -> List[Tuple[int, int]]:
+    """Return sorted pairs of matched indices of two sequences."""
+    matches = []
+    regions = [(0, len(a), 0, len(b))]
+    while regions:
+        a_lo, a_hi, b_lo, b_hi = regions.pop()
+
+        while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+            matches.append((a_lo, b_lo))
+            a_lo += 1
+            b_lo += 1
+        while a_lo < a_hi and b_lo < b_hi and a[a_hi - 1] == b[b_hi - 1]:
+            a_hi -= 1
+            b_hi -= 1
+            matches.append((a_hi, b_hi))
+        if a_lo == a_hi or b_lo == b_hi:
+            continue
+
+        anchors = _get_unique_anchors(a, b, a_lo, a_hi, b_lo, b_hi)
+        if anchors:
+            matches.extend(anchors)
+            previous_a, previous_b = a_lo, b_lo
+            for a_index, b_index in anchors:
+                regions.append((previous_a, a_index, previous_b, b_index))
+                previous_a, previous_b = a_index + 1, b_index + 1
+            regions.append((previous_a, a_hi, previous_b, b_hi))
+        else:
+            matches.extend(
+                _myers_matches(a, b, a_lo, a_hi, b_lo, b_hi, max_edit_cost)
+            )
+
+    matches.sort()
+    return matches
+
+
+def _get_unique_anchors(
+    a: Sequence[Hashable],
+    b: Sequence[Hashable],
+    a_lo: int,
+    a_hi: int,
+    b_lo: int,
+    b_hi: int,
+) -> List[Tuple[int, int]]:
+    """
+    Find the longest increasing run of lines unique on both sides.
+
+    :return: Pairs of matched indices in increasing order.
+    """
+    a_counts = Counter(a[a_lo:a_hi])
+    b_counts = Counter(b[b_lo:b_hi])
+    b_positions = {
+        b[index]: index
+        for index in range(b_lo, b_hi)
+        if b_counts[b[index]] == 1
+    }
+    pairs = [
+        (index, b_positions[a[index]])
+        for index in range(a_lo, a_hi)
+        if a_counts[a[index]] == 1 and a[index] in b_positions
+    ]
+    if not pairs:
+        return []
+
+    # patience sorting, piles keep the smallest tail of each length
+    tails: List[int] = []
+    tail_indices: List[int] = []
+    previous: List[Optional[int]] = []
+    for pair_index, (_, b_index) in enumerate(pairs):
+        pile = bisect_left(tails, b_index)
+        previous.append(tail_indices[pile - 1] if pile else None)
+        if pile == len(tails):
+            tails.append(b_index)
+            tail_indices.append(pair_index)
+        else:
+            tails[pile] = b_index
+            tail_indices[pile] = pair_index
+
+    anchors = []
+    pair_index = tail_indices[-1]
+    while pair_index is not None:
+        anchors.append(pairs[pair_index])
+        pair_index = previous[pair_index]
+    anchors.reverse()
+    return anchors
+
+
+def _myers_matches(
+    a: Sequence[Hashable],
+    b: Sequence[Hashable],
+    a_lo: int,
+    a_hi: int,
+    b_lo: int,
+    b_hi: int,
+    max_edit_cost: int,
+) -> List[Tuple[int, int]]:
+    """
+    Match lines of a region with the greedy Myers algorithm.
+
+    :return: Matched pairs, empty if the region needs
+             more than max_edit_cost edits.
+    """
+    n = a_hi - a_lo
+    m = b_hi - b_lo
+    max_cost = min(n + m, max_edit_cost)
+    offset = max_cost + 1
+    v = [0] * (2 * offset + 1)
+    # furthest reaching x per diagonal k, kept for k in [-d - 1, d + 1]
+    trace = []
+
+    for cost in range(max_cost + 1):
+        trace.append(v[offset - cost - 1:offset + cost + 2])
+        for k in range(-cost, cost + 1, 2):
+            if k == -cost or (
+                k != cost and v[offset + k - 1] < v[offset + k + 1]
+            ):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[a_lo + x] == b[b_lo + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack_myers(trace, n, m, a_lo, b_lo)
+
+    return []
+
+
+def _backtrack_myers(
+    trace: List[List[int]], n: int, m: int, a_lo: int, b_lo: int
+) -> List[Tuple[int, int]]:
+    """Collect matched pairs walking the Myers trace backwards."""
+    matches = []
+    x, y = n, m
+    for cost in range(len(trace) - 1, -1, -1):
+        v = trace[cost]
+        shift = cost + 1
+        k = x - y
+        if k == -cost or (k != cost and v[shift + k - 1] < v[shift + k + 1]):
+            previous_k = k + 1
+        else:
+            previous_k = k - 1
+        previous_x = v[shift + previous_k]
+        previous_y = previous_x - previous_k
+        while x > previous_x and y > previous_y:
+            x -= 1
+            y -= 1
+            matches.append((a_lo + x, b_lo + y))
+        x, y = previous_x, previous_y
+    return matches
+
+
+def _get_opcodes(
+    matches: List[Tuple[int, int]], source_length: int, target_length: int
+) -> List[Opcode]:
+    """Convert sorted matched pairs to opcodes."""
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for a_index, b_index in matches + [(source_length, target_length)]:
+        if i < a_index and j < b_index:
+            opcodes.append((REPLACE, i, a_index, j, b_index))
+        elif i < a_index:
+            opcodes.append((DELETE, i, a_index, j, b_index))
+        elif j < b_index:
+            opcodes.append((INSERT, i, a_index, j, b_index))
+
+        if a_index < source_length:
+            if opcodes and opcodes[-1][0] == EQUAL:
+                tag, i1, i2, j1, j2 = opcodes[-1]
+                opcodes[-1] = (EQUAL, i1, a_index + 1, j1, b_index + 1)
+            else:
+                opcodes.append(
+                    (EQUAL, a_index, a_index + 1, b_index, b_index + 1)
+                )
+        i, j = a_index + 1, b_index + 1
+    return opcodes
+
+
+def word_diff(source: str, target: str) -> Tuple[List[Span], List[Span]]:
+    """
+    Find changed words of two lines.
+
+    Lines longer than MAX_INTRALINE_LENGTH are reported as changed
+    as a whole.
+
+    :return: Tuple with (start, end) character spans changed
+             in the source and in the target line.
+    """
+    if max(len(source), len(target)) > MAX_INTRALINE_LENGTH:
+        return [(0, len(source))], [(0, len(target))]
+
+    source_words = WORD_PATTERN.findall(source)
+    target_words = WORD_PATTERN.findall(target)
+    source_offsets = _get_word_offsets(source_words)
+    target_offsets = _get_word_offsets(target_words)
+
+    source_spans: List[Span] = []
+    target_spans: List[Span] = []
+    matcher = difflib.SequenceMatcher(
+        None, source_words, target_words, autojunk=False
+    )
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == EQUAL:
+            continue
+        if i1 < i2:
+            source_spans.append((source_offsets[i1], source_offsets[i2]))
+        if j1 < j2:
+            target_spans.append((target_offsets[j1], target_offsets[j2]))
+    return source_spans, target_spans
+
+
+def _get_word_offsets(words: List[str]) -> List[int]:
+    """Return start offsets of words, followed by the total length."""
+    offsets = [0]
+    for word in words:
+        offsets.append(offsets[-1] + len(word))
+    return offsets
+
+
+@dataclass
+class DiffRow:
+    """A row of a side by side diff, line numbers are None for fillers."""
+
+    tag: str
+    source_line: Optional[int]
+    target_line: Optional[int]
+    # changed character spans, only set for replaced lines
+    source_spans: List[Span] = field(default_factory=list)
+    target_spans: List[Span] = field(default_factory=list)
+
+
+class StringDiff:
+    """
+    Side by side diff of two texts.
+
+    Opcodes are computed once, rows are derived from them on access,
+    so word diffs are computed only for replaced lines which are
+    actually requested.
+    """
+
+    def __init__(
+        self,
+        source_text: str,
+        target_text: str,
+        max_edit_cost: int = MAX_EDIT_COST,
+    ):
+        """
+        Diff two texts.
+
+        :param source_text: The source text.
+        :param target_text: The target text.
+        :param max_edit_cost: See diff_lines.
+        """
+        self.source_lines = source_text.splitlines()
+        self.target_lines = target_text.splitlines()
+        self.opcodes = diff_lines(
+            self.source_lines, self.target_lines, max_edit_cost
+        )
+
+        # first row of each opcode, followed by the total row count
+        self._row_starts = [0]
+        for _, i1, i2, j1, j2 in self.opcodes:
+            self._row_starts.append(
+                self._row_starts[-1] + max(i2 - i1, j2 - j1)
+            )
+
+    def __len__(self) -> int:
+        return self._row_starts[-1]
+
+    def get_row(self, row: int) -> DiffRow:
+        """Return a row by its index."""
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+
+        opcode_index = bisect_right(self._row_starts, row) - 1
+        tag, i1, i2, j1, j2 = self.opcodes[opcode_index]
+        offset = row - self._row_starts[opcode_index]
+        source_line = i1 + offset if i1 + offset < i2 else None
+        target_line = j1 + offset if j1 + offset < j2 else None
+
+        if tag != REPLACE:
+            return DiffRow(tag, source_line, target_line)
+        if source_line is None:
+            return DiffRow(INSERT, None, target_line)
+        if target_line is None:
+            return DiffRow(DELETE, source_line, None)
+
+        source_spans, target_spans = word_diff(
+            self.source_lines[source_line], self.target_lines[target_line]
+        )
+        return DiffRow(
+            REPLACE, source_line, target_line, source_spans, target_spans
+        )
+
+    def iter_rows(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[DiffRow]:
+        """Iterate over rows in a given range, all rows by default."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for row in range(max(start, 0), stop):
+            yield self.get_row(row)
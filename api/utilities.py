@@ -1,11 +1,16 @@
+from array import array
 from collections import OrderedDict
 import difflib
-from typing import List, TypeVar
+import math
+from typing import Any, Iterable, List, Optional, TypeVar
 
 
 K = TypeVar("K")
 V = TypeVar("V")
 
+# Larger ints are compared exactly, as floats would round them.
+MAX_EXACT_FLOAT_INT = 2 ** 53
+
 
 def ordered_dict_insert(
     d: OrderedDict[K, V], index: int, key: K, value: V
@@ -41,6 +46,166 @@ def get_ordered_dict_key_index(
     raise KeyError(f"'{target_key}' not found in the OrderedDict.")
 
 
+def merge_ordered_keys(
+    source_keys: Iterable[K], target_keys: Iterable[K]
+) -> List[K]:
+    """
+    Merge two key orderings into one in a single linear pass.
+
+    Relative order of keys from both sequences is preserved, keys
+    missing in the target are placed before keys missing in the source
+    at the same position. If common keys are reordered, source order
+    wins. As a result, a key which follows its parent in both
+    sequences also follows it in the merged one.
+
+    :param source_keys: Keys in the source order.
+    :param target_keys: Keys in the target order.
+    :return: A list with every key from both sequences exactly once.
+    """
+    source_keys = list(source_keys)
+    target_keys = list(target_keys)
+    source_set = set(source_keys)
+    target_set = set(target_keys)
+
+    merged = []
+    emitted = set()
+    source_index = target_index = 0
+    while source_index < len(source_keys) or target_index < len(target_keys):
+        if source_index < len(source_keys):
+            key = source_keys[source_index]
+            if key in emitted:
+                source_index += 1
+                continue
+            if key not in target_set:
+                merged.append(key)
+                emitted.add(key)
+                source_index += 1
+                continue
+
+        if target_index < len(target_keys):
+            key = target_keys[target_index]
+            if key in emitted:
+                target_index += 1
+                continue
+            if key not in source_set or source_index == len(source_keys):
+                merged.append(key)
+                emitted.add(key)
+                target_index += 1
+                continue
+
+        key = source_keys[source_index]
+        merged.append(key)
+        emitted.add(key)
+        source_index += 1
+
+    return merged
+
+
+def values_equal(
+    source: Any,
+    target: Any,
+    abs_tolerance: float = 0.0,
+    rel_tolerance: float = 0.0,
+) -> bool:
+    """
+    Check if two parm values are equal.
+
+    Values are compared typed, numbers within given tolerances and
+    tuples and lists per component. Values of other or mismatching
+    types are equal if their string representations are equal,
+    so e.g. a number and the same number as a string are equal.
+
+    :param source: The source value.
+    :param target: The target value.
+    :param abs_tolerance: Maximum absolute difference of equal numbers.
+    :param rel_tolerance: Maximum difference of equal numbers
+                          relative to the larger of them.
+    :return: True if the values are equal.
+    """
+    # plain equality settles most values without stringifying them
+    if source == target:
+        return True
+
+    if _is_number(source) and _is_number(target):
+        if math.isnan(source) and math.isnan(target):
+            return True
+        return math.isclose(
+            source, target, rel_tol=rel_tolerance, abs_tol=abs_tolerance
+        )
+
+    if (
+        type(source) in (tuple, list)
+        and type(source) is type(target)
+        and len(source) == len(target)
+    ):
+        return all(
+            values_equal(
+                source_item, target_item, abs_tolerance, rel_tolerance
+            )
+            for source_item, target_item in zip(source, target)
+        )
+
+    return str(source) == str(target)
+
+
+def _is_number(value: Any) -> bool:
+    """Check if a value is an int or a float."""
+    return type(value) in (int, float, bool)
+
+
+def get_numeric_components(value: Any) -> Optional[tuple]:
+    """
+    Return components of a numeric parm value as floats.
+
+    :param value: A number, or a tuple or a list of numbers.
+    :return: Tuple of components, None if the value isn't numeric
+             or has ints which floats can't represent exactly.
+    """
+    components = value if type(value) in (tuple, list) else (value,)
+    for component in components:
+        if not _is_number(component) or (
+            type(component) is not float
+            and abs(component) > MAX_EXACT_FLOAT_INT
+        ):
+            return None
+    return tuple(components)
+
+
+def compare_numeric_arrays(
+    source: array,
+    target: array,
+    abs_tolerance: float = 0.0,
+    rel_tolerance: float = 0.0,
+) -> bytearray:
+    """
+    Compare components of two float arrays in a single pass.
+
+    Components are equal the same way as numbers are by values_equal.
+    Equal arrays are settled by a single comparison.
+
+    :param source: Source components.
+    :param target: Target components, as many as source ones.
+    :param abs_tolerance: Maximum absolute difference of equal numbers.
+    :param rel_tolerance: Maximum difference of equal numbers
+                          relative to the larger of them.
+    :return: 1 for every pair of equal components, 0 otherwise.
+    """
+    if source == target:
+        return bytearray(b"\1") * len(source)
+    return bytearray(
+        source_item == target_item
+        # NaN differs from itself, but equal NaNs are unchanged
+        or (source_item != source_item and target_item != target_item)
+        or math.isclose(
+            source_item,
+            target_item,
+            rel_tol=rel_tolerance,
+            abs_tol=abs_tolerance,
+        )
+        for source_item, target_item in zip(source, target)
+    )
+
+
 def file_diff(file_path_a: str, file_path_b: str) -> List[str]:
     with open(file_path_a, "r") as file_a, open(file_path_b, "r") as file_b:
         file_diff_list = [
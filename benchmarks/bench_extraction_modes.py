@@ -0,0 +1,53 @@
+"""
+Per file extraction timing of the evaluated and raw extraction modes.
+
+Has to be launched with hython, e.g.:
+    hython3.9 benchmarks/bench_extraction_modes.py scene_a.hip scene_b.hip
+
+The Houdini-free archive backend is measured as well for reference.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.comparators.archive_hip_comparator import (  # noqa: E402
+    ArchiveHipFileComparator,
+)
+from api.comparators.hip_comparator import HipFileComparator  # noqa: E402
+
+
+def measure(comparator, hip_file: str) -> float:
+    """Return seconds spent extracting a given file."""
+    start = time.perf_counter()
+    comparator.get_hip_data(hip_file)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("hip_files", nargs="+")
+    args = parser.parse_args()
+
+    print(f"{'file':<40} {'eval, s':>10} {'raw, s':>10} {'archive, s':>10}")
+    for hip_file in args.hip_files:
+        timings = [
+            measure(
+                HipFileComparator(hip_file, hip_file, extraction_mode=mode),
+                hip_file,
+            )
+            for mode in ("eval", "raw")
+        ]
+        timings.append(
+            measure(ArchiveHipFileComparator(hip_file, hip_file), hip_file)
+        )
+        print(
+            f"{os.path.basename(hip_file)[:40]:<40} "
+            + " ".join(f"{timing:>10.3f}" for timing in timings)
+        )
+
+
+if __name__ == "__main__":
+    main()
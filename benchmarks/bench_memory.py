@@ -0,0 +1,109 @@
+"""
+Memory benchmark of extracted node data.
+
+Compares the previous representation, where every parameter is a
+ParamData instance with a per-instance __dict__ stored inside of
+an OrderedDict, against the column based ParmStore.
+
+Usage:
+    python benchmarks/bench_memory.py [--parms 200000] [hip_file ...]
+"""
+import argparse
+from collections import OrderedDict
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.data.node_data import NodeData  # noqa: E402
+from api.data.param_data import ParamData  # noqa: E402
+from api.readers.hip_archive_reader import HipArchiveReader  # noqa: E402
+
+
+PARMS_PER_NODE = 100
+PARM_NAMES = [f"parm{index}" for index in range(PARMS_PER_NODE)]
+
+
+class LegacyParamData:
+    """ParamData layout before ParmStore, kept for comparison only."""
+
+    def __init__(self, name, value, state=None):
+        self.name = name
+        self.value = value
+        self.state = state
+        self.is_active = True
+        self.color = None
+        self.alpha = 255
+        self.is_hatched = False
+        self.icon = True
+
+
+def build_legacy_nodes(parm_count: int) -> OrderedDict:
+    """Build synthetic nodes in the previous representation."""
+    nodes = OrderedDict()
+    for node_index in range(parm_count // PARMS_PER_NODE):
+        parms = OrderedDict()
+        for parm_index in range(PARMS_PER_NODE):
+            # Names are not interned, the same way they come from hou.
+            name = "".join(PARM_NAMES[parm_index])
+            parms[name] = LegacyParamData(name, node_index * 0.5, None)
+        nodes[f"/obj/geo{node_index}"] = parms
+    return nodes
+
+
+def build_compact_nodes(parm_count: int) -> OrderedDict:
+    """Build synthetic nodes using NodeData with ParmStore."""
+    nodes = OrderedDict()
+    for node_index in range(parm_count // PARMS_PER_NODE):
+        node_data = NodeData(f"geo{node_index}")
+        for parm_index in range(PARMS_PER_NODE):
+            name = "".join(PARM_NAMES[parm_index])
+            node_data.add_parm(
+                name, ParamData(name, node_index * 0.5, None)
+            )
+        nodes[f"/obj/geo{node_index}"] = node_data
+    return nodes
+
+
+def measure(label: str, builder, *args) -> int:
+    """Print and return peak traced memory of the built data."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = builder(*args)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+
+    print(f"{label:<40} {current / 1024 ** 2:>10.1f} MiB {elapsed:>8.2f} s")
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--parms", type=int, default=200000)
+    parser.add_argument("hip_files", nargs="*")
+    args = parser.parse_args()
+
+    legacy = measure(
+        f"legacy, {args.parms} parms", build_legacy_nodes, args.parms
+    )
+    compact = measure(
+        f"ParmStore, {args.parms} parms", build_compact_nodes, args.parms
+    )
+    print(f"reduction: {legacy / compact:.1f}x")
+
+    for hip_file in args.hip_files:
+        measure(
+            os.path.basename(hip_file)[:40],
+            lambda path: HipArchiveReader(path).read_nodes(),
+            hip_file,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Scaling benchmark of node alignment between source and target data.
+
+Compares the previous per node ordered_dict_insert approach against
+the single linear merge used by HoudiniComparator. A tenth of the
+nodes is deleted and another tenth is created in the target scene.
+
+Usage:
+    python benchmarks/bench_ordered_merge.py [--sizes 1000 10000 ...]
+"""
+import argparse
+from collections import OrderedDict
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.comparators.archive_hip_comparator import (  # noqa: E402
+    ArchiveHipFileComparator,
+)
+from api.data.node_data import NodeData  # noqa: E402
+from api.diff_result import DiffResult  # noqa: E402
+from api.utilities import (  # noqa: E402
+    get_ordered_dict_key_index,
+    ordered_dict_insert,
+)
+
+
+FIXTURE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "test",
+    "fixtures",
+    "billowy_smoke_source.hipnc",
+)
+NODES_PER_NETWORK = 100
+
+
+def build_nodes(size: int, offset: int) -> OrderedDict:
+    """Build synthetic flat networks of nodes, shifted by a given offset."""
+    nodes = OrderedDict()
+    for index in range(offset, size + offset):
+        network = f"/obj/geo{index // NODES_PER_NETWORK}"
+        if network not in nodes:
+            network_data = NodeData(network.rsplit("/", 1)[-1])
+            network_data.parent_path = "/obj"
+            nodes[network] = network_data
+        node_data = NodeData(f"node{index}")
+        node_data.parent_path = network
+        nodes[f"{network}/node{index}"] = node_data
+    return nodes
+
+
+def build_scenes(size: int):
+    """Build source and target data with deleted and created nodes."""
+    changed = size // 10
+    return build_nodes(size, 0), build_nodes(size, changed)
+
+
+def align_legacy(source_nodes: OrderedDict, target_nodes: OrderedDict):
+    """Previous alignment, inserting every missing node one by one."""
+    for path in list(source_nodes):
+        if path not in target_nodes:
+            index = get_ordered_dict_key_index(source_nodes, path)
+            target_nodes = ordered_dict_insert(
+                target_nodes, index, path, NodeData("")
+            )
+    for path in set(target_nodes) - set(source_nodes):
+        index = get_ordered_dict_key_index(target_nodes, path)
+        source_nodes = ordered_dict_insert(
+            source_nodes, index, path, NodeData("")
+        )
+    return source_nodes, target_nodes
+
+
+def align_merge(source_nodes: OrderedDict, target_nodes: OrderedDict):
+    """Current alignment of HoudiniComparator, recorded in a DiffResult."""
+    comparator = ArchiveHipFileComparator(FIXTURE, FIXTURE)
+    comparator.source_nodes = source_nodes
+    comparator.target_nodes = target_nodes
+    comparator.diff_result = DiffResult(
+        list(source_nodes), list(target_nodes), []
+    )
+    comparator._handle_created_nodes()
+    return comparator.diff_result.paths
+
+
+def measure(function, size: int) -> float:
+    """Return seconds spent aligning scenes of a given size."""
+    source_nodes, target_nodes = build_scenes(size)
+    start = time.perf_counter()
+    function(source_nodes, target_nodes)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 50000, 100000, 500000],
+    )
+    parser.add_argument(
+        "--legacy-max-size",
+        type=int,
+        default=5000,
+        help="Skip the quadratic legacy approach above this size.",
+    )
+    args = parser.parse_args()
+
+    print(f"{'nodes':>10} {'legacy, s':>12} {'merge, s':>12}")
+    for size in args.sizes:
+        legacy = (
+            f"{measure(align_legacy, size):12.3f}"
+            if size <= args.legacy_max_size
+            else f"{'-':>12}"
+        )
+        print(f"{size:>10} {legacy} {measure(align_merge, size):12.3f}")
+
+
+if __name__ == "__main__":
+    main()
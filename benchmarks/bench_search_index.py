@@ -0,0 +1,91 @@
+"""
+Benchmark of the search index used by tree view search.
+
+Builds synthetic networks where every node has a few edited parms,
+then measures building the index and resolving typical queries.
+
+Usage:
+    python benchmarks/bench_search_index.py [--sizes 10000 100000 ...]
+"""
+import argparse
+from collections import OrderedDict
+import os
+import sys
+import time
+from typing import Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.data.item_data import ItemState  # noqa: E402
+from api.data.node_data import NodeData  # noqa: E402
+from api.data.param_data import ParamData  # noqa: E402
+from api.diff_result import DiffResult, ParmChange  # noqa: E402
+from api.search_index import SearchIndex  # noqa: E402
+
+
+NODES_PER_NETWORK = 100
+EDITED_PARMS = ("tx", "scale", "file")
+QUERIES = (
+    "node12345",
+    "parm:scale",
+    "value:$hip/geo",
+    "name:/^node1.*7$/",
+    "no such node",
+)
+
+
+def build_nodes(size: int) -> Tuple[OrderedDict, DiffResult]:
+    """Build synthetic flat networks of nodes with edited parms."""
+    nodes = OrderedDict()
+    for index in range(size):
+        network = f"/obj/geo{index // NODES_PER_NETWORK}"
+        if network not in nodes:
+            network_data = NodeData(network.rsplit("/", 1)[-1])
+            network_data.parent_path = "/obj"
+            nodes[network] = network_data
+        node_data = NodeData(f"node{index}")
+        node_data.parent_path = network
+        node_data.user_data = ParamData("userData", None, None)
+        for parm_name in EDITED_PARMS:
+            value = f"$HIP/geo/node{index}.bgeo" if parm_name == "file" else index
+            node_data.add_parm(parm_name, ParamData(parm_name, value, None))
+        nodes[f"{network}/node{index}"] = node_data
+
+    paths = list(nodes)
+    diff_result = DiffResult(paths, paths, paths)
+    for node_index, node_data in enumerate(nodes.values()):
+        for parm_name in node_data.parms:
+            diff_result.parm_changes.append(
+                ParmChange(node_index, node_index, parm_name, ItemState.EDITED)
+            )
+    return nodes, diff_result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10000, 100000]
+    )
+    args = parser.parse_args()
+
+    print(f"{'nodes':>10} {'build, s':>10} {'query':>20} {'ms':>8} {'paths':>8}")
+    for size in args.sizes:
+        nodes, diff_result = build_nodes(size)
+        start = time.perf_counter()
+        index = SearchIndex()
+        for _ in index.iter_add_nodes(nodes, nodes, diff_result):
+            pass
+        build_time = time.perf_counter() - start
+
+        for query in QUERIES:
+            start = time.perf_counter()
+            paths = index.search(query)
+            query_time = (time.perf_counter() - start) * 1000
+            print(
+                f"{size:>10} {build_time:10.2f} {query:>20} "
+                f"{query_time:8.1f} {len(paths):>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
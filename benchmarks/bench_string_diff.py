@@ -0,0 +1,122 @@
+"""
+Scaling benchmark of the string diff used by the string diff dialog.
+
+Compares difflib.Differ, which the dialog used previously, against
+the line hashing patience/Myers diff of api.string_diff. Inputs are
+synthetic wrangle like scripts with two kinds of changes, scattered
+edits where about one line in a hundred is edited, inserted or
+deleted, and a rewritten block of one in a hundred lines. Word diffs
+of all replaced lines are included in the timing. Differ is skipped
+above --differ-max-lines.
+
+Usage:
+    python benchmarks/bench_string_diff.py [--sizes 10000 100000 ...]
+"""
+import argparse
+import difflib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.string_diff import StringDiff  # noqa: E402
+
+
+EDIT_RATIO = 0.01
+SEED = 7
+
+
+def build_script(size: int) -> list:
+    """Build lines of a synthetic script, with repeated braces and blanks."""
+    rng = random.Random(SEED)
+    lines = []
+    while len(lines) < size:
+        index = len(lines)
+        lines.extend(
+            (
+                f"float value{index} = ch(\"parm{index}\") * {rng.random():.4f};",
+                f"if (value{index} > @P.y) {{",
+                f"    @Cd = set(value{index}, 0, {rng.randint(0, 9)});",
+                "}",
+                "",
+            )
+        )
+    return lines[:size]
+
+
+def edit_scattered(lines: list) -> list:
+    """Return a copy of lines with scattered edits, inserts and deletes."""
+    rng = random.Random(SEED + 1)
+    edited = []
+    for line in lines:
+        roll = rng.random()
+        if roll < EDIT_RATIO / 3:
+            edited.append(line.replace("value", "amount", 1) + " // edited")
+        elif roll < EDIT_RATIO * 2 / 3:
+            edited.append(line)
+            edited.append(f"i@inserted = {rng.randint(0, 100)};")
+        elif roll < EDIT_RATIO:
+            continue
+        else:
+            edited.append(line)
+    return edited
+
+
+def rewrite_block(lines: list) -> list:
+    """Return a copy of lines with a contiguous block indented."""
+    start = len(lines) // 2
+    stop = start + max(int(len(lines) * EDIT_RATIO), 1)
+    block = [f"    {line}" for line in lines[start:stop]]
+    return lines[:start] + block + lines[stop:]
+
+
+SCENARIOS = (("scattered", edit_scattered), ("block", rewrite_block))
+
+
+def run_differ(source: list, target: list) -> int:
+    """Diff with difflib.Differ, return the number of output lines."""
+    return len(list(difflib.Differ().compare(source, target)))
+
+
+def run_string_diff(source: list, target: list) -> int:
+    """Diff with StringDiff and build all rows, return their number."""
+    string_diff = StringDiff("\n".join(source), "\n".join(target))
+    return sum(1 for _ in string_diff.iter_rows())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10000, 100000]
+    )
+    parser.add_argument("--differ-max-lines", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(
+        f"{'lines':>10} {'changes':>10} {'differ, s':>10} "
+        f"{'string_diff, s':>15} {'rows':>8}"
+    )
+    for size in args.sizes:
+        source = build_script(size)
+        for scenario, edit in SCENARIOS:
+            target = edit(source)
+
+            differ_time = "skipped"
+            if size <= args.differ_max_lines:
+                start = time.perf_counter()
+                run_differ(source, target)
+                differ_time = f"{time.perf_counter() - start:.2f}"
+
+            start = time.perf_counter()
+            rows = run_string_diff(source, target)
+            diff_time = time.perf_counter() - start
+            print(
+                f"{size:>10} {scenario:>10} {differ_time:>10} "
+                f"{diff_time:15.2f} {rows:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,13 @@ import sys
 import os
 import argparse
 
-from ui.hip_file_diff_window import HipFileDiffWindow
-
-from hutil.Qt.QtWidgets import QApplication
-from hutil.Qt.QtCore import Qt
+from api.cache.snapshot_cache import SnapshotCache
+from api.comparators.houdini_base_comparator import (
+    DEFAULT_ABS_TOLERANCE,
+    DEFAULT_REL_TOLERANCE,
+)
+from api.batch import run_batch
+from api.headless import OUTPUT_FORMATS, run_headless
 
 
 def main():
@@ -27,11 +30,116 @@ def main():
     parser.add_argument("-i", "--item-path", dest="item_path",
                         help="Path to the item to open in string diff.")
 
+    # Argument for 'backend'
+    parser.add_argument("-b", "--backend", dest="backend", default="hython",
+                        choices=["hython", "archive"],
+                        help="Extraction backend, 'archive' reads hip files "
+                             "without loading them into Houdini.")
+
+    # Argument for 'mode'
+    parser.add_argument("-m", "--mode", dest="mode", default="eval",
+                        choices=["eval", "raw"],
+                        help="Parm extraction mode, 'raw' compares "
+                             "expressions and unexpanded strings "
+                             "without cooking any node.")
+
+    # Argument for 'skip_defaults'
+    parser.add_argument("-d", "--skip-defaults", dest="skip_defaults",
+                        action="store_true",
+                        help="Extract only parms which are not at their "
+                             "defaults, much faster on large scenes.")
+
+    # Arguments for numeric tolerances
+    parser.add_argument("--abs-tol", dest="abs_tolerance", type=float,
+                        default=DEFAULT_ABS_TOLERANCE,
+                        help="Numeric parm values closer than this are "
+                             "compared as equal.")
+    parser.add_argument("--rel-tol", dest="rel_tolerance", type=float,
+                        default=DEFAULT_REL_TOLERANCE,
+                        help="Numeric parm values whose difference relative "
+                             "to the larger value is within this are "
+                             "compared as equal.")
+
+    # Argument for 'detect_moves'
+    parser.add_argument("--no-move-detection", dest="detect_moves",
+                        action="store_false",
+                        help="Report renamed and moved nodes as deleted "
+                             "and created instead of pairing them.")
+
+    # Argument for 'parallel'
+    parser.add_argument("-p", "--parallel", dest="parallel",
+                        action="store_true",
+                        help="Extract source and target files concurrently "
+                             "in two worker processes.")
+
+    # Arguments for the headless mode
+    parser.add_argument("--headless", dest="headless", action="store_true",
+                        help="Compare files without UI and print changes "
+                             "to stdout. Exits with 0 if files are "
+                             "identical, 1 if they differ and 2 on error.")
+    parser.add_argument("-f", "--format", dest="output_format",
+                        default="json", choices=OUTPUT_FORMATS,
+                        help="Output format of the headless mode.")
+
+    parser.add_argument("-o", "--output", dest="output_path",
+                        help="Write headless or batch output to a file "
+                             "instead of stdout.")
+
+    # Arguments for the batch mode
+    parser.add_argument("--batch", dest="batch", action="store_true",
+                        help="Headlessly compare all hip files of source "
+                             "and target directories, paired by relative "
+                             "path, and write an aggregated report.")
+    parser.add_argument("-j", "--jobs", dest="jobs", type=int,
+                        help="Maximum number of concurrent batch workers, "
+                             "the number of CPUs by default.")
+    parser.add_argument("--timeout", dest="timeout", type=float,
+                        help="Maximum number of seconds per file pair "
+                             "in the batch mode.")
+
+    # Arguments for the snapshot cache
+    parser.add_argument("-c", "--cache", dest="cache", action="store_true",
+                        help="Reuse previously extracted data of unchanged "
+                             "files from the snapshot cache.")
+    parser.add_argument("--cache-stats", dest="cache_stats",
+                        action="store_true",
+                        help="Print snapshot cache statistics and exit.")
+    parser.add_argument("--clear-cache", dest="clear_cache",
+                        action="store_true",
+                        help="Remove all snapshots from the cache and exit.")
+
     args = parser.parse_args()
 
+    if args.cache_stats or args.clear_cache:
+        cache = SnapshotCache()
+        if args.clear_cache:
+            cache.clear()
+        for key, value in cache.stats().items():
+            print(f"{key}: {value}")
+        sys.exit(0)
+
+    if args.headless or args.batch:
+        if not args.source_file_path or not args.target_file_path:
+            parser.error("--headless and --batch require both "
+                         "--source and --target.")
+        run = run_batch if args.batch else run_headless
+        if not args.output_path:
+            sys.exit(run(args))
+        with open(args.output_path, "w") as output_file:
+            sys.exit(run(args, output_file))
+
     main_path = os.path.abspath(__file__)
     args.main_path = main_path
-    
+    run_ui(args)
+
+
+def run_ui(args):
+    """Start the diff window, Qt is imported only when UI is needed."""
+    from hutil.Qt.QtWidgets import QApplication
+    from hutil.Qt.QtCore import Qt
+
+    from ui.hip_file_diff_window import HipFileDiffWindow
+
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, False)
     app = QApplication(sys.argv)
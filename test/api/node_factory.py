@@ -0,0 +1,67 @@
+"""Factories of synthetic nodes shared by API tests."""
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from api.comparators.archive_hip_comparator import ArchiveHipFileComparator
+from api.data.node_data import NodeData
+from api.data.param_data import ParamData
+
+
+HIP_FILE = "test/fixtures/billowy_smoke_source.hipnc"
+
+
+def create_node(
+    path: str,
+    node_type: Optional[str] = None,
+    parms: Optional[Dict[str, Any]] = None,
+    present_parms: Optional[Iterable[str]] = None,
+    inputs: tuple = (),
+) -> NodeData:
+    """
+    Create a node as extracted by comparators.
+
+    :param path: The path of the node, "/" for the root node.
+    :param node_type: The type name of the node, its name by default.
+    :param parms: Recorded parm values by parm names.
+    :param present_parms: Names of all parms if parms at default
+                          were not recorded.
+    :param inputs: (input index, input node path, output index) tuples.
+    :return: The node.
+    """
+    parent_path, name = path.rsplit("/", 1)
+    node_data = NodeData(name or "/")
+    node_data.path = path
+    node_data.type = node_type or node_data.name
+    node_data.parent_path = (parent_path or "/") if name else None
+    node_data.user_data = ParamData("userData", None, None)
+    node_data.inputs = tuple(inputs)
+    if present_parms is not None:
+        node_data.present_parms = frozenset(present_parms)
+    for parm_name, value in (parms or {}).items():
+        node_data.add_parm(parm_name, ParamData(parm_name, value, None))
+    return node_data
+
+
+def create_nodes(*nodes: NodeData) -> "OrderedDict[str, NodeData]":
+    """Return comparator data of given nodes, in the given order."""
+    return OrderedDict((node_data.path, node_data) for node_data in nodes)
+
+
+def compare_nodes(
+    source_nodes: Dict[str, NodeData],
+    target_nodes: Dict[str, NodeData],
+    **kwargs,
+) -> ArchiveHipFileComparator:
+    """
+    Compare synthetic nodes without reading any file.
+
+    :param source_nodes: Source comparator data.
+    :param target_nodes: Target comparator data.
+    :param kwargs: Arguments of the comparator, e.g. skip_defaults.
+    :return: The compared comparator.
+    """
+    comparator = ArchiveHipFileComparator(HIP_FILE, HIP_FILE, **kwargs)
+    comparator.source_nodes = source_nodes
+    comparator.target_nodes = target_nodes
+    comparator._compare_data()
+    return comparator
@@ -0,0 +1,89 @@
+import argparse
+import os
+import shutil
+import tempfile
+import unittest
+
+from api.batch import (
+    BatchComparator,
+    CREATED,
+    DELETED,
+    DIFFERENT,
+    IDENTICAL,
+    TIMEOUT,
+    pair_hip_files,
+)
+
+
+class TestBatchComparator(unittest.TestCase):
+    SOURCE_HIP_FILE = "test/fixtures/billowy_smoke_source.hipnc"
+    TARGET_HIP_FILE = "test/fixtures/billowy_smoke_source_edited.hipnc"
+
+    def setUp(self):
+        self.source_dir = tempfile.mkdtemp()
+        self.target_dir = tempfile.mkdtemp()
+        self.args = argparse.Namespace(
+            backend="archive",
+            parallel=False,
+            cache=False,
+            mode="eval",
+            skip_defaults=False,
+            abs_tolerance=0.0,
+            rel_tolerance=0.0,
+            detect_moves=True,
+        )
+
+        self._copy(self.SOURCE_HIP_FILE, self.source_dir, "shot/edited.hipnc")
+        self._copy(self.TARGET_HIP_FILE, self.target_dir, "shot/edited.hipnc")
+        self._copy(self.SOURCE_HIP_FILE, self.source_dir, "same.hipnc")
+        self._copy(self.SOURCE_HIP_FILE, self.target_dir, "same.hipnc")
+        self._copy(self.SOURCE_HIP_FILE, self.source_dir, "deleted.hipnc")
+        self._copy(self.SOURCE_HIP_FILE, self.target_dir, "created.hipnc")
+        self._copy(__file__, self.source_dir, "notes.txt")
+
+    def tearDown(self):
+        shutil.rmtree(self.source_dir)
+        shutil.rmtree(self.target_dir)
+
+    def _copy(self, path, directory, relative_path):
+        destination = os.path.join(directory, relative_path)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copy(path, destination)
+
+    def test_pair_hip_files(self):
+        pairs = pair_hip_files(self.source_dir, self.target_dir)
+
+        self.assertEqual(
+            [(path, bool(source), bool(target)) for path, source, target in pairs],
+            [
+                ("created.hipnc", False, True),
+                ("deleted.hipnc", True, False),
+                ("same.hipnc", True, True),
+                ("shot/edited.hipnc", True, True),
+            ],
+        )
+
+    def test_compare(self):
+        results = BatchComparator(
+            self.source_dir, self.target_dir, self.args, jobs=2
+        ).compare()
+
+        statuses = {result["path"]: result["status"] for result in results}
+        self.assertEqual(
+            statuses,
+            {
+                "created.hipnc": CREATED,
+                "deleted.hipnc": DELETED,
+                "same.hipnc": IDENTICAL,
+                "shot/edited.hipnc": DIFFERENT,
+            },
+        )
+        self.assertNotIn("changes", results[2])
+        self.assertTrue(results[3]["changes"])
+
+    def test_timeout(self):
+        results = BatchComparator(
+            self.source_dir, self.target_dir, self.args, timeout=0.001
+        ).compare()
+
+        self.assertEqual(results[3]["status"], TIMEOUT)
@@ -0,0 +1,180 @@
+import unittest
+
+from api.data.item_data import ItemState
+from api.data.node_graph import Edge
+from api.data.param_data import ParamData
+from api.diff_result import (
+    DEFAULT_PARM_VALUE,
+    MISSING_INDEX,
+    USER_DATA_PARM_NAME,
+    ConnectionChange,
+    ConnectionRow,
+    DiffResult,
+    ParmChange,
+    get_shown_value,
+    has_parm_row,
+)
+from test.api.node_factory import create_node, create_nodes
+
+
+class TestDiffResult(unittest.TestCase):
+    def setUp(self):
+        self.diff_result = DiffResult(
+            ["/", "/obj", "/obj/old"],
+            ["/", "/obj", "/obj/new"],
+            ["/", "/obj", "/obj/old", "/obj/new"],
+        )
+        self.diff_result.deleted.append(2)
+        self.diff_result.created.append(2)
+        self.diff_result.edited.append((1, 1))
+        self.diff_result.parm_changes.extend(
+            [
+                ParmChange(1, 1, "tx", ItemState.EDITED),
+                ParmChange(1, 1, "ty", ItemState.DELETED),
+                ParmChange(MISSING_INDEX, 2, "file", ItemState.CREATED),
+            ]
+        )
+
+    def test_node_states(self):
+        self.assertEqual(
+            self.diff_result.get_node_state("/obj/old"), ItemState.DELETED
+        )
+        self.assertEqual(
+            self.diff_result.get_node_state("/obj/new"), ItemState.CREATED
+        )
+        self.assertEqual(
+            self.diff_result.get_node_state("/obj"), ItemState.EDITED
+        )
+        self.assertEqual(
+            self.diff_result.get_node_state("/"), ItemState.UNCHANGED
+        )
+        self.assertEqual(
+            list(self.diff_result.iter_changed_paths()),
+            ["/obj", "/obj/old", "/obj/new"],
+        )
+
+    def test_parm_states(self):
+        self.assertEqual(
+            self.diff_result.get_parm_states("/obj"),
+            {"tx": ItemState.EDITED, "ty": ItemState.DELETED},
+        )
+        self.assertEqual(
+            self.diff_result.get_parm_states("/obj/new"),
+            {"file": ItemState.CREATED},
+        )
+        self.assertEqual(self.diff_result.get_parm_states("/"), {})
+
+    def test_indices(self):
+        self.assertEqual(self.diff_result.get_target_index("/obj/new"), 2)
+        self.assertEqual(
+            self.diff_result.get_source_index("/obj/new"), MISSING_INDEX
+        )
+        self.assertFalse(self.diff_result.is_identical)
+        self.assertTrue(DiffResult(["/"], ["/"], ["/"]).is_identical)
+
+
+class TestDiffResultMoves(unittest.TestCase):
+    def test_moved_node(self):
+        diff_result = DiffResult(
+            ["/", "/obj/old"], ["/", "/obj/new"], ["/", "/obj/old", "/obj/new"]
+        )
+        diff_result.moved.append((1, 1))
+        diff_result.parm_changes.append(ParmChange(1, 1, "tx", ItemState.EDITED))
+
+        for path, moved_path in (
+            ("/obj/old", "/obj/new"),
+            ("/obj/new", "/obj/old"),
+        ):
+            self.assertEqual(diff_result.get_node_state(path), ItemState.MOVED)
+            self.assertEqual(diff_result.get_moved_path(path), moved_path)
+            self.assertEqual(
+                diff_result.get_parm_states(path), {"tx": ItemState.EDITED}
+            )
+        self.assertIsNone(diff_result.get_moved_path("/"))
+        self.assertFalse(diff_result.is_identical)
+
+    def test_row_paths(self):
+        diff_result = DiffResult(
+            ["/", "/obj/old"], ["/", "/obj/new"], ["/", "/obj/old", "/obj/new"]
+        )
+        diff_result.moved.append((1, 1))
+        source_nodes = create_nodes(create_node("/"), create_node("/obj/old"))
+        target_nodes = create_nodes(create_node("/"), create_node("/obj/new"))
+
+        self.assertEqual(diff_result.get_row_paths(), ["/", "/obj/old"])
+        self.assertEqual(diff_result.get_row_path("/obj/new"), "/obj/old")
+        self.assertEqual(diff_result.get_row_path("/obj/old"), "/obj/old")
+        self.assertIs(
+            diff_result.get_row_node(target_nodes, "/obj/old"),
+            target_nodes["/obj/new"],
+        )
+        self.assertIs(
+            diff_result.get_row_node(source_nodes, "/obj/old"),
+            source_nodes["/obj/old"],
+        )
+
+
+class TestDiffResultConnections(unittest.TestCase):
+    def setUp(self):
+        self.diff_result = DiffResult(
+            ["/", "/obj/box", "/obj/sphere", "/obj/merge"],
+            ["/", "/obj/box", "/obj/merge"],
+            ["/", "/obj/box", "/obj/sphere", "/obj/merge"],
+        )
+        self.diff_result.deleted.append(2)
+        self.diff_result.connection_changes.append(
+            ConnectionChange(
+                Edge("/obj/sphere", 0, "/obj/merge", 0),
+                Edge("/obj/box", 1, "/obj/merge", 0),
+                ItemState.EDITED,
+            )
+        )
+
+    def test_connection_rows(self):
+        self.assertEqual(
+            self.diff_result.get_connection_rows("/obj/merge"),
+            {
+                "-> input 0": ConnectionRow(
+                    ItemState.EDITED, "sphere:0", "box:1"
+                )
+            },
+        )
+        self.assertEqual(
+            self.diff_result.get_connection_rows("/obj/box"),
+            {"<- output 1": ConnectionRow(ItemState.CREATED, None, "merge:0")},
+        )
+        self.assertEqual(
+            self.diff_result.get_connection_rows("/obj/sphere"),
+            {"<- output 0": ConnectionRow(ItemState.DELETED, "merge:0", None)},
+        )
+
+    def test_node_states(self):
+        # the first lookup builds the states of all nodes
+        self.assertEqual(
+            self.diff_result.get_node_state("/obj/merge"), ItemState.EDITED
+        )
+        self.assertEqual(
+            self.diff_result.get_node_state("/obj/box"), ItemState.EDITED
+        )
+        self.assertEqual(
+            self.diff_result.get_node_state("/obj/sphere"), ItemState.DELETED
+        )
+        self.assertFalse(self.diff_result.is_identical)
+
+
+class TestShownValues(unittest.TestCase):
+    def test_shown_value(self):
+        node_data = create_node("/obj/box", "box", {"tx": 1.5}, ("tx", "ty"))
+        node_data.user_data = ParamData("userData", {"key": "value"}, None)
+
+        self.assertEqual(get_shown_value(node_data, "tx"), 1.5)
+        self.assertEqual(get_shown_value(node_data, "ty"), DEFAULT_PARM_VALUE)
+        self.assertEqual(
+            get_shown_value(node_data, USER_DATA_PARM_NAME), "key: value"
+        )
+        self.assertTrue(has_parm_row(node_data, "ty"))
+        self.assertFalse(has_parm_row(node_data, "tz"))
+
+
+if __name__ == "__main__":
+    unittest.main()
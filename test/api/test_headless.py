@@ -0,0 +1,238 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import main
+from api.comparators.archive_hip_comparator import ArchiveHipFileComparator
+from api.headless import (
+    EXIT_DIFFERENT,
+    EXIT_ERROR,
+    EXIT_IDENTICAL,
+    get_connection_change,
+    iter_changes,
+    iter_node_changes,
+    iter_streamed_changes,
+)
+from api.data.item_data import ItemState
+from api.data.node_graph import Edge
+from api.diff_result import ConnectionChange, NodeDiff
+from test.api.node_factory import compare_nodes, create_node, create_nodes
+
+
+class TestHeadless(unittest.TestCase):
+    SOURCE_HIP_FILE = "test/fixtures/billowy_smoke_source.hipnc"
+    TARGET_HIP_FILE = "test/fixtures/billowy_smoke_source_edited.hipnc"
+
+    def _run_main(self, *args):
+        argv = ["main.py", "--headless", "--backend", "archive", *args]
+        stdout = io.StringIO()
+        with patch.object(sys, "argv", argv), contextlib.redirect_stdout(
+            stdout
+        ), contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit) as context:
+                main.main()
+        return context.exception.code, stdout.getvalue()
+
+    def test_iter_changes(self):
+        comparator = ArchiveHipFileComparator(
+            self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE
+        )
+        comparator.compare()
+        changes = list(iter_changes(comparator))
+
+        self.assertIn(
+            {
+                "kind": "parm",
+                "change": "edited",
+                "path": "/obj/billowy_smoke/smoke_base",
+                "parm": "rad",
+                "source": "(1, 0.5)",
+                "target": "(2, 0.5)",
+            },
+            changes,
+        )
+        self.assertIn(
+            {
+                "kind": "node",
+                "change": "created",
+                "path": "/obj/billowy_smoke/null1",
+            },
+            changes,
+        )
+        self.assertIn(
+            {
+                "kind": "node",
+                "change": "deleted",
+                "path": "/obj/billowy_smoke/attribadjustvector_velocity",
+            },
+            changes,
+        )
+        self.assertIn(
+            {
+                "kind": "connection",
+                "change": "rewired",
+                "path": "/obj/billowy_smoke/pyrosource1",
+                "input": 0,
+                "source": "/obj/billowy_smoke/smoke_base:0",
+                "target": "/obj/billowy_smoke/null1:0",
+            },
+            changes,
+        )
+
+    def test_iter_streamed_changes(self):
+        comparator = ArchiveHipFileComparator(
+            self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE
+        )
+        changes = list(iter_streamed_changes(comparator))
+
+        comparator.compare()
+        expected = list(iter_changes(comparator))
+        self.assertEqual(len(changes), len(expected))
+        for change in expected:
+            self.assertIn(change, changes)
+        self.assertEqual(changes[-1]["kind"], "connection")
+
+    def test_renamed_node_changes(self):
+        node_diff = NodeDiff(
+            "/obj/geo",
+            ItemState.MOVED,
+            create_node("/obj/geo"),
+            create_node("/obj/character"),
+            {},
+            "/obj/character",
+        )
+
+        self.assertEqual(
+            list(iter_node_changes(node_diff)),
+            [
+                {
+                    "kind": "node",
+                    "change": "renamed",
+                    "path": "/obj/geo",
+                    "target_path": "/obj/character",
+                }
+            ],
+        )
+
+    def test_renamed_subnet_changes(self):
+        parms = {f"parm{index}": index for index in range(20)}
+        children = ("box", "sphere", "merge")
+        source_nodes = create_nodes(
+            create_node("/"),
+            create_node("/obj"),
+            create_node("/obj/geo", "geo", parms),
+            *(create_node(f"/obj/geo/{name}", name) for name in children),
+        )
+        target_nodes = create_nodes(
+            create_node("/"),
+            create_node("/obj"),
+            create_node("/obj/character", "geo", parms),
+            create_node("/obj/character/box", "box", {"size": 2}),
+            *(
+                create_node(f"/obj/character/{name}", name)
+                for name in children[1:]
+            ),
+        )
+        comparator = compare_nodes(source_nodes, target_nodes)
+
+        self.assertEqual(
+            list(iter_changes(comparator)),
+            [
+                {
+                    "kind": "node",
+                    "change": "renamed",
+                    "path": "/obj/geo",
+                    "target_path": "/obj/character",
+                },
+                {
+                    "kind": "parm",
+                    "change": "created",
+                    "path": "/obj/geo/box",
+                    "parm": "size",
+                    "source": None,
+                    "target": "2",
+                },
+            ],
+        )
+
+    def test_added_connection_change(self):
+        change = ConnectionChange(
+            None, Edge("/obj/geo/box", 0, "/obj/geo/merge", 1),
+            ItemState.CREATED,
+        )
+
+        self.assertEqual(
+            get_connection_change(change),
+            {
+                "kind": "connection",
+                "change": "added",
+                "path": "/obj/geo/merge",
+                "input": 1,
+                "source": None,
+                "target": "/obj/geo/box:0",
+            },
+        )
+
+    def test_different_files(self):
+        code, output = self._run_main(
+            "-s", self.SOURCE_HIP_FILE, "-t", self.TARGET_HIP_FILE
+        )
+
+        self.assertEqual(code, EXIT_DIFFERENT)
+        report = json.loads(output)
+        self.assertFalse(report["identical"])
+        self.assertTrue(report["changes"])
+        self.assertNotIn("ui.hip_file_diff_window", sys.modules)
+
+    def test_parallel_extraction(self):
+        with patch.object(
+            ArchiveHipFileComparator,
+            "compare",
+            autospec=True,
+            side_effect=ArchiveHipFileComparator.compare,
+        ) as compare:
+            code, output = self._run_main(
+                "-s", self.SOURCE_HIP_FILE, "-t", self.TARGET_HIP_FILE,
+                "--parallel",
+            )
+
+        self.assertEqual(code, EXIT_DIFFERENT)
+        compare.assert_called_once()
+        self.assertTrue(json.loads(output)["changes"])
+
+    def test_identical_files_ndjson(self):
+        code, output = self._run_main(
+            "-s", self.SOURCE_HIP_FILE, "-t", self.SOURCE_HIP_FILE,
+            "--format", "ndjson",
+        )
+
+        self.assertEqual(code, EXIT_IDENTICAL)
+        self.assertEqual(output, "")
+
+    def test_corrupt_archive(self):
+        # an odc archive with a truncated user data section
+        name = b"obj.userdata\0"
+        data = b"\0\0\0\5"
+        header = b"070707" + b"0" * 53 + b"%06o" % len(name)
+        header += b"%011o" % len(data)
+        with tempfile.TemporaryDirectory() as directory:
+            hip_path = os.path.join(directory, "corrupt.hip")
+            with open(hip_path, "wb") as file:
+                file.write(header + name + data)
+            code, _ = self._run_main(
+                "-s", self.SOURCE_HIP_FILE, "-t", hip_path
+            )
+
+        self.assertEqual(code, EXIT_ERROR)
+
+    def test_missing_file(self):
+        code, _ = self._run_main(
+            "-s", self.SOURCE_HIP_FILE, "-t", "test/fixtures/missing.hipnc"
+        )
+
+        self.assertEqual(code, EXIT_ERROR)
@@ -0,0 +1,210 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from api.comparators.archive_hip_comparator import ArchiveHipFileComparator
+from api.data.item_data import ItemState
+from api.readers.hip_archive_reader import (
+    HipArchiveReader,
+    parse_channels,
+    parse_def_connections,
+    parse_parm_section,
+    parse_user_data,
+)
+
+
+class TestHipArchiveReader(unittest.TestCase):
+    SOURCE_HIP_FILE = "test/fixtures/billowy_smoke_source.hipnc"
+    TARGET_HIP_FILE = "test/fixtures/billowy_smoke_source_edited.hipnc"
+
+    def test_parse_parm_section(self):
+        data = (
+            b'{\nversion 0.8\n'
+            b'rad\t[ 0\tlocks=0 ]\t(\t1\t0.5\t)\n'
+            b'type\t[ 0\tlocks=0 ]\t(\t"poly"\t)\n'
+            b'sepparm\t[ 0\tlocks=0 ]\t(\t)\n'
+            b'code\t[ 0\tlocks=0 ]\t(\t"a(\\"b\\")\nc"\t)\n'
+            b'tx\t[ 0\tlocks=0 ]\t(\t[ tx\t2 ] \t)\n'
+            b'}\n'
+        )
+        parms = parse_parm_section(data, {"tx": 'ch("../tx")'})
+
+        self.assertEqual(parms["rad"], (1, 0.5))
+        self.assertEqual(parms["type"], "poly")
+        self.assertEqual(parms["sepparm"], "")
+        self.assertEqual(parms["code"], 'a("b")\nc')
+        self.assertEqual(parms["tx"], 'ch("../tx")')
+
+    def test_parse_channels(self):
+        data = (
+            b'{\n    channel firetemp0 {\n      default = 300\n'
+            b'      segment { options = {\t untie }\n\n'
+            b'\t length = 0 expr = ch(\\"../../firetemp0\\") }\n    }\n}\n'
+        )
+        self.assertEqual(
+            parse_channels(data), {"firetemp0": 'ch("../../firetemp0")'}
+        )
+
+    def test_parse_def_connections(self):
+        data = b'inputs\n{\n1 \tnode_b 2 1\n0 \tnode_a 0 1\n2 \t"" 0 1\n}\n'
+        self.assertEqual(
+            parse_def_connections(data), [(0, "node_a", 0), (1, "node_b", 2)]
+        )
+
+    def test_parse_user_data(self):
+        data = (
+            b"\x00\x00\x00\x02"
+            b"\x00\x03key\x00\x00\x00\x03\x00\x05value"
+            b"\x00\x05empty\x00\x00\x00\x03\x00\x00"
+        )
+        user_data = parse_user_data(data)
+        self.assertEqual(list(user_data.items()), [("key", "value"), ("empty", "")])
+
+    def test_read_nodes(self):
+        nodes = HipArchiveReader(self.SOURCE_HIP_FILE).read_nodes()
+
+        self.assertEqual(list(nodes)[:2], ["/", "/obj"])
+        self.assertEqual(nodes["/"].type, "root")
+        self.assertEqual(nodes["/obj"].type, "obj")
+        node = nodes["/obj/billowy_smoke/smoke_base"]
+        self.assertEqual(node.name, "smoke_base")
+        self.assertEqual(node.type, "torus")
+        self.assertEqual(node.parent_path, "/obj/billowy_smoke")
+        self.assertEqual(node.get_parm_by_name("rad").value, (1, 0.5))
+        self.assertIn("testData5: tralala", node.user_data.value)
+
+        connected_node = nodes["/obj/billowy_smoke/pyrosource1"]
+        self.assertEqual(
+            connected_node.inputs, ((0, "/obj/billowy_smoke/smoke_base", 0),)
+        )
+        self.assertNotIn("-> input connections", connected_node.parms)
+
+    def test_read_nodes_skips_locked_hda_contents(self):
+        nodes = HipArchiveReader(self.SOURCE_HIP_FILE).read_nodes()
+
+        self.assertIn("/obj/billowy_smoke/pyrolook_billowy_smoke", nodes)
+        self.assertNotIn(
+            "/obj/billowy_smoke/pyrolook_billowy_smoke/matnet", nodes
+        )
+
+    def test_iter_nodes(self):
+        reader = HipArchiveReader(self.SOURCE_HIP_FILE)
+        read_counts = []
+        paths = [path for path, _ in reader.iter_nodes(read_counts.append)]
+
+        self.assertEqual(paths, list(reader.read_nodes()))
+        self.assertEqual(read_counts, list(range(2, len(paths) + 1)))
+
+    def test_unsupported_archive(self):
+        with self.assertRaises(RuntimeError):
+            list(HipArchiveReader(__file__).iter_entries())
+
+    def test_compare(self):
+        comparator = ArchiveHipFileComparator(
+            self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE
+        )
+        comparator.compare()
+
+        diff_result = comparator.diff_result
+        edited_path = "/obj/billowy_smoke/smoke_base"
+        self.assertEqual(
+            diff_result.get_parm_states(edited_path)["rad"], ItemState.EDITED
+        )
+        self.assertEqual(
+            comparator.source_data[edited_path].get_parm_value("rad"), (1, 0.5)
+        )
+        self.assertEqual(
+            comparator.target_data[edited_path].get_parm_value("rad"), (2, 0.5)
+        )
+
+        created_path = "/obj/billowy_smoke/null1"
+        self.assertNotIn(created_path, comparator.source_data)
+        self.assertEqual(
+            diff_result.get_node_state(created_path), ItemState.CREATED
+        )
+
+        deleted_path = "/obj/billowy_smoke/attribadjustvector_velocity"
+        self.assertNotIn(deleted_path, comparator.target_data)
+        self.assertEqual(
+            diff_result.get_node_state(deleted_path), ItemState.DELETED
+        )
+
+        self.assertEqual(
+            set(diff_result.paths),
+            set(comparator.source_data) | set(comparator.target_data),
+        )
+        seen_paths = set()
+        for path in diff_result.paths:
+            node_data = comparator.source_data.get(
+                path, comparator.target_data.get(path)
+            )
+            if node_data.parent_path:
+                self.assertIn(node_data.parent_path, seen_paths)
+            seen_paths.add(path)
+
+    def test_extraction_mode(self):
+        comparator = ArchiveHipFileComparator(
+            self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE, extraction_mode="raw"
+        )
+        self.assertEqual(comparator.extraction_mode, "raw")
+        # the mode has no effect on archives, so it doesn't split cache keys
+        self.assertEqual(
+            comparator.get_extraction_settings(),
+            ArchiveHipFileComparator(
+                self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE
+            ).get_extraction_settings(),
+        )
+
+        with self.assertRaises(ValueError):
+            ArchiveHipFileComparator(
+                self.SOURCE_HIP_FILE,
+                self.TARGET_HIP_FILE,
+                extraction_mode="cooked",
+            )
+
+    def test_compare_parallel(self):
+        sequential_comparator = ArchiveHipFileComparator(
+            self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE
+        )
+        sequential_comparator.compare()
+
+        parallel_comparator = ArchiveHipFileComparator(
+            self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE, parallel=True
+        )
+        parallel_comparator.compare()
+
+        for data_name in ("source_data", "target_data"):
+            sequential_data = getattr(sequential_comparator, data_name)
+            parallel_data = getattr(parallel_comparator, data_name)
+            self.assertEqual(list(sequential_data), list(parallel_data))
+
+        sequential_result = sequential_comparator.diff_result
+        parallel_result = parallel_comparator.diff_result
+        self.assertEqual(sequential_result.paths, parallel_result.paths)
+        self.assertEqual(
+            sequential_result.parm_changes, parallel_result.parm_changes
+        )
+
+    def test_hou_is_not_imported(self):
+        # a hou module which fails on import, as if Houdini was found
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "hou.py"), "w") as file:
+                file.write("raise RuntimeError('hou was imported')\n")
+            environment = dict(
+                os.environ,
+                PYTHONPATH=os.pathsep.join((directory, os.getcwd())),
+            )
+            process = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    "import main, api.comparators.archive_hip_comparator",
+                ],
+                env=environment,
+                capture_output=True,
+                text=True,
+            )
+
+        self.assertEqual(process.returncode, 0, process.stderr)
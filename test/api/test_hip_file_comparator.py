@@ -2,10 +2,10 @@ import unittest
 from unittest.mock import patch, Mock
 
 from api.comparators.hip_comparator import HipFileComparator
-from api.utilities import COLORS
 from api.data.item_data import ItemState
 from api.data.node_data import NodeData
 from api.data.param_data import ParamData
+from api.diff_result import DiffResult, ParmChange
 import hou
 
 
@@ -144,7 +144,7 @@ class TestHipFileComparator(unittest.TestCase):
 
         self.assertEqual(node_data.name, node.name())
         self.assertEqual(node_data.path, node.path())
-        self.assertEqual(node_data.type, node.type())
+        self.assertEqual(node_data.type, node.type().name())
         self.assertEqual(node_data.icon, node.type().icon())
         self.assertEqual(node_data.parent_path, self.hip_comparator._get_parent_path(node))
 
@@ -170,244 +170,124 @@ class TestHipFileComparator(unittest.TestCase):
             
         self.assertEqual(str(context.exception), "Incorrect source path specified. Such file doesn't exist.")
 
-    @patch("api.node_data.NodeData")
-    @patch("api.param_data.ParamData")
-    def test_compare_node_params_edited(self, MockParamData, MockNodeData):
+    def test_compare_node_params_edited(self):
         comparator = HipFileComparator(
-            self.SOURCE_HIP_FILE, 
+            self.SOURCE_HIP_FILE,
             self.TARGET_HIP_FILE
         )
 
-        # Create mock objects for source and target nodes and params
-        source_param = Mock()
-        source_param.value = "source_value"
-
-        source_param2 = Mock()
-        source_param2.value = "value2"
-
-        source_parms_dummy = {
-            "test_param": source_param,
-            "test_param2": source_param2
-        }
-        source_node_data = Mock(items=source_parms_dummy)
-
-        # Set up the source node's params dictionary to simulate having a param
-        source_node_data.parms = source_parms_dummy
-
-        target_param = Mock()
-        target_param.value = "target_value"
-
-        target_param2 = Mock()
-        target_param2.value = "value2"
-
-        # Set up the target node's params dictionary to simulate having a param
-        target_parms_dummy = {
-            "test_param": source_param,
-            "test_param2": target_param2
-        }
-        target_node_data = Mock(items=target_parms_dummy)
-        target_node_data.parms = target_parms_dummy
-
-        dummy_path = "dummy_path"
-        # Set the source and target nodes in the comparator's internal dictionaries
-        comparator.source_nodes = {
-            dummy_path : source_node_data,
-        }
-        comparator.target_nodes = {
-            dummy_path : target_node_data,
-        }
-
-        # Mock the ParamData object returned by get_parm_by_name
-        source_node_data.get_parm_by_name.return_value = source_param
-        target_node_data.get_parm_by_name.return_value = target_param
-
-        # Call the method under test
-        comparator._compare_node_params(dummy_path, source_node_data)
-
-        # Assert that the state and visual properties are set as expected
-        self.assertEqual(
-            comparator.source_nodes[dummy_path].state, 
-            ItemState.EDITED
+        source_node_data = NodeData("node")
+        source_node_data.add_parm(
+            "test_param", ParamData("test_param", "source_value", None)
         )
-        self.assertEqual(
-            comparator.source_nodes[dummy_path].color, 
-            COLORS["red"]
+        source_node_data.add_parm(
+            "test_param2", ParamData("test_param2", "value2", None)
         )
-        self.assertEqual(comparator.source_nodes[dummy_path].alpha, 100)
 
-        self.assertEqual(
-            comparator.target_nodes[dummy_path].state, 
-            ItemState.EDITED
-        )
-        self.assertEqual(
-            comparator.target_nodes[dummy_path].color, 
-            COLORS["green"]
+        target_node_data = NodeData("node")
+        target_node_data.add_parm(
+            "test_param", ParamData("test_param", "target_value", None)
         )
-        self.assertEqual(comparator.target_nodes[dummy_path].alpha, 100)
-        
-    def test_mark_node_as_created(self):
-        hip_comparator = HipFileComparator(
-            self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE
+        target_node_data.add_parm(
+            "test_param2", ParamData("test_param2", "value2", None)
         )
 
-        target_node = NodeData("")
-        target_node.parent_path = 'parent/path'
-
-        node_path = 'dummy_path'
-        hip_comparator.target_nodes[node_path] = target_node
-
-        hip_comparator._mark_node_as_created(node_path)
-
-        # Assert that a NodeData object is created with an empty string
-        new_data = NodeData("")
-        new_data.parent_path = 'parent/path'
-        new_data.state = ItemState.CREATED
-        new_data.alpha = 100
-        new_data.is_hatched = True
-        
-        # Assert that the state, color, and alpha properties of the NodeData 
-        # object in self.target_nodes are updated correctly
-        self.assertEqual(
-            hip_comparator.target_nodes[node_path].state, ItemState.CREATED
+        comparator.diff_result = DiffResult(["/node"], ["/node"], ["/node"])
+        comparator._compare_node_params(
+            0, 0, source_node_data, target_node_data
         )
+
         self.assertEqual(
-            hip_comparator.target_nodes[node_path].color, COLORS["green"]
+            comparator.diff_result.parm_changes,
+            [ParmChange(0, 0, "test_param", ItemState.EDITED)],
         )
-        self.assertEqual(hip_comparator.target_nodes[node_path].alpha, 100)
+        # snapshots are left untouched
+        self.assertFalse(list(source_node_data.parms.iter_records()))
+        self.assertFalse(list(target_node_data.parms.iter_records()))
 
-    def test_mark_node_as_deleted(self):
+    def test_handle_created_nodes(self):
         hip_comparator = HipFileComparator(
             self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE
         )
 
-        source_node_data = NodeData("")
-        source_node_data.parent_path = 'parent/path'
-        
-        node_path = 'dummy_path'
-        hip_comparator.source_nodes[node_path] = source_node_data
+        target_node = NodeData("new_node")
+        target_node.parent_path = "/obj"
+        target_node.add_parm(
+            "new_param", ParamData("new_param", "value", None)
+        )
+        hip_comparator.target_nodes["/obj/new_node"] = target_node
+        hip_comparator.diff_result = DiffResult([], ["/obj/new_node"], [])
 
-        hip_comparator._mark_node_as_deleted(node_path, source_node_data)
+        hip_comparator._handle_created_nodes()
 
-        # Assert that the state, color, 
-        # and alpha properties of the source_node_data 
-        # are updated correctly
+        diff_result = hip_comparator.diff_result
+        self.assertEqual(diff_result.created, [0])
+        self.assertEqual(diff_result.paths, ["/obj/new_node"])
         self.assertEqual(
-            source_node_data.state, ItemState.DELETED
+            diff_result.get_node_state("/obj/new_node"), ItemState.CREATED
         )
         self.assertEqual(
-            source_node_data.color, COLORS["red"]
+            diff_result.get_parm_states("/obj/new_node"),
+            {"new_param": ItemState.CREATED},
         )
-        self.assertEqual(source_node_data.alpha, 100)
 
-    def test_handle_created_params(self):
+    def test_handle_deleted_nodes(self):
         hip_comparator = HipFileComparator(
             self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE
         )
 
-        # Creating mock nodes and params
-        source_node = NodeData("")
-        target_node = NodeData("")
-        target_param = ParamData("new_param", "", "value")
-        target_node.add_parm("new_param", target_param)
+        source_node_data = NodeData("old_node")
+        source_node_data.parent_path = "/obj"
+        hip_comparator.source_nodes["/obj/old_node"] = source_node_data
+        hip_comparator.diff_result = DiffResult(["/obj/old_node"], [], [])
 
-        # Adding the mock nodes to the comparator's internal dictionaries
-        hip_comparator.source_nodes['/path'] = source_node
-        hip_comparator.target_nodes['/path'] = target_node
+        hip_comparator._handle_deleted_and_edited_nodes()
 
-        hip_comparator._handle_created_params()
-
-        # Assert that the state, color, and alpha properties of the target param are updated
-        self.assertEqual(target_param.state, ItemState.CREATED)
-        self.assertEqual(target_param.color, COLORS["green"])
-        self.assertEqual(target_param.alpha, 55)
-
-        # Assert that the state, color, and alpha properties of the target node are updated
-        self.assertEqual(target_node.state, ItemState.EDITED)
-        self.assertEqual(target_node.color, COLORS["green"])
-        self.assertEqual(target_node.alpha, 100)
-
-        # Assert that the source node has the new param with the expected properties
-        created_param = source_node.get_parm_by_name("new_param")
-        self.assertIsNotNone(created_param)
-        self.assertEqual(created_param.state, ItemState.CREATED)
-        self.assertEqual(created_param.alpha, 55)
-        self.assertTrue(created_param.is_hatched)
-        self.assertFalse(created_param.is_active)
-
-        # Assert that the state and alpha properties of the source node are updated
-        self.assertEqual(source_node.state, ItemState.EDITED)
-        self.assertEqual(source_node.alpha, 100)
+        self.assertEqual(hip_comparator.diff_result.deleted, [0])
+        self.assertEqual(
+            hip_comparator.diff_result.get_node_state("/obj/old_node"),
+            ItemState.DELETED,
+        )
 
     def test_compare(self):
-        
         self.hip_comparator.compare()
+        diff_result = self.hip_comparator.diff_result
 
         edited_node_path = "/obj/billowy_smoke/smoke_base"
-        edted_param_name = "radx"
-        source_parm_val = 1.0
-
-        edited_source_node = self.hip_comparator.source_nodes[
-            edited_node_path
-        ]
+        edited_param_name = "radx"
 
-        edited_source_parm = edited_source_node.get_parm_by_name(
-            edted_param_name
+        self.assertEqual(
+            diff_result.get_node_state(edited_node_path), ItemState.EDITED
         )
-
-        target_parm_val = 2.0
-        edited_target_node = self.hip_comparator.target_nodes[
-            edited_node_path
-        ]
-        edited_target_parm = edited_target_node.get_parm_by_name(
-            edted_param_name
+        self.assertEqual(
+            diff_result.get_parm_states(edited_node_path)[edited_param_name],
+            ItemState.EDITED,
+        )
+        self.assertEqual(
+            self.hip_comparator.source_nodes[edited_node_path].get_parm_value(
+                edited_param_name
+            ),
+            1.0,
+        )
+        self.assertEqual(
+            self.hip_comparator.target_nodes[edited_node_path].get_parm_value(
+                edited_param_name
+            ),
+            2.0,
         )
-
-        self.assertEqual(edited_source_node.state, ItemState.EDITED)
-        self.assertEqual(edited_source_node.color, COLORS["red"])
-
-        self.assertEqual(edited_target_node.state, ItemState.EDITED)
-        self.assertEqual(edited_target_node.color, COLORS["green"])
-
-        self.assertEqual(edited_source_parm.value, source_parm_val)
-        self.assertEqual(edited_target_parm.value, target_parm_val)
-
-        self.assertEqual(edited_source_parm.state, ItemState.EDITED)
-        self.assertEqual(edited_target_parm.state, ItemState.EDITED)
-
-        self.assertEqual(edited_source_parm.color, COLORS["red"])
-        self.assertEqual(edited_source_parm.alpha, 55)
-
-        self.assertEqual(edited_target_parm.color, COLORS["green"])
-        self.assertEqual(edited_target_parm.alpha, 55)
 
         created_node_path = "/obj/billowy_smoke/null1"
-        create_node_parm = "copyinput"
-        created_source_node = self.hip_comparator.source_nodes[
-            created_node_path
-        ]
-        created_source_parm = created_source_node.get_parm_by_name(
-            create_node_parm
+        self.assertNotIn(created_node_path, self.hip_comparator.source_nodes)
+        self.assertEqual(
+            diff_result.get_node_state(created_node_path), ItemState.CREATED
         )
-
-        self.assertEqual(created_source_node.name, "")
-        self.assertEqual(created_source_node.state, ItemState.EDITED)
-        self.assertEqual(created_source_node.is_hatched, True)
-
-        self.assertEqual(created_source_parm.value, "")
-        self.assertEqual(created_source_parm.state, ItemState.CREATED)
-        self.assertEqual(created_source_parm.is_hatched, True)
-      
-        created_target_node = self.hip_comparator.target_nodes[
-            created_node_path
-        ]
-        created_target_parm = created_target_node.get_parm_by_name(
-            create_node_parm
+        self.assertEqual(
+            diff_result.get_parm_states(created_node_path)["copyinput"],
+            ItemState.CREATED,
+        )
+        self.assertEqual(
+            self.hip_comparator.target_nodes[created_node_path].get_parm_value(
+                "copyinput"
+            ),
+            1,
         )
-
-        self.assertEqual(created_target_node.name, "null1")
-        self.assertEqual(created_target_node.state, ItemState.EDITED)
-        self.assertEqual(created_target_parm.is_hatched, False)
-
-        self.assertEqual(created_target_parm.value, 1)
-        self.assertEqual(created_target_parm.state, ItemState.CREATED)
-        self.assertEqual(created_target_parm.is_hatched, False)
@@ -0,0 +1,460 @@
+from collections import OrderedDict
+import copy
+import unittest
+from unittest.mock import patch
+
+from api.comparators.archive_hip_comparator import ArchiveHipFileComparator
+from api.comparators.houdini_base_comparator import (
+    ComparisonCancelled,
+    HoudiniComparator,
+)
+from api.data.item_data import ItemState
+from api.data.node_hashes import compute_content_hash
+from api.diff_result import (
+    DEFAULT_PARM_VALUE,
+    ConnectionRow,
+    get_shown_value,
+)
+from test.api.node_factory import (
+    HIP_FILE,
+    compare_nodes,
+    create_node,
+    create_nodes,
+)
+
+SUBNET_PATH = "/obj/billowy_smoke"
+
+
+def _rename(path):
+    """Return a path with the fixture subnet renamed."""
+    if path is None or not (
+        path == SUBNET_PATH or path.startswith(f"{SUBNET_PATH}/")
+    ):
+        return path
+    return "/obj/renamed" + path[len(SUBNET_PATH):]
+
+
+class TestHoudiniComparatorSkipDefaults(unittest.TestCase):
+    def _create_node(self, parms, present_parms):
+        return create_node("/obj/box", "box", parms, present_parms)
+
+    def _compare(self, source_node, target_node):
+        self.comparator = compare_nodes(
+            create_nodes(create_node("/"), create_node("/obj"), source_node),
+            create_nodes(create_node("/"), create_node("/obj"), target_node),
+            skip_defaults=True,
+        )
+        return self.comparator.diff_result.get_parm_states("/obj/box")
+
+    def test_parm_at_default_in_target(self):
+        source_node = self._create_node({"tx": 1}, ["tx", "ty"])
+        target_node = self._create_node({}, ["tx", "ty"])
+        parm_states = self._compare(source_node, target_node)
+
+        self.assertEqual(parm_states, {"tx": ItemState.EDITED})
+        self.assertEqual(
+            get_shown_value(target_node, "tx"), DEFAULT_PARM_VALUE
+        )
+        self.assertNotIn("tx", target_node.parms)
+
+    def test_parm_at_default_in_source(self):
+        source_node = self._create_node({}, ["tx"])
+        target_node = self._create_node({"tx": 1}, ["tx"])
+        parm_states = self._compare(source_node, target_node)
+
+        self.assertEqual(parm_states, {"tx": ItemState.EDITED})
+        self.assertEqual(
+            get_shown_value(source_node, "tx"), DEFAULT_PARM_VALUE
+        )
+
+    def test_parm_missing_in_target(self):
+        source_node = self._create_node({"tx": 1}, ["tx"])
+        target_node = self._create_node({}, [])
+        parm_states = self._compare(source_node, target_node)
+
+        self.assertEqual(parm_states, {"tx": ItemState.DELETED})
+
+    def test_parm_missing_in_source(self):
+        source_node = self._create_node({}, [])
+        target_node = self._create_node({"tx": 1}, ["tx"])
+        parm_states = self._compare(source_node, target_node)
+
+        self.assertEqual(parm_states, {"tx": ItemState.CREATED})
+
+    def test_default_parm_missing_on_one_side(self):
+        source_node = self._create_node({}, ["tx", "ty"])
+        target_node = self._create_node({}, ["ty", "tz"])
+        parm_states = self._compare(source_node, target_node)
+
+        self.assertEqual(
+            parm_states,
+            {"tx": ItemState.DELETED, "tz": ItemState.CREATED},
+        )
+        self.assertEqual(
+            get_shown_value(source_node, "tx"), DEFAULT_PARM_VALUE
+        )
+        self.assertFalse(self.comparator.diff_result.is_identical)
+        self.assertNotEqual(
+            compute_content_hash(source_node), compute_content_hash(target_node)
+        )
+
+    def test_extraction_settings(self):
+        comparator = ArchiveHipFileComparator(
+            HIP_FILE, HIP_FILE, skip_defaults=True
+        )
+        self.assertTrue(
+            HoudiniComparator.get_extraction_settings(comparator)[
+                "skip_defaults"
+            ]
+        )
+
+    def test_archive_extraction_settings(self):
+        # settings the archive backend ignores don't split cache keys
+        comparator = ArchiveHipFileComparator(
+            HIP_FILE, HIP_FILE, skip_defaults=True
+        )
+        default_comparator = ArchiveHipFileComparator(HIP_FILE, HIP_FILE)
+        self.assertEqual(
+            comparator.get_extraction_settings(),
+            default_comparator.get_extraction_settings(),
+        )
+
+
+class TestHoudiniComparatorTolerance(unittest.TestCase):
+    def _compare(self, source_parms, target_parms, **kwargs):
+        comparator = compare_nodes(
+            create_nodes(
+                create_node("/"),
+                create_node("/obj"),
+                create_node("/obj/box", "box", source_parms),
+            ),
+            create_nodes(
+                create_node("/"),
+                create_node("/obj"),
+                create_node("/obj/box", "box", target_parms),
+            ),
+            **kwargs,
+        )
+        return comparator.diff_result.get_parm_states("/obj/box")
+
+    def test_float_noise_is_not_edited(self):
+        parm_states = self._compare(
+            {"t": (0.1, 0.2, 0.3), "scale": 1.0},
+            {"t": (0.1 + 1e-12, 0.2, 0.3), "scale": 1.0 - 1e-12},
+        )
+
+        self.assertEqual(parm_states, {})
+
+    def test_edit_beyond_tolerance(self):
+        parm_states = self._compare(
+            {"t": (0.1, 0.2, 0.3), "scale": 1.0},
+            {"t": (0.1, 0.2, 0.3), "scale": 1.001},
+            abs_tolerance=1e-4,
+        )
+
+        self.assertEqual(parm_states, {"scale": ItemState.EDITED})
+
+    def test_exact_comparison(self):
+        parm_states = self._compare(
+            {"scale": 1.0},
+            {"scale": 1.0 + 1e-12},
+            abs_tolerance=0.0,
+            rel_tolerance=0.0,
+        )
+
+        self.assertEqual(parm_states, {"scale": ItemState.EDITED})
+
+    def test_numbers_are_compared_in_bulk(self):
+        with patch(
+            "api.comparators.houdini_base_comparator.values_equal",
+            side_effect=AssertionError,
+        ):
+            parm_states = self._compare(
+                {"t": (0.1, 0.2, 0.3), "scale": 1.0, "ty": 2},
+                {"t": (0.1 + 1e-12, 0.2, 0.3), "scale": 1.5, "ty": 2},
+            )
+
+        self.assertEqual(parm_states, {"scale": ItemState.EDITED})
+
+    def test_mismatching_types(self):
+        parm_states = self._compare(
+            {"t": (0.1, 0.2), "scale": "1", "file": "a.bgeo"},
+            {"t": [0.1, 0.2], "scale": 1, "file": "b.bgeo"},
+        )
+
+        self.assertEqual(
+            parm_states,
+            {"t": ItemState.EDITED, "file": ItemState.EDITED},
+        )
+
+    def test_negative_tolerance(self):
+        with self.assertRaises(ValueError):
+            ArchiveHipFileComparator(HIP_FILE, HIP_FILE, abs_tolerance=-1.0)
+
+
+class TestHoudiniComparatorMoves(unittest.TestCase):
+    def _compare(self, **kwargs):
+        parms = {f"parm{index}": index for index in range(20)}
+        comparator = compare_nodes(
+            create_nodes(
+                create_node("/"),
+                create_node("/obj"),
+                create_node("/obj/geo", "geo", {"tx": 1}),
+                create_node("/obj/geo/box", "box", parms),
+            ),
+            create_nodes(
+                create_node("/"),
+                create_node("/obj"),
+                create_node("/obj/character", "geo", {"tx": 1}),
+                create_node(
+                    "/obj/character/box", "box", dict(parms, parm0=-1)
+                ),
+            ),
+            **kwargs,
+        )
+        return comparator.diff_result
+
+    def test_renamed_subnet(self):
+        diff_result = self._compare()
+
+        self.assertEqual(diff_result.moved, [(2, 2)])
+        self.assertEqual(diff_result.moved_descendants, [(3, 3)])
+        self.assertFalse(diff_result.created)
+        self.assertFalse(diff_result.deleted)
+        for path in ("/obj/geo/box", "/obj/character/box"):
+            self.assertEqual(diff_result.get_node_state(path), ItemState.EDITED)
+            self.assertEqual(
+                diff_result.get_parm_states(path), {"parm0": ItemState.EDITED}
+            )
+        self.assertEqual(
+            diff_result.get_moved_path("/obj/geo/box"), "/obj/character/box"
+        )
+        self.assertEqual(
+            diff_result.get_node_state("/obj/character"), ItemState.MOVED
+        )
+        self.assertEqual(diff_result.get_parm_states("/obj/geo"), {})
+        # a move and a parm edit, counted once by the common parent
+        for path in ("/obj", "/obj/geo", "/obj/character"):
+            self.assertEqual(diff_result.get_change_count(path), 2)
+        self.assertEqual(diff_result.get_change_count("/obj/geo/box"), 1)
+
+    def test_renamed_fixture_subnet(self):
+        source_nodes = ArchiveHipFileComparator(
+            HIP_FILE, HIP_FILE
+        ).get_hip_data(HIP_FILE)
+        target_nodes = OrderedDict()
+        for path, node_data in source_nodes.items():
+            renamed_data = copy.copy(node_data)
+            renamed_data.path = _rename(path)
+            renamed_data.parent_path = _rename(node_data.parent_path)
+            if path == SUBNET_PATH:
+                renamed_data.name = "renamed"
+            renamed_data.inputs = tuple(
+                (input_index, _rename(input_path), output_index)
+                for input_index, input_path, output_index in node_data.inputs
+            )
+            target_nodes[renamed_data.path] = renamed_data
+        comparator = compare_nodes(source_nodes, target_nodes)
+        diff_result = comparator.diff_result
+
+        self.assertEqual(
+            [
+                diff_result.source_paths[source_index]
+                for source_index, _ in diff_result.moved
+            ],
+            [SUBNET_PATH],
+        )
+        self.assertGreater(len(diff_result.moved_descendants), 1)
+        self.assertEqual(
+            list(diff_result.iter_changed_paths()),
+            [SUBNET_PATH, _rename(SUBNET_PATH)],
+        )
+        self.assertFalse(diff_result.parm_changes)
+        self.assertFalse(diff_result.connection_changes)
+        self.assertEqual(diff_result.get_change_count("/"), 1)
+
+    def test_unrelated_files(self):
+        comparator = ArchiveHipFileComparator(
+            HIP_FILE,
+            "test/fixtures/crown_splash_source_scene_w_created_parm.hipnc",
+        )
+        comparator.compare()
+
+        self.assertEqual(comparator.diff_result.moved, [])
+
+    def test_move_detection_disabled(self):
+        diff_result = self._compare(detect_moves=False)
+
+        self.assertFalse(diff_result.moved)
+        self.assertEqual(diff_result.deleted, [2, 3])
+        self.assertEqual(diff_result.created, [2, 3])
+
+
+class TestHoudiniComparatorProgress(unittest.TestCase):
+    SOURCE_HIP_FILE = "test/fixtures/billowy_smoke_source.hipnc"
+    TARGET_HIP_FILE = "test/fixtures/billowy_smoke_source_edited.hipnc"
+
+    def setUp(self):
+        self.comparator = ArchiveHipFileComparator(
+            self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE
+        )
+        self.progress = []
+        self.comparator.progress_callback = (
+            lambda *progress: self.progress.append(progress)
+        )
+
+    def test_progress_reported(self):
+        with patch(
+            "api.comparators.houdini_base_comparator.PROGRESS_INTERVAL", 1
+        ):
+            self.comparator.compare()
+
+        phases = [phase for phase, _, _ in self.progress]
+        self.assertIn("Extracting billowy_smoke_source.hipnc", phases)
+        self.assertIn("Extracting billowy_smoke_source_edited.hipnc", phases)
+        self.assertIn("Comparing nodes", phases)
+        self.assertIn("Aligning nodes", phases)
+        for _, current, total in self.progress:
+            if total:
+                self.assertLessEqual(current, total)
+
+        phase, current, total = self.progress[-1]
+        self.assertEqual(phase, "Counting changes")
+        self.assertEqual(current, total)
+
+    def test_cancel(self):
+        def cancel_on_compare(phase, current, total):
+            if phase == "Comparing nodes":
+                self.comparator.cancel()
+
+        self.comparator.progress_callback = cancel_on_compare
+
+        with self.assertRaises(ComparisonCancelled):
+            self.comparator.compare()
+        self.assertTrue(self.comparator.is_cancelled)
+        self.assertFalse(self.comparator.is_compared)
+
+
+class TestHoudiniComparatorChangeCounts(unittest.TestCase):
+    SOURCE_HIP_FILE = "test/fixtures/billowy_smoke_source.hipnc"
+    TARGET_HIP_FILE = "test/fixtures/billowy_smoke_source_edited.hipnc"
+
+    def setUp(self):
+        self.comparator = ArchiveHipFileComparator(
+            self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE
+        )
+        self.comparator.compare()
+        self.diff_result = self.comparator.diff_result
+
+    def test_root_counts_all_changes(self):
+        diff_result = self.diff_result
+        total = (
+            len(diff_result.parm_changes)
+            + len(diff_result.deleted)
+            + sum(
+                len(rows)
+                for path, rows in diff_result.iter_connection_rows()
+                if diff_result.get_node_state(path)
+                not in (ItemState.UNCHANGED, ItemState.DELETED)
+                and path in diff_result.paths
+            )
+            + sum(
+                1
+                for index in diff_result.created
+                if not diff_result.get_parm_states(
+                    diff_result.target_paths[index]
+                )
+            )
+        )
+
+        self.assertGreater(total, 0)
+        self.assertEqual(diff_result.get_change_count("/"), total)
+
+    def test_subtree_counts(self):
+        node_path = "/obj/billowy_smoke/smoke_base"
+
+        self.assertEqual(self.diff_result.get_change_count("/out"), 0)
+        self.assertNotIn("/out", self.diff_result.change_counts)
+        self.assertGreater(self.diff_result.get_change_count("/obj"), 0)
+        self.assertEqual(
+            self.diff_result.get_change_count(node_path),
+            len(self.diff_result.get_parm_states(node_path))
+            + len(self.diff_result.get_connection_rows(node_path)),
+        )
+
+    def test_connection_rows(self):
+        node_path = "/obj/billowy_smoke/pyrosource1"
+
+        self.assertEqual(
+            self.diff_result.get_node_state(node_path), ItemState.EDITED
+        )
+        self.assertEqual(
+            self.diff_result.get_connection_rows(node_path)["-> input 0"],
+            ConnectionRow(ItemState.EDITED, "smoke_base:0", "null1:0"),
+        )
+
+    def test_snapshots_are_untouched(self):
+        for data in (self.comparator.source_data, self.comparator.target_data):
+            for node_data in data.values():
+                self.assertEqual(node_data.state, ItemState.UNCHANGED)
+                self.assertFalse(node_data.is_hatched)
+                for _, parm in node_data.parms.iter_records():
+                    self.assertIn(parm.state, (None, ItemState.UNCHANGED))
+
+
+class TestHoudiniComparatorStreaming(unittest.TestCase):
+    SOURCE_HIP_FILE = "test/fixtures/billowy_smoke_source.hipnc"
+    TARGET_HIP_FILE = "test/fixtures/billowy_smoke_source_edited.hipnc"
+
+    def setUp(self):
+        self.comparator = ArchiveHipFileComparator(
+            self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE
+        )
+
+    def _describe(self, node_diffs):
+        return [
+            (node_diff.path, node_diff.state, node_diff.parm_states)
+            for node_diff in node_diffs
+        ]
+
+    def test_node_diffs(self):
+        node_diffs = {
+            node_diff.path: node_diff
+            for node_diff in self.comparator.iter_compare()
+        }
+
+        created = node_diffs["/obj/billowy_smoke/null1"]
+        self.assertEqual(created.state, ItemState.CREATED)
+        self.assertIsNone(created.source_node)
+        deleted = node_diffs["/obj/billowy_smoke/attribadjustvector_velocity"]
+        self.assertEqual(deleted.state, ItemState.DELETED)
+        self.assertIsNone(deleted.target_node)
+        edited = node_diffs["/obj/billowy_smoke/smoke_base"]
+        self.assertEqual(edited.state, ItemState.EDITED)
+        self.assertEqual(edited.parm_states["rad"], ItemState.EDITED)
+        self.assertTrue(self.comparator.is_compared)
+
+    def test_same_result_as_compare(self):
+        node_diffs = list(self.comparator.iter_compare(keep_target=False))
+        diff_result = self.comparator.diff_result
+
+        expected = ArchiveHipFileComparator(
+            self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE
+        )
+        expected.compare()
+        expected_result = expected.diff_result
+
+        self.assertEqual(diff_result.paths, expected_result.paths)
+        self.assertEqual(diff_result.change_counts, expected_result.change_counts)
+        self.assertEqual(
+            sorted(self._describe(node_diffs)),
+            sorted(self._describe(expected.iter_node_diffs())),
+        )
+        # only created nodes are kept
+        self.assertEqual(
+            list(self.comparator.target_data),
+            [
+                expected_result.target_paths[index]
+                for index in expected_result.created
+            ],
+        )
@@ -0,0 +1,56 @@
+import unittest
+
+from api.data.node_graph import Edge, diff_edges, iter_edges
+from test.api.node_factory import create_node, create_nodes
+
+
+class TestNodeGraph(unittest.TestCase):
+    def test_iter_edges(self):
+        nodes = create_nodes(
+            create_node(
+                "/obj/geo/merge",
+                inputs=((0, "/obj/geo/box", 0), (1, "/obj/geo/sphere", 2)),
+            )
+        )
+
+        self.assertEqual(
+            list(iter_edges(nodes)),
+            [
+                Edge("/obj/geo/box", 0, "/obj/geo/merge", 0),
+                Edge("/obj/geo/sphere", 2, "/obj/geo/merge", 1),
+            ],
+        )
+
+    def test_diff_edges(self):
+        kept = Edge("/obj/geo/box", 0, "/obj/geo/merge", 0)
+        removed = Edge("/obj/geo/box", 0, "/obj/geo/merge", 1)
+        rewired = Edge("/obj/geo/box", 0, "/obj/geo/out", 0)
+        added = Edge("/obj/geo/sphere", 0, "/obj/geo/merge", 2)
+        rewired_target = Edge("/obj/geo/merge", 0, "/obj/geo/out", 0)
+
+        self.assertEqual(
+            diff_edges(
+                [kept, removed, rewired], [kept, rewired_target, added]
+            ),
+            [(rewired, rewired_target), (None, added), (removed, None)],
+        )
+
+    def test_moved_nodes(self):
+        source_edge = Edge("/obj/geo/box", 0, "/obj/geo/merge", 0)
+        target_edge = Edge("/obj/character/box", 0, "/obj/character/merge", 0)
+        moved_paths = {
+            "/obj/geo/box": "/obj/character/box",
+            "/obj/geo/merge": "/obj/character/merge",
+        }
+
+        self.assertEqual(
+            diff_edges([source_edge], [target_edge], moved_paths), []
+        )
+        self.assertEqual(
+            diff_edges([source_edge], [target_edge]),
+            [(None, target_edge), (source_edge, None)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+from api.comparators.archive_hip_comparator import ArchiveHipFileComparator
+from api.data.node_hashes import compute_subtree_hashes
+from test.api.node_factory import create_node, create_nodes
+
+
+def create_tree(value):
+    nodes = create_nodes(
+        *(
+            create_node(path, parms={"tx": 0})
+            for path in ("/", "/obj", "/obj/geo", "/obj/geo/box", "/obj/cam")
+        )
+    )
+    nodes["/obj/geo/box"].parms.set_value("tx", value)
+    return nodes
+
+
+class TestNodeHashes(unittest.TestCase):
+    def test_identical_subtrees(self):
+        source_nodes = create_tree(1)
+        target_nodes = create_tree(1)
+        compute_subtree_hashes(source_nodes)
+        compute_subtree_hashes(target_nodes)
+
+        for path in source_nodes:
+            self.assertEqual(
+                source_nodes[path].subtree_hash,
+                target_nodes[path].subtree_hash,
+            )
+
+    def test_changes_roll_up_to_ancestors(self):
+        source_nodes = create_tree(1)
+        target_nodes = create_tree(2)
+        compute_subtree_hashes(source_nodes)
+        compute_subtree_hashes(target_nodes)
+
+        for path in ("/", "/obj", "/obj/geo", "/obj/geo/box"):
+            self.assertNotEqual(
+                source_nodes[path].subtree_hash,
+                target_nodes[path].subtree_hash,
+            )
+        self.assertEqual(
+            source_nodes["/obj/geo"].content_hash,
+            target_nodes["/obj/geo"].content_hash,
+        )
+        self.assertEqual(
+            source_nodes["/obj/cam"].subtree_hash,
+            target_nodes["/obj/cam"].subtree_hash,
+        )
+
+    def test_deleted_child_changes_subtree_hash(self):
+        source_nodes = create_tree(1)
+        target_nodes = create_tree(1)
+        del target_nodes["/obj/geo/box"]
+        compute_subtree_hashes(source_nodes)
+        compute_subtree_hashes(target_nodes)
+
+        self.assertNotEqual(
+            source_nodes["/obj/geo"].subtree_hash,
+            target_nodes["/obj/geo"].subtree_hash,
+        )
+
+    def test_compare_skips_identical_subtrees(self):
+        comparator = ArchiveHipFileComparator(
+            "test/fixtures/billowy_smoke_source.hipnc",
+            "test/fixtures/billowy_smoke_source.hipnc",
+        )
+        comparator._compare_node_params = None
+        comparator.compare()
+
+        self.assertTrue(comparator.diff_result.is_identical)
@@ -0,0 +1,162 @@
+import unittest
+
+from api.data.node_similarity import (
+    SIGNATURE_SIZE,
+    NodeMatches,
+    compute_signature,
+    estimate_similarity,
+    get_node_features,
+    match_nodes,
+)
+from test.api.node_factory import create_node, create_nodes
+
+
+class TestNodeSignatures(unittest.TestCase):
+    def test_similarity(self):
+        parms = {f"parm{index}": index for index in range(40)}
+        edited_parms = dict(parms, parm0=-1)
+        signature = compute_signature(
+            get_node_features(create_node("/obj/a", "box", parms))
+        )
+
+        self.assertEqual(len(signature), SIGNATURE_SIZE)
+        self.assertEqual(
+            estimate_similarity(
+                signature,
+                compute_signature(
+                    get_node_features(create_node("/obj/b", "box", parms))
+                ),
+            ),
+            1.0,
+        )
+        self.assertGreater(
+            estimate_similarity(
+                signature,
+                compute_signature(
+                    get_node_features(
+                        create_node("/obj/b", "box", edited_parms)
+                    )
+                ),
+            ),
+            0.5,
+        )
+        self.assertLess(
+            estimate_similarity(
+                signature,
+                compute_signature(
+                    get_node_features(create_node("/obj/b", "sphere", {}))
+                ),
+            ),
+            0.5,
+        )
+
+
+class TestMatchNodes(unittest.TestCase):
+    def test_renamed_subnet(self):
+        source_nodes = create_nodes(
+            create_node("/obj/geo", "geo", {"tx": 1}),
+            create_node("/obj/geo/null1", "null", {}),
+            create_node("/obj/geo/null2", "null", {}),
+        )
+        target_nodes = create_nodes(
+            create_node("/obj/character", "geo", {"tx": 1}),
+            create_node("/obj/character/null2", "null", {}),
+            create_node("/obj/character/null1", "null", {}),
+        )
+
+        self.assertEqual(
+            match_nodes(source_nodes, target_nodes),
+            NodeMatches(
+                [("/obj/geo", "/obj/character")],
+                [
+                    ("/obj/geo/null1", "/obj/character/null1"),
+                    ("/obj/geo/null2", "/obj/character/null2"),
+                ],
+            ),
+        )
+
+    def test_moved_node(self):
+        parms = {f"parm{index}": index for index in range(20)}
+        source_nodes = create_nodes(create_node("/obj/a/box", "box", parms))
+        target_nodes = create_nodes(
+            create_node("/obj/b/box_moved", "box", dict(parms, parm0=-1)),
+            create_node("/obj/b/sphere", "sphere", parms),
+        )
+
+        self.assertEqual(
+            match_nodes(source_nodes, target_nodes),
+            NodeMatches([("/obj/a/box", "/obj/b/box_moved")], []),
+        )
+
+    def test_named_children_are_paired_by_path(self):
+        source_nodes = create_nodes(
+            create_node("/obj/geo", "geo", {"tx": 1}),
+            create_node(
+                "/obj/geo/box", "box", {f"parm{i}": i for i in range(20)}
+            ),
+        )
+        target_nodes = create_nodes(
+            create_node("/obj/character", "geo", {"tx": 1}),
+            create_node(
+                "/obj/character/box", "box", {f"parm{i}": -i for i in range(20)}
+            ),
+        )
+
+        # the box is edited in place, not replaced by a dissimilar node
+        self.assertEqual(
+            match_nodes(source_nodes, target_nodes),
+            NodeMatches(
+                [("/obj/geo", "/obj/character")],
+                [("/obj/geo/box", "/obj/character/box")],
+            ),
+        )
+
+    def test_child_of_other_type_is_not_paired(self):
+        parms = {f"parm{index}": index for index in range(100)}
+        source_nodes = create_nodes(
+            create_node("/obj/geo", "geo", parms),
+            create_node("/obj/geo/shape", "box"),
+        )
+        target_nodes = create_nodes(
+            create_node("/obj/character", "geo", parms),
+            create_node("/obj/character/shape", "sphere"),
+        )
+
+        self.assertEqual(
+            match_nodes(source_nodes, target_nodes),
+            NodeMatches([("/obj/geo", "/obj/character")], []),
+        )
+
+    def test_common_values_are_ignored(self):
+        defaults = {f"parm{index}": 0 for index in range(40)}
+        source_nodes = create_nodes(
+            create_node("/obj/a", "geo", dict(defaults, tx=1)),
+            create_node("/obj/a/box", "box"),
+            create_node("/obj/a/sphere", "sphere"),
+        )
+        target_nodes = create_nodes(
+            create_node("/obj/b", "geo", dict(defaults, ty=2)),
+            create_node("/obj/c", "geo", defaults),
+            create_node("/obj/b/grid", "grid"),
+            create_node("/obj/b/torus", "torus"),
+        )
+
+        self.assertEqual(
+            match_nodes(source_nodes, target_nodes), NodeMatches([], [])
+        )
+
+    def test_dissimilar_nodes_are_not_paired(self):
+        source_nodes = create_nodes(
+            create_node("/obj/a", "box", {"sizex": 1, "sizey": 2})
+        )
+        target_nodes = create_nodes(
+            create_node("/obj/b", "box", {"sizex": 3, "sizey": 4})
+        )
+
+        self.assertEqual(
+            match_nodes(source_nodes, target_nodes), NodeMatches([], [])
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
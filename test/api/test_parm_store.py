@@ -0,0 +1,47 @@
+import unittest
+
+from api.data.item_data import ItemState
+from api.data.parm_store import ParmStore
+from api.data.param_data import ParamData
+
+
+class TestParmStore(unittest.TestCase):
+    def setUp(self):
+        self.store = ParmStore()
+
+    def test_add_compacts_unchanged_parm(self):
+        self.store.add("tx", ParamData("tx", 1.5, None))
+
+        self.assertEqual(self.store.get_value("tx"), 1.5)
+        self.assertEqual(self.store._records, {})
+
+    def test_getitem_returns_same_record(self):
+        self.store.add("tx", ParamData("tx", 1.5, None))
+
+        parm = self.store["tx"]
+        parm.state = ItemState.EDITED
+
+        self.assertIs(self.store["tx"], parm)
+        self.assertEqual(self.store["tx"].state, ItemState.EDITED)
+        self.assertEqual(self.store.get_value("tx"), 1.5)
+
+    def test_add_keeps_parm_with_state(self):
+        parm = ParamData("tx", "", ItemState.DELETED)
+        self.store.add("tx", parm)
+
+        self.assertIs(self.store["tx"], parm)
+
+    def test_set_value(self):
+        self.store.add("tx", ParamData("tx", 1.5, None))
+        self.store.set_value("tx", "2")
+
+        self.assertEqual(self.store["tx"].value, "2")
+
+    def test_mapping(self):
+        self.store["ty"] = ParamData("ty", 1, None)
+        self.store["tx"] = ParamData("tx", 2, None)
+        del self.store["ty"]
+
+        self.assertEqual(list(self.store), ["tx"])
+        self.assertEqual(len(self.store), 1)
+        self.assertNotIn("ty", self.store)
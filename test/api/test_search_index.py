@@ -0,0 +1,176 @@
+import unittest
+from unittest.mock import patch
+
+from api.comparators.archive_hip_comparator import ArchiveHipFileComparator
+from api.search_index import IncrementalSearch, SearchIndex, parse_query
+from test.api.node_factory import compare_nodes, create_node, create_nodes
+
+
+class TestParseQuery(unittest.TestCase):
+    def test_plain_query(self):
+        self.assertEqual(parse_query("Smoke"), (None, "smoke", False))
+
+    def test_field_scoped_query(self):
+        self.assertEqual(parse_query("parm:Rad"), ("parm", "rad", False))
+        self.assertEqual(parse_query("Value:1"), ("value", "1", False))
+
+    def test_unknown_prefix_is_part_of_query(self):
+        self.assertEqual(parse_query("op:sop"), (None, "op:sop", False))
+
+    def test_regex_query(self):
+        self.assertEqual(
+            parse_query("value:/^\\$HIP/"), ("value", "^\\$HIP", True)
+        )
+
+
+def create_index(comparator, is_source):
+    if is_source:
+        nodes, other_nodes = comparator.source_data, comparator.target_data
+    else:
+        nodes, other_nodes = comparator.target_data, comparator.source_data
+    index = SearchIndex()
+    for _ in index.iter_add_nodes(
+        nodes, other_nodes, comparator.diff_result, is_source
+    ):
+        pass
+    return index
+
+
+class TestSearchIndex(unittest.TestCase):
+    SOURCE_HIP_FILE = "test/fixtures/billowy_smoke_source.hipnc"
+    TARGET_HIP_FILE = "test/fixtures/billowy_smoke_source_edited.hipnc"
+    NODE_PATH = "/obj/billowy_smoke/smoke_base"
+
+    @classmethod
+    def setUpClass(cls):
+        comparator = ArchiveHipFileComparator(
+            cls.SOURCE_HIP_FILE, cls.TARGET_HIP_FILE
+        )
+        comparator.compare()
+        cls.index = create_index(comparator, is_source=True)
+        cls.target_index = create_index(comparator, is_source=False)
+
+    def test_match_includes_ancestors(self):
+        paths = self.index.search("name:smoke_b")
+
+        self.assertEqual(
+            paths, {"/", "/obj", "/obj/billowy_smoke", self.NODE_PATH}
+        )
+
+    def test_parm_match_includes_value(self):
+        paths = self.index.search("parm:rad")
+
+        self.assertIn(f"{self.NODE_PATH}/rad", paths)
+        self.assertIn(f"{self.NODE_PATH}/rad/value", paths)
+        self.assertIn(self.NODE_PATH, paths)
+
+    def test_placeholders(self):
+        created_path = "/obj/billowy_smoke/null1"
+        deleted_path = "/obj/billowy_smoke/attribadjustvector_velocity"
+
+        self.assertNotIn(created_path, self.index.search("name:null1"))
+        self.assertIn(
+            created_path, self.target_index.search("name:null1")
+        )
+        self.assertIn(
+            deleted_path, self.index.search("name:attribadjustvector")
+        )
+        self.assertNotIn(
+            deleted_path, self.target_index.search("name:attribadjustvector")
+        )
+
+    def test_connection_rows(self):
+        row_path = "/obj/billowy_smoke/pyrosource1/-> input 0"
+        paths = self.index.search("value:smoke_base:0")
+
+        self.assertIn(row_path, paths)
+        self.assertIn(f"{row_path}/value", paths)
+        self.assertNotIn(row_path, self.index.search("null1:0"))
+
+    def test_field_scope(self):
+        self.assertFalse(self.index.search("name:rad"))
+        self.assertIn(f"{self.NODE_PATH}/rad", self.index.search("rad"))
+
+    def test_short_query(self):
+        self.assertEqual(self.index.search("ra"), self.index.search("/ra/"))
+
+    def test_regex(self):
+        paths = self.index.search("name:/^smoke_ba.e$/")
+
+        self.assertIn(self.NODE_PATH, paths)
+        with self.assertRaises(ValueError):
+            self.index.search("/[/")
+
+    def test_no_match(self):
+        self.assertEqual(self.index.search("no such node"), set())
+        self.assertEqual(self.index.search("name:"), set())
+
+    def test_unchanged_parms_are_not_indexed(self):
+        self.assertFalse(self.index.search("parm:/^tx$/"))
+
+    def test_moved_nodes_share_row(self):
+        parms = {f"parm{number}": number for number in range(8)}
+        comparator = compare_nodes(
+            create_nodes(
+                create_node("/"),
+                create_node("/obj"),
+                create_node("/obj/geo", "geo", parms),
+            ),
+            create_nodes(
+                create_node("/"),
+                create_node("/obj"),
+                create_node("/obj/character", "geo", parms),
+            ),
+        )
+        target_index = create_index(comparator, is_source=False)
+
+        self.assertEqual(
+            target_index.search("name:character"), {"/", "/obj", "/obj/geo"}
+        )
+
+
+class TestIncrementalSearch(unittest.TestCase):
+    SOURCE_HIP_FILE = "test/fixtures/billowy_smoke_source.hipnc"
+    TARGET_HIP_FILE = "test/fixtures/billowy_smoke_source_edited.hipnc"
+
+    @classmethod
+    def setUpClass(cls):
+        comparator = ArchiveHipFileComparator(
+            cls.SOURCE_HIP_FILE, cls.TARGET_HIP_FILE
+        )
+        comparator.compare()
+        cls.index = create_index(comparator, is_source=True)
+
+    def setUp(self):
+        self.search = IncrementalSearch(self.index)
+
+    def test_extended_query_refines_previous_rows(self):
+        previous = self.search.search("py")
+        with patch.object(
+            self.index, "_get_candidate_rows", side_effect=AssertionError
+        ):
+            result = self.search.search("pyth")
+
+        self.assertTrue(result.rows)
+        self.assertLessEqual(result.rows, previous.rows)
+        self.assertEqual(result.paths, self.index.search("pyth"))
+
+    def test_other_query_is_looked_up(self):
+        self.search.search("python")
+        result = self.search.search("parm:rad")
+
+        self.assertEqual(result.paths, self.index.search("parm:rad"))
+
+    def test_matches_in_tree_order(self):
+        result = self.search.search("name:python")
+
+        self.assertEqual(
+            list(result.iter_matches(self.index)),
+            [
+                "/obj/billowy_smoke/python1",
+                "/obj/billowy_smoke/python2",
+                "/obj/billowy_smoke/python3",
+                "/obj/billowy_smoke/python4",
+            ],
+        )
+
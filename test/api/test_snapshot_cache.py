@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from api.cache.snapshot_cache import SnapshotCache
+from api.comparators.archive_hip_comparator import ArchiveHipFileComparator
+from api.data.item_data import ItemState
+
+
+class TestSnapshotCache(unittest.TestCase):
+    SOURCE_HIP_FILE = "test/fixtures/billowy_smoke_source.hipnc"
+    TARGET_HIP_FILE = "test/fixtures/billowy_smoke_source_edited.hipnc"
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = SnapshotCache(self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_make_key(self):
+        key = self.cache.make_key(self.SOURCE_HIP_FILE, {"mode": "eval"})
+
+        self.assertEqual(
+            key, self.cache.make_key(self.SOURCE_HIP_FILE, {"mode": "eval"})
+        )
+        self.assertNotEqual(
+            key, self.cache.make_key(self.SOURCE_HIP_FILE, {"mode": "raw"})
+        )
+        self.assertNotEqual(
+            key, self.cache.make_key(self.TARGET_HIP_FILE, {"mode": "eval"})
+        )
+
+    def test_get_and_put(self):
+        self.assertIsNone(self.cache.get("key"))
+
+        self.cache.put("key", {"/obj": 1})
+
+        self.assertEqual(self.cache.get("key"), {"/obj": 1})
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["snapshots"], 1)
+
+    def test_evict_least_recently_used(self):
+        self.cache.put("old", {"data": "x" * 1000})
+        self.cache.put("new", {"data": "y" * 1000})
+        old_path = os.path.join(self.cache_dir, "old.snapshot")
+        os.utime(old_path, (0, 0))
+
+        self.cache.max_size = self.cache.stats()["size"] - 1
+        self.cache.evict()
+
+        self.assertIsNone(self.cache.get("old"))
+        self.assertIsNotNone(self.cache.get("new"))
+
+    def test_clear(self):
+        self.cache.put("key", {"/obj": 1})
+        self.cache.get("key")
+
+        self.cache.clear()
+
+        self.assertEqual(
+            self.cache.stats(),
+            {"hits": 0, "misses": 0, "snapshots": 0, "size": 0},
+        )
+
+    def test_compare_reuses_snapshots(self):
+        comparator = ArchiveHipFileComparator(
+            self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE, cache=self.cache
+        )
+        comparator.compare()
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+        comparator = ArchiveHipFileComparator(
+            self.SOURCE_HIP_FILE, self.TARGET_HIP_FILE, cache=self.cache
+        )
+        comparator.get_hip_data = None
+        comparator.compare()
+
+        self.assertEqual(self.cache.stats()["hits"], 2)
+        self.assertEqual(
+            comparator.diff_result.get_node_state(
+                "/obj/billowy_smoke/smoke_base"
+            ),
+            ItemState.EDITED,
+        )
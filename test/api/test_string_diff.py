@@ -0,0 +1,143 @@
+import random
+import unittest
+
+from api.string_diff import (
+    DELETE,
+    EQUAL,
+    INSERT,
+    REPLACE,
+    StringDiff,
+    diff_lines,
+    word_diff,
+)
+
+
+class TestDiffLines(unittest.TestCase):
+    def assert_valid_opcodes(self, source, target, opcodes):
+        i = j = 0
+        for tag, i1, i2, j1, j2 in opcodes:
+            self.assertEqual((i1, j1), (i, j))
+            if tag == EQUAL:
+                self.assertEqual(source[i1:i2], target[j1:j2])
+            i, j = i2, j2
+        self.assertEqual((i, j), (len(source), len(target)))
+
+    def test_identical(self):
+        lines = ["a", "b", "c"]
+        self.assertEqual(diff_lines(lines, lines), [(EQUAL, 0, 3, 0, 3)])
+
+    def test_empty(self):
+        self.assertEqual(diff_lines([], []), [])
+        self.assertEqual(diff_lines([], ["a"]), [(INSERT, 0, 0, 0, 1)])
+        self.assertEqual(diff_lines(["a"], []), [(DELETE, 0, 1, 0, 0)])
+
+    def test_edited_line(self):
+        self.assertEqual(
+            diff_lines(["a", "b", "c", "d"], ["a", "x", "c", "d"]),
+            [(EQUAL, 0, 1, 0, 1), (REPLACE, 1, 2, 1, 2), (EQUAL, 2, 4, 2, 4)],
+        )
+
+    def test_unique_lines_are_anchors(self):
+        source = ["x", "def a", "{", "}", "def b", "{", "}", "y"]
+        target = [
+            "z", "def a", "{", "}", "def c", "{", "}", "def b", "{", "}", "w"
+        ]
+
+        self.assertEqual(
+            diff_lines(source, target),
+            [
+                (REPLACE, 0, 1, 0, 1),
+                (EQUAL, 1, 4, 1, 4),
+                (INSERT, 4, 4, 4, 7),
+                (EQUAL, 4, 7, 7, 10),
+                (REPLACE, 7, 8, 10, 11),
+            ],
+        )
+
+    def test_repeated_lines_use_myers(self):
+        source = ["}", "{", "}", "{"]
+        target = ["{", "}", "{", "}"]
+
+        opcodes = diff_lines(source, target)
+
+        self.assert_valid_opcodes(source, target, opcodes)
+        matched = sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag == EQUAL)
+        self.assertEqual(matched, 3)
+
+    def test_edit_cost_cutoff(self):
+        source = ["a", "b", "a", "b"]
+        target = ["b", "a", "b", "a"]
+
+        opcodes = diff_lines(source, target, max_edit_cost=1)
+
+        self.assertEqual(opcodes, [(REPLACE, 0, 4, 0, 4)])
+
+    def test_random_inputs(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            source = [rng.choice("abc}") for _ in range(rng.randint(0, 20))]
+            target = [rng.choice("abc}") for _ in range(rng.randint(0, 20))]
+            self.assert_valid_opcodes(
+                source, target, diff_lines(source, target)
+            )
+
+
+class TestWordDiff(unittest.TestCase):
+    def test_changed_words(self):
+        source_spans, target_spans = word_diff(
+            "float x = 1.0;", "float y = 1.0 + z;"
+        )
+
+        self.assertEqual(source_spans, [(6, 7)])
+        self.assertEqual(target_spans, [(6, 7), (13, 17)])
+
+    def test_long_lines_are_changed_as_whole(self):
+        source = "a " * 2000
+        target = "b " * 2000
+
+        self.assertEqual(
+            word_diff(source, target), ([(0, 4000)], [(0, 4000)])
+        )
+
+
+class TestStringDiff(unittest.TestCase):
+    def test_rows(self):
+        string_diff = StringDiff("a\nb\nc\nd", "a\nb2\nc\ne\nf")
+
+        rows = [
+            (row.tag, row.source_line, row.target_line)
+            for row in string_diff.iter_rows()
+        ]
+
+        self.assertEqual(
+            rows,
+            [
+                (EQUAL, 0, 0),
+                (REPLACE, 1, 1),
+                (EQUAL, 2, 2),
+                (REPLACE, 3, 3),
+                (INSERT, None, 4),
+            ],
+        )
+        self.assertEqual(len(string_diff), 5)
+
+    def test_word_spans_of_replaced_rows(self):
+        string_diff = StringDiff("x = 1", "x = 2")
+
+        row = string_diff.get_row(0)
+
+        self.assertEqual(row.source_spans, [(4, 5)])
+        self.assertEqual(row.target_spans, [(4, 5)])
+
+    def test_row_range(self):
+        string_diff = StringDiff("a\nb\nc", "a\nc")
+
+        rows = list(string_diff.iter_rows(1, 10))
+
+        self.assertEqual([row.tag for row in rows], [DELETE, EQUAL])
+        with self.assertRaises(IndexError):
+            string_diff.get_row(3)
+
+
+if __name__ == "__main__":
+    unittest.main()
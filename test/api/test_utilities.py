@@ -1,6 +1,14 @@
 import unittest
+from array import array
 from collections import OrderedDict
-from api.utilities import ordered_dict_insert, get_ordered_dict_key_index
+from api.utilities import (
+    compare_numeric_arrays,
+    get_numeric_components,
+    ordered_dict_insert,
+    get_ordered_dict_key_index,
+    merge_ordered_keys,
+    values_equal,
+)
 
 
 class TestUtilities(unittest.TestCase):
@@ -46,3 +54,68 @@ class TestUtilities(unittest.TestCase):
         # Check for non-existing key
         with self.assertRaises(KeyError):
             get_ordered_dict_key_index(od, "x")
+
+    def test_merge_ordered_keys(self):
+        source = ["/", "/obj", "/obj/a", "/obj/b", "/obj/c"]
+        target = ["/", "/obj", "/obj/a", "/obj/x", "/obj/x/y", "/obj/c"]
+
+        self.assertEqual(
+            merge_ordered_keys(source, target),
+            ["/", "/obj", "/obj/a", "/obj/b", "/obj/x", "/obj/x/y", "/obj/c"],
+        )
+
+    def test_merge_ordered_keys_reordered(self):
+        # Source order wins for reordered common keys.
+        self.assertEqual(
+            merge_ordered_keys(["a", "b", "c"], ["c", "b", "a", "d"]),
+            ["a", "b", "c", "d"],
+        )
+
+    def test_merge_ordered_keys_disjoint(self):
+        self.assertEqual(
+            merge_ordered_keys(["a", "b"], ["c"]), ["a", "b", "c"]
+        )
+        self.assertEqual(merge_ordered_keys([], ["c"]), ["c"])
+
+    def test_values_equal_typed(self):
+        self.assertTrue(values_equal(1, 1.0))
+        self.assertTrue(values_equal((1.0, 2.0), (1.0, 2.0)))
+        self.assertTrue(values_equal("1", 1))
+        self.assertTrue(values_equal(float("nan"), float("nan")))
+        self.assertFalse(values_equal("a", "b"))
+        self.assertFalse(values_equal((1.0, 2.0), (1.0, 2.0, 3.0)))
+
+    def test_values_equal_tolerance(self):
+        self.assertFalse(values_equal(0.1, 0.1 + 1e-12))
+        self.assertTrue(values_equal(0.1, 0.1 + 1e-12, abs_tolerance=1e-9))
+        self.assertTrue(
+            values_equal((1e6, 0.0), (1e6 + 1e-4, 0.0), rel_tolerance=1e-9)
+        )
+        self.assertFalse(
+            values_equal((1.0, 0.5), (1.0, 0.6), abs_tolerance=1e-9)
+        )
+        self.assertFalse(values_equal("0.1", 0.1 + 1e-12, abs_tolerance=1))
+
+    def test_get_numeric_components(self):
+        self.assertEqual(get_numeric_components(1.5), (1.5,))
+        self.assertEqual(get_numeric_components([1, 2.0]), (1, 2.0))
+        self.assertIsNone(get_numeric_components("1"))
+        self.assertIsNone(get_numeric_components((1.0, "a")))
+        self.assertIsNone(get_numeric_components(2 ** 60))
+
+    def test_compare_numeric_arrays(self):
+        nan = float("nan")
+        inf = float("inf")
+        self.assertEqual(
+            compare_numeric_arrays(
+                array("d", [0.1, nan, inf, 1.0, 1e6]),
+                array("d", [0.1 + 1e-12, nan, -inf, 1.1, 1e6 + 1e-4]),
+                abs_tolerance=1e-9,
+                rel_tolerance=1e-9,
+            ),
+            bytearray([1, 1, 0, 0, 1]),
+        )
+        self.assertEqual(
+            compare_numeric_arrays(array("d", [1.0]), array("d", [1.0])),
+            bytearray([1]),
+        )
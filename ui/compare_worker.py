@@ -0,0 +1,51 @@
+from hutil.Qt.QtCore import QObject, QThread, Signal
+
+from api.comparators.houdini_base_comparator import (
+    ComparisonCancelled,
+    HoudiniComparator,
+)
+
+
+class CompareWorker(QObject):
+    """
+    Runs HoudiniComparator.compare() in a background thread.
+
+    Progress of the comparator is forwarded with the progress signal,
+    exactly one of finished, cancelled or failed is emitted at the end.
+    Signals are delivered to the GUI thread through queued connections.
+    """
+
+    progress = Signal(str, int, int)
+    finished = Signal()
+    cancelled = Signal()
+    failed = Signal(str)
+
+    def __init__(self, comparator: HoudiniComparator):
+        super(CompareWorker, self).__init__()
+        self.comparator = comparator
+        self.comparator.progress_callback = self.progress.emit
+
+        self.thread = QThread()
+        self.moveToThread(self.thread)
+        self.thread.started.connect(self.run)
+
+    def start(self) -> None:
+        """Start the comparison in the worker thread."""
+        self.thread.start()
+
+    def cancel(self) -> None:
+        """Request cancellation, the comparator stops at its next check."""
+        self.comparator.cancel()
+
+    def run(self) -> None:
+        """Compare files and emit the outcome, runs in the worker thread."""
+        try:
+            self.comparator.compare()
+        except ComparisonCancelled:
+            self.cancelled.emit()
+        except Exception as error:
+            self.failed.emit(str(error))
+        else:
+            self.finished.emit()
+        finally:
+            self.thread.quit()
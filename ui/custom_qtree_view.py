@@ -61,7 +61,7 @@ class CustomQTreeView(QTreeView):
         """
         Expand the QTreeView to reveal the specified item.
 
-        :param item: The QStandardItem whose position in the tree
+        :param item: The DiffTreeItem whose position in the tree
                      you want to reveal.
         :param treeview: The QTreeView in which the item resides.
         """
@@ -0,0 +1,350 @@
+from typing import List, Optional, Tuple
+
+from hutil.Qt.QtGui import (
+    QBrush,
+    QColor,
+    QFont,
+    QKeySequence,
+    QPainter,
+    QPen,
+    QPixmap,
+)
+from hutil.Qt.QtWidgets import QAbstractScrollArea, QApplication, QWidget
+from hutil.Qt.QtCore import Qt, QPoint, QRect
+
+from api.comparators.houdini_base_comparator import COLORS
+from api.string_diff import EQUAL, DiffRow, StringDiff
+
+
+SOURCE_SIDE = "source"
+TARGET_SIDE = "target"
+
+TEXT_MARGIN = 4
+TAB_SPACES = "    "
+
+# Background alpha of changed lines and of changed words within them.
+LINE_ALPHA = "40"
+SPAN_ALPHA = "80"
+
+_HATCH_BRUSH: Optional[QBrush] = None
+
+
+def get_hatch_brush() -> QBrush:
+    """
+    Return the brush of lines missing on one side.
+
+    The pattern is rendered once and shared by all views.
+    """
+    global _HATCH_BRUSH
+    if _HATCH_BRUSH is not None:
+        return _HATCH_BRUSH
+
+    hatch_width = 1000
+    pixmap = QPixmap(hatch_width, hatch_width)
+    pixmap.fill(Qt.transparent)
+
+    pen_color = QColor("#505050")
+    pen_width = 3
+    pen = QPen(pen_color, pen_width)
+    pen.setCapStyle(Qt.FlatCap)
+
+    pixmap_painter = QPainter(pixmap)
+    pixmap_painter.setPen(pen)
+    for i in range(-hatch_width, hatch_width, pen_width * 6):
+        pixmap_painter.drawLine(i, hatch_width, hatch_width + i, 0)
+    pixmap_painter.end()
+
+    _HATCH_BRUSH = QBrush(pixmap)
+    return _HATCH_BRUSH
+
+
+class DiffTextView(QAbstractScrollArea):
+    """
+    Read only view of one side of a StringDiff.
+
+    Rows are not laid out in a document, the vertical scroll bar
+    counts rows and only rows within the viewport are fetched from
+    the diff and painted, so the cost of opening, scrolling and
+    repainting doesn't depend on the length of the texts. Whole rows
+    can be selected with the mouse and copied with the copy shortcut.
+    """
+
+    def __init__(self, side: str, parent: QWidget = None):
+        """
+        Initialize the view.
+
+        :param side: SOURCE_SIDE or TARGET_SIDE, the side of the diff to show.
+        :param parent: The parent widget.
+        """
+        super(DiffTextView, self).__init__(parent)
+        self.side = side
+        self.string_diff: Optional[StringDiff] = None
+        self.lines: List[str] = []
+        self.text_width = 0
+        self.selection: Optional[Tuple[int, int]] = None
+
+        colors = COLORS["red"] if side == SOURCE_SIDE else COLORS["green"]
+        self.line_color = QColor(f"#{LINE_ALPHA}{colors[1:]}")
+        self.span_color = QColor(f"#{SPAN_ALPHA}{colors[1:]}")
+        self.selection_color = QColor(185, 134, 32, 60)
+
+        self.setFont(QFont("DS Houdini", 10))
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.verticalScrollBar().setSingleStep(1)
+
+    def set_diff(self, string_diff: StringDiff) -> None:
+        """Show a diff and scroll to its top."""
+        self.string_diff = string_diff
+        if self.side == SOURCE_SIDE:
+            self.lines = string_diff.source_lines
+        else:
+            self.lines = string_diff.target_lines
+        self.selection = None
+
+        # the widest line is estimated by its length, so only one
+        # line is measured instead of all of them
+        longest_line = max(self.lines, key=len, default="")
+        self.text_width = self.fontMetrics().horizontalAdvance(
+            longest_line.replace("\t", TAB_SPACES)
+        )
+
+        self.verticalScrollBar().setValue(0)
+        self.horizontalScrollBar().setValue(0)
+        self.update_scroll_bars()
+        self.viewport().update()
+
+    def row_count(self) -> int:
+        """Return the number of rows of the diff."""
+        return len(self.string_diff) if self.string_diff is not None else 0
+
+    def get_line(self, row: DiffRow) -> Optional[int]:
+        """Return the line of a row on the shown side, None for fillers."""
+        return row.source_line if self.side == SOURCE_SIDE else row.target_line
+
+    def row_height(self) -> int:
+        """Return the height of a row in pixels."""
+        return self.fontMetrics().height()
+
+    def first_visible_row(self) -> int:
+        """Return the row at the top of the viewport."""
+        return self.verticalScrollBar().value()
+
+    def visible_row_count(self) -> int:
+        """Return the number of rows which fit in the viewport completely."""
+        return max(self.viewport().height() // self.row_height(), 1)
+
+    def row_at(self, y: int) -> int:
+        """Return the row at a viewport y coordinate, clamped to the diff."""
+        row = self.first_visible_row() + y // self.row_height()
+        return min(max(row, 0), max(self.row_count() - 1, 0))
+
+    def update_scroll_bars(self) -> None:
+        """Update scroll bar ranges to the diff and the viewport size."""
+        visible_rows = self.visible_row_count()
+        vertical = self.verticalScrollBar()
+        vertical.setRange(0, max(self.row_count() - visible_rows, 0))
+        vertical.setPageStep(visible_rows)
+
+        viewport_width = self.viewport().width()
+        horizontal = self.horizontalScrollBar()
+        horizontal.setRange(
+            0, max(self.text_width + 2 * TEXT_MARGIN - viewport_width, 0)
+        )
+        horizontal.setPageStep(viewport_width)
+        horizontal.setSingleStep(self.fontMetrics().averageCharWidth())
+
+    def resizeEvent(self, event) -> None:
+        super(DiffTextView, self).resizeEvent(event)
+        self.update_scroll_bars()
+
+    def scrollContentsBy(self, dx: int, dy: int) -> None:
+        # rows are painted at positions derived from scroll bar values
+        self.viewport().update()
+
+    def paintEvent(self, event) -> None:
+        """
+        Paints rows intersecting the viewport.
+
+        :param event: The paint event.
+        """
+        if self.string_diff is None:
+            return
+
+        painter = QPainter(self.viewport())
+        painter.setFont(self.font())
+        row_height = self.row_height()
+        width = self.viewport().width()
+        first_row = self.first_visible_row()
+        last_row = first_row + self.viewport().height() // row_height + 1
+
+        for row_index, row in enumerate(
+            self.string_diff.iter_rows(first_row, last_row + 1)
+        ):
+            rect = QRect(0, row_index * row_height, width, row_height)
+            self._paint_row(painter, rect, row)
+            if self._is_selected(first_row + row_index):
+                painter.fillRect(rect, self.selection_color)
+        painter.end()
+
+    def _paint_row(self, painter: QPainter, rect: QRect, row: DiffRow) -> None:
+        """
+        Paints a single row.
+
+        :param painter: Painter of the viewport.
+        :param rect: Rectangle of the row in viewport coordinates.
+        :param row: The row of the diff.
+        """
+        line = self.get_line(row)
+        if line is None:
+            painter.fillRect(rect, get_hatch_brush())
+            return
+        if row.tag != EQUAL:
+            painter.fillRect(rect, self.line_color)
+
+        if self.side == SOURCE_SIDE:
+            spans = row.source_spans
+        else:
+            spans = row.target_spans
+        text = self.lines[line]
+        metrics = self.fontMetrics()
+        baseline = rect.top() + metrics.ascent()
+        x = TEXT_MARGIN - self.horizontalScrollBar().value()
+
+        position = 0
+        segments = []
+        for start, end in spans:
+            segments.append((text[position:start], False))
+            segments.append((text[start:end], True))
+            position = end
+        segments.append((text[position:], False))
+
+        painter.setPen(QColor("#dfdfdf"))
+        for segment, is_changed in segments:
+            if not segment:
+                continue
+            segment = segment.replace("\t", TAB_SPACES)
+            segment_width = metrics.horizontalAdvance(segment)
+            if x > rect.right():
+                break
+            if x + segment_width >= 0:
+                if is_changed:
+                    painter.fillRect(
+                        QRect(x, rect.top(), segment_width, rect.height()),
+                        self.span_color,
+                    )
+                painter.drawText(x, baseline, segment)
+            x += segment_width
+
+    def _is_selected(self, row: int) -> bool:
+        """Check if a row is within the selected range."""
+        if self.selection is None:
+            return False
+        start, end = self.selection
+        return min(start, end) <= row <= max(start, end)
+
+    def mousePressEvent(self, event) -> None:
+        if event.button() == Qt.LeftButton and self.row_count():
+            row = self.row_at(event.pos().y())
+            self.selection = (row, row)
+            self.viewport().update()
+        super(DiffTextView, self).mousePressEvent(event)
+
+    def mouseMoveEvent(self, event) -> None:
+        if event.buttons() & Qt.LeftButton and self.selection is not None:
+            y = event.pos().y()
+            if y < 0:
+                self.verticalScrollBar().triggerAction(
+                    self.verticalScrollBar().SliderSingleStepSub
+                )
+            elif y > self.viewport().height():
+                self.verticalScrollBar().triggerAction(
+                    self.verticalScrollBar().SliderSingleStepAdd
+                )
+            self.selection = (self.selection[0], self.row_at(y))
+            self.viewport().update()
+        super(DiffTextView, self).mouseMoveEvent(event)
+
+    def keyPressEvent(self, event) -> None:
+        if event.matches(QKeySequence.Copy):
+            self.copy_selection()
+            return
+        super(DiffTextView, self).keyPressEvent(event)
+
+    def copy_selection(self) -> None:
+        """Copy lines of selected rows on this side to the clipboard."""
+        if self.selection is None:
+            return
+
+        start, end = sorted(self.selection)
+        lines = []
+        for row in self.string_diff.iter_rows(start, end + 1):
+            line = self.get_line(row)
+            if line is not None:
+                lines.append(self.lines[line])
+        QApplication.clipboard().setText("\n".join(lines))
+
+
+class LineNumberArea(QWidget):
+    """
+    Gutter with line numbers of a DiffTextView.
+
+    Numbers are painted for visible rows only and follow
+    the vertical scroll bar of the view.
+    """
+
+    def __init__(self, view: DiffTextView, parent: QWidget = None):
+        """
+        Initialize the gutter.
+
+        :param view: The view to number lines of.
+        :param parent: The parent widget.
+        """
+        super(LineNumberArea, self).__init__(parent)
+        self.view = view
+        self.setFont(view.font())
+        self.setFixedWidth(60)
+        view.verticalScrollBar().valueChanged.connect(self.update)
+
+    def paintEvent(self, event) -> None:
+        """
+        Paints line numbers of rows visible in the view.
+
+        :param event: The paint event.
+        """
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#333333"))
+        painter.setPen(QColor("#4d4d4d"))
+        painter.drawLine(
+            self.width() - 1, 0, self.width() - 1, self.height()
+        )
+
+        string_diff = self.view.string_diff
+        if string_diff is None:
+            painter.end()
+            return
+
+        painter.setFont(self.font())
+        painter.setPen(QColor("#dfdfdf"))
+        row_height = self.view.row_height()
+        # align rows with the viewport of the view, below its frame
+        viewport_origin = self.view.viewport().mapToGlobal(QPoint(0, 0))
+        top = self.mapFromGlobal(viewport_origin).y()
+        first_row = self.view.first_visible_row()
+        last_row = first_row + self.height() // row_height + 1
+
+        for row_index, row in enumerate(
+            string_diff.iter_rows(first_row, last_row + 1)
+        ):
+            line = self.view.get_line(row)
+            if line is None:
+                continue
+            rect = QRect(
+                0,
+                top + row_index * row_height,
+                self.width() - TEXT_MARGIN,
+                row_height,
+            )
+            painter.drawText(
+                rect, Qt.AlignRight | Qt.AlignVCenter, str(line + 1)
+            )
+        painter.end()
@@ -0,0 +1,764 @@
+import copy
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from hutil.Qt.QtCore import QAbstractItemModel, QModelIndex, Qt
+from hutil.Qt.QtGui import QBrush, QColor
+
+from api.comparators.houdini_base_comparator import COLORS
+from api.data.item_data import ItemState
+from api.data.node_data import NodeData
+from api.data.param_data import ParamData
+from api.diff_result import (
+    USER_DATA_PARM_NAME,
+    ConnectionRow,
+    DiffResult,
+    create_placeholder_node,
+    get_connection_value,
+    get_shown_value,
+    has_parm_row,
+)
+from api.search_index import SearchIndex
+from ui.constants import PATH_ROLE, DATA_ROLE
+from ui.icon_cache import ICON_CACHE, resolve_icon_name
+
+
+PARM_ICON_PATH = "VOP/parameter.svg"
+# Background alpha of changed node rows and of other changed rows.
+NODE_ALPHA = 100
+ROW_ALPHA = 55
+# Number of nodes processed per step of a chunked population.
+POPULATION_CHUNK_SIZE = 500
+
+
+class DiffTreeItem:
+    """
+    A lightweight tree item which wraps node, parm or value data.
+
+    Children are created on demand by DiffTreeModel.fetchMore,
+    `children` is None until then. Items of paired models link
+    to the item on the same row of the other tree as `counterpart`.
+    `state` is the diff state of the node or parm the item shows.
+    """
+
+    __slots__ = (
+        "model",
+        "parent_item",
+        "row_number",
+        "text",
+        "path",
+        "item_data",
+        "icon_path",
+        "is_node",
+        "state",
+        "children",
+        "counterpart",
+    )
+
+    def __init__(
+        self,
+        model: "DiffTreeModel",
+        parent_item: Optional["DiffTreeItem"],
+        row_number: int,
+        text: str,
+        path: Optional[str],
+        item_data: Any,
+        icon_path: str = "",
+        is_node: bool = False,
+        state: ItemState = ItemState.UNCHANGED,
+    ):
+        self.model = model
+        self.parent_item = parent_item
+        self.row_number = row_number
+        self.text = text
+        self.path = path
+        self.item_data = item_data
+        self.icon_path = icon_path
+        self.is_node = is_node
+        self.state = state
+        self.children: Optional[List["DiffTreeItem"]] = None
+        self.counterpart: Optional["DiffTreeItem"] = None
+
+    def index(self) -> QModelIndex:
+        """Return the model index of the item."""
+        return self.model.indexFromItem(self)
+
+    def data(self, role: int = Qt.DisplayRole) -> Any:
+        """Return the item data for a given role."""
+        return self.model.data(self.index(), role)
+
+    def parent(self) -> Optional["DiffTreeItem"]:
+        """Return the parent item or None for top level items."""
+        if self.parent_item is self.model.root_item:
+            return None
+        return self.parent_item
+
+    def row(self) -> int:
+        """Return the row of the item inside of its parent."""
+        return self.row_number
+
+    def rowCount(self) -> int:
+        """Return the number of already fetched children."""
+        return len(self.children) if self.children else 0
+
+    def child(self, row: int, column: int = 0) -> Optional["DiffTreeItem"]:
+        """Return a fetched child item at a given row."""
+        if self.children and 0 <= row < len(self.children):
+            return self.children[row]
+        return None
+
+
+class DiffTreeModel(QAbstractItemModel):
+    """
+    Lazy tree model of one side of a comparison.
+
+    Rows are derived from the nodes of one side and the DiffResult,
+    nodes missing on this side are shown as hatched placeholders, so
+    both trees share the same structure. Both nodes of a moved pair
+    are shown on a single row under the source path, so their parm
+    edits are shown side by side. Nodes, changed parms and their
+    values are wrapped into DiffTreeItems only when their parent is
+    expanded, via canFetchMore/fetchMore, colors are derived from item
+    states when they're painted. Items are still available by their
+    unique paths, get_item_by_path fetches all ancestors of a requested
+    item.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(DiffTreeModel, self).__init__(*args, **kwargs)
+
+        self.item_dictionary: Dict[str, DiffTreeItem] = {}
+        self.path_role = PATH_ROLE
+        self.data_role = DATA_ROLE
+        self.view = None
+        self.show_only_edited = False
+        self.proxy_model = None
+        # model of the other side, rows of both are kept aligned
+        self.counterpart_model: Optional["DiffTreeModel"] = None
+
+        self.view_name = ""
+        self.is_source = True
+        self.nodes = {}
+        self.other_nodes = {}
+        self.diff_result: Optional[DiffResult] = None
+        self.node_children: Dict[str, List[str]] = {}
+        self.root_item = DiffTreeItem(self, None, 0, "", None, None)
+        self.root_item.children = []
+        self.search_index = SearchIndex()
+        self._brushes: Dict[
+            Tuple[ItemState, bool, bool], Optional[QBrush]
+        ] = {}
+
+    def set_view(self, tree_view) -> None:
+        """Associate the model with a tree view widget."""
+        self.view = tree_view
+
+    def set_counterpart(self, model: "DiffTreeModel") -> None:
+        """
+        Pair the model with the model of the other side.
+
+        Rows of paired models are created together and in the same
+        order, so every item knows its counterpart without path lookups.
+        """
+        self.counterpart_model = model
+        model.counterpart_model = self
+
+    def link_counterpart_items(self) -> None:
+        """Link top level items of paired models after both were reset."""
+        if self.counterpart_model is None:
+            return
+        self._link_children(self.root_item, self.counterpart_model.root_item)
+
+    def clear(self) -> None:
+        """Remove all items from the model."""
+        self.beginResetModel()
+        self.item_dictionary = {}
+        self.nodes = {}
+        self.other_nodes = {}
+        self.diff_result = None
+        self.node_children = {}
+        self.root_item.children = []
+        self.root_item.counterpart = None
+        self.search_index = SearchIndex()
+        self.endResetModel()
+
+    def reset(
+        self,
+        rows: "RowLayout",
+        nodes,
+        other_nodes,
+        diff_result: DiffResult,
+        view_name: str,
+        is_source: bool = True,
+    ) -> None:
+        """
+        Reset the model to show nodes of a comparison.
+
+        :param rows: Rows returned by iter_row_layout, shared by
+                     paired models.
+        :param nodes: Comparator data of the side shown by the model.
+        :param other_nodes: Comparator data of the other side, nodes
+                            missing on this side get placeholders.
+        :param diff_result: The result of the comparison.
+        :param view_name: Text shown for the root node.
+        :param is_source: Whether the model shows the source side.
+        """
+        node_children, top_level_paths = rows
+        self.beginResetModel()
+        self.nodes = nodes
+        self.other_nodes = other_nodes
+        self.diff_result = diff_result
+        self.view_name = view_name
+        self.is_source = is_source
+        self.node_children = node_children
+        self.item_dictionary = {}
+        self.search_index = SearchIndex()
+        self.root_item.children = [
+            self._create_node_item(self.root_item, row, path)
+            for row, path in enumerate(top_level_paths)
+        ]
+        self.root_item.counterpart = None
+        self.endResetModel()
+
+    def iter_build_search_index(
+        self, chunk_size: int = POPULATION_CHUNK_SIZE
+    ) -> Iterator[Tuple[str, int, int]]:
+        """
+        Build the search index of the model data.
+
+        :param chunk_size: Number of nodes processed per step.
+        :return: Iterator over (phase, current, total) progress tuples.
+        """
+        # searches may run in other threads, so the index is
+        # published only once it's complete
+        search_index = SearchIndex()
+        total = len(self.diff_result.paths)
+        for number in search_index.iter_add_nodes(
+            self.nodes, self.other_nodes, self.diff_result, self.is_source
+        ):
+            if number % chunk_size == 0:
+                yield "Indexing search", number, total
+        self.search_index = search_index
+
+    def fetch_paths(self, paths: Iterable[str]) -> None:
+        """
+        Fetch rows of given paths, e.g. search results, with ancestors.
+
+        The proxy can only filter rows which exist, so search results
+        are fetched before they are passed to the path filter.
+        """
+        for path in paths:
+            self.get_item_by_path(path)
+
+    def expand_changed_items(self) -> None:
+        """Reveal items which have changes, fetching only their branches."""
+        for _ in self.iter_expand_changed_items():
+            pass
+
+    def iter_expand_changed_items(
+        self, chunk_size: int = POPULATION_CHUNK_SIZE
+    ) -> Iterator[Tuple[str, int, int]]:
+        """
+        Reveal changed items, yielding after every chunk of nodes.
+
+        :param chunk_size: Number of nodes processed per step.
+        :return: Iterator over (phase, current, total) progress tuples.
+        """
+        if not self.view or self.diff_result is None:
+            return
+
+        changed_paths = [
+            path
+            for path in self.diff_result.iter_changed_paths()
+            if self.diff_result.get_row_path(path) == path
+        ]
+        for number, path in enumerate(changed_paths, 1):
+            if number % chunk_size == 0:
+                yield "Building rows", number, len(changed_paths)
+            item = self.get_item_by_path(path)
+            if item is None:
+                continue
+            # nodes with changed parms or wires are expanded
+            # themselves, other changed nodes only reveal their ancestors
+            if self._has_rows(path):
+                self._fetch_item(item)
+                item = item.children[0]
+            self.view.expand_to_index(item, self.view)
+
+        yield "Building rows", len(changed_paths), len(changed_paths)
+
+    def has_changes(self, index: QModelIndex) -> bool:
+        """
+        Check if an item or any of its descendants has changes.
+
+        Nodes are checked by change counts recorded by the comparator,
+        so it's a single lookup which covers rows not fetched yet.
+        """
+        item = self._item(index)
+        if not item.is_node:
+            return item.state != ItemState.UNCHANGED
+        return self.diff_result.get_change_count(item.path) > 0
+
+    def get_item_by_path(self, path: str) -> Optional[DiffTreeItem]:
+        """
+        Return the item associated with given path.
+
+        Ancestors of the item are fetched if it wasn't created yet.
+        """
+        item = self.item_dictionary.get(path)
+        if item is not None or not path:
+            return item
+
+        # top level nodes are always created, so other nodes have
+        # their parent in data, parm and value paths extend their owner
+        if path in self.nodes or path in self.other_nodes:
+            row_path = self.diff_result.get_row_path(path)
+            if row_path != path:
+                return self.get_item_by_path(row_path)
+            parent_path = self._get_parent_path(path)
+        else:
+            parent_path = path.rsplit("/", 1)[0]
+        if not parent_path or parent_path == path:
+            return None
+
+        parent_item = self.get_item_by_path(parent_path)
+        if parent_item is None:
+            return None
+        self._fetch_item(parent_item)
+        return self.item_dictionary.get(path)
+
+    def itemFromIndex(self, index: QModelIndex) -> Optional[DiffTreeItem]:
+        """Return the item of a given index."""
+        if not index.isValid():
+            return None
+        return index.internalPointer()
+
+    def indexFromItem(self, item: Optional[DiffTreeItem]) -> QModelIndex:
+        """Return the index of a given item."""
+        if item is None or item is self.root_item:
+            return QModelIndex()
+        return self.createIndex(item.row_number, 0, item)
+
+    def invisibleRootItem(self) -> DiffTreeItem:
+        """Return the root item, parent of all top level items."""
+        return self.root_item
+
+    def index(
+        self, row: int, column: int, parent: QModelIndex = QModelIndex()
+    ) -> QModelIndex:
+        parent_item = self._item(parent)
+        if column != 0 or not parent_item.children:
+            return QModelIndex()
+        if not 0 <= row < len(parent_item.children):
+            return QModelIndex()
+        return self.createIndex(row, column, parent_item.children[row])
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        return self.indexFromItem(index.internalPointer().parent_item)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        return self._item(parent).rowCount()
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 1
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        item = self._item(parent)
+        if item.children is not None:
+            return bool(item.children)
+        return self._has_potential_children(item)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        item = self._item(parent)
+        return item.children is None and self._has_potential_children(item)
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        self._fetch_item(self._item(parent))
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+
+        item = index.internalPointer()
+        if role == Qt.DisplayRole:
+            return item.text
+        if role == self.path_role:
+            return item.path
+        if role == self.data_role:
+            return item.item_data
+        if role == Qt.DecorationRole:
+            return ICON_CACHE.get_icon(item.icon_path)
+        if role == Qt.BackgroundRole:
+            if item.item_data.is_hatched:
+                return None
+            return self._get_background(item.state, item.is_node)
+        return None
+
+    def _get_background(
+        self, state: ItemState, is_node: bool
+    ) -> Optional[QBrush]:
+        """
+        Return the background brush of a row in a given state.
+
+        Created rows are green and deleted rows red on both sides,
+        edited rows are red in the source and green in the target,
+        renamed and moved nodes are blue. Brushes are created once
+        per state and side.
+        """
+        key = (state, is_node, self.is_source)
+        if key in self._brushes:
+            return self._brushes[key]
+
+        brush = None
+        if state != ItemState.UNCHANGED:
+            if state == ItemState.CREATED:
+                color = COLORS["green"]
+            elif state == ItemState.MOVED:
+                color = COLORS["blue"]
+            elif state == ItemState.DELETED or self.is_source:
+                color = COLORS["red"]
+            else:
+                color = COLORS["green"]
+            qcolor = QColor(color)
+            qcolor.setAlpha(
+                NODE_ALPHA
+                if is_node and state != ItemState.CREATED
+                else ROW_ALPHA
+            )
+            brush = QBrush(qcolor)
+
+        self._brushes[key] = brush
+        return brush
+
+    def _item(self, index: QModelIndex) -> DiffTreeItem:
+        """Return the item of an index, the root item for invalid ones."""
+        if not index.isValid():
+            return self.root_item
+        return index.internalPointer()
+
+    def _get_parent_path(self, path: str) -> Optional[str]:
+        """Return the parent row path of a node present on either side."""
+        return get_parent_row_path(
+            path, self.nodes, self.other_nodes, self.diff_result
+        )
+
+    def _fetch_item(self, item: DiffTreeItem) -> None:
+        """Create children of a given item and insert them as rows."""
+        if item.children is not None:
+            return
+
+        children = self._create_children(item)
+        if children:
+            self.beginInsertRows(
+                self.indexFromItem(item), 0, len(children) - 1
+            )
+            item.children = children
+            self.endInsertRows()
+        else:
+            item.children = []
+
+        counterpart = item.counterpart
+        if counterpart is not None and counterpart.children is None:
+            counterpart.model._fetch_item(counterpart)
+            self._link_children(item, counterpart)
+
+    def _link_children(
+        self, item: DiffTreeItem, counterpart: DiffTreeItem
+    ) -> None:
+        """Link children on the same rows of two counterpart items."""
+        item.counterpart = counterpart
+        counterpart.counterpart = item
+        for child, other_child in zip(item.children, counterpart.children):
+            child.counterpart = other_child
+            other_child.counterpart = child
+
+    def _has_potential_children(self, item: DiffTreeItem) -> bool:
+        """Check if an item has children, without creating them."""
+        if not item.is_node:
+            # parm items always have a value row, value items are
+            # created with an empty list of children
+            return True
+
+        if self.node_children.get(item.path):
+            return True
+        return self._has_rows(item.path)
+
+    def _has_rows(self, path: str) -> bool:
+        """Check if a node has changed parm or connection rows."""
+        return bool(
+            self.diff_result.get_parm_states(path)
+            or self.diff_result.get_connection_rows(path)
+        )
+
+    def _create_children(self, item: DiffTreeItem) -> List[DiffTreeItem]:
+        """
+        Create child items of a node or a parm item.
+
+        Parm and connection rows come from the DiffResult, which is
+        shared by paired models, so rows of both sides are aligned
+        by construction.
+        """
+        if not item.is_node:
+            return [self._create_value_item(item)]
+
+        children = []
+        parm_states = self.diff_result.get_parm_states(item.path)
+        for parm_name, state in parm_states.items():
+            children.append(
+                self._create_parm_item(
+                    item, len(children), parm_name, state
+                )
+            )
+
+        connection_rows = self.diff_result.get_connection_rows(item.path)
+        for name, connection_row in connection_rows.items():
+            children.append(
+                self._create_connection_item(
+                    item, len(children), name, connection_row
+                )
+            )
+
+        for path in self.node_children.get(item.path, ()):
+            children.append(self._create_node_item(item, len(children), path))
+
+        return children
+
+    def _create_placeholder_node(self, path: str) -> NodeData:
+        """Create an empty node shown in place of a node of the other side."""
+        return create_placeholder_node(self.other_nodes[path])
+
+    def _create_node_item(
+        self, parent_item: DiffTreeItem, row: int, path: str
+    ) -> DiffTreeItem:
+        """Create an item of a node or of a placeholder."""
+        node_data = self.diff_result.get_row_node(self.nodes, path)
+        if node_data is None:
+            node_data = self._create_placeholder_node(path)
+        text = node_data.name if node_data.name != "/" else self.view_name
+
+        item = DiffTreeItem(
+            self,
+            parent_item,
+            row,
+            text,
+            path,
+            node_data,
+            resolve_icon_name(node_data.icon),
+            True,
+            self.diff_result.get_node_state(path),
+        )
+        self.item_dictionary[path] = item
+        return item
+
+    def _create_parm_item(
+        self,
+        parent_item: DiffTreeItem,
+        row: int,
+        parm_name: str,
+        state: ItemState,
+    ) -> DiffTreeItem:
+        """Create an item of a changed parm or user data."""
+        node_data = parent_item.item_data
+        if has_parm_row(node_data, parm_name) and not node_data.is_hatched:
+            parm = ParamData(
+                parm_name, get_shown_value(node_data, parm_name), state
+            )
+            stored_parm = node_data.parms.get_record(parm_name)
+            if stored_parm is not None:
+                parm.icon = stored_parm.icon
+        else:
+            # keeps rows aligned with the parm of the other side
+            parm = ParamData(parm_name, "", state, is_hatched=True)
+            parm.is_active = False
+
+        is_user_data = parm_name == USER_DATA_PARM_NAME
+        icon_path = ""
+        if parm.is_active and parm.icon and not is_user_data:
+            icon_path = PARM_ICON_PATH
+
+        path = f"{parent_item.path}/{parm_name}"
+        item = DiffTreeItem(
+            self,
+            parent_item,
+            row,
+            parm_name if parm.is_active else "",
+            path,
+            parm,
+            icon_path,
+            state=state,
+        )
+        self.item_dictionary[path] = item
+        return item
+
+    def _create_connection_item(
+        self,
+        parent_item: DiffTreeItem,
+        row: int,
+        name: str,
+        connection_row: ConnectionRow,
+    ) -> DiffTreeItem:
+        """Create an item of changed wires of a node input or output."""
+        value = get_connection_value(connection_row, self.is_source)
+        state = connection_row.state
+        if value is not None and not parent_item.item_data.is_hatched:
+            parm = ParamData(name, value, state)
+        else:
+            # keeps rows aligned with wires of the other side
+            parm = ParamData(name, "", state, is_hatched=True)
+            parm.is_active = False
+
+        path = f"{parent_item.path}/{name}"
+        item = DiffTreeItem(
+            self,
+            parent_item,
+            row,
+            name if parm.is_active else "",
+            path,
+            parm,
+            state=state,
+        )
+        self.item_dictionary[path] = item
+        return item
+
+    def _create_value_item(self, parm_item: DiffTreeItem) -> DiffTreeItem:
+        """Create an item of a parm value."""
+        parm = parm_item.item_data
+        value_data = copy.copy(parm)
+        value_data.state = ItemState.VALUE
+
+        path = f"{parm_item.path}/value"
+        item = DiffTreeItem(
+            self,
+            parm_item,
+            0,
+            str(parm.value) if parm.is_active else "",
+            path,
+            value_data,
+            state=parm_item.state,
+        )
+        item.children = []
+        self.item_dictionary[path] = item
+        return item
+
+
+# (children paths by parent row path, top level row paths)
+RowLayout = Tuple[Dict[str, List[str]], List[str]]
+
+
+def get_parent_row_path(
+    path: str, nodes, other_nodes, diff_result: DiffResult
+) -> Optional[str]:
+    """
+    Return the path of the parent row of a node row.
+
+    :param path: The row path of a node present on either side.
+    :param nodes: Comparator data of one side.
+    :param other_nodes: Comparator data of the other side.
+    :param diff_result: The result of the comparison.
+    :return: The parent row path, None for top level rows.
+    """
+    node_data = nodes.get(path)
+    if node_data is None:
+        node_data = other_nodes[path]
+    parent_path = node_data.parent_path
+    if parent_path is None or parent_path == path:
+        return None
+    parent_path = diff_result.get_row_path(parent_path)
+    if parent_path not in nodes and parent_path not in other_nodes:
+        return None
+    return parent_path
+
+
+def iter_row_layout(
+    nodes,
+    other_nodes,
+    diff_result: DiffResult,
+    chunk_size: int = POPULATION_CHUNK_SIZE,
+) -> Generator[Tuple[str, int, int], None, RowLayout]:
+    """
+    Lay out rows of a comparison, the same for both sides.
+
+    :param nodes: Comparator data of one side.
+    :param other_nodes: Comparator data of the other side.
+    :param diff_result: The result of the comparison.
+    :param chunk_size: Number of nodes processed per step.
+    :return: Iterator over (phase, current, total) progress tuples,
+             which returns the RowLayout.
+    """
+    node_children: Dict[str, List[str]] = {}
+    top_level_paths = []
+    paths = diff_result.get_row_paths()
+    for number, path in enumerate(paths, 1):
+        parent_path = get_parent_row_path(
+            path, nodes, other_nodes, diff_result
+        )
+        if parent_path is not None:
+            node_children.setdefault(parent_path, []).append(path)
+        else:
+            top_level_paths.append(path)
+        if number % chunk_size == 0:
+            yield "Indexing rows", number, len(paths)
+    return node_children, top_level_paths
+
+
+def iter_aligned_population(
+    source_model: DiffTreeModel,
+    target_model: DiffTreeModel,
+    source_data,
+    target_data,
+    diff_result: DiffResult,
+    source_view_name: str,
+    target_view_name: str,
+    chunk_size: int = POPULATION_CHUNK_SIZE,
+) -> Iterator[Tuple[str, int, int]]:
+    """
+    Populate paired models of a comparison step by step.
+
+    Both models are reset before any rows are revealed, so rows
+    of both trees are always fetched together and linked.
+
+    :param source_model: Model of the source side.
+    :param target_model: Model of the target side.
+    :param source_data: Comparator source data.
+    :param target_data: Comparator target data.
+    :param diff_result: The result of the comparison.
+    :param source_view_name: Text shown for the source root node.
+    :param target_view_name: Text shown for the target root node.
+    :param chunk_size: Number of nodes processed per step.
+    :return: Iterator over (phase, current, total) progress tuples.
+    """
+    rows = yield from iter_row_layout(
+        source_data, target_data, diff_result, chunk_size
+    )
+    # models are reset and linked without yielding in between, so no
+    # row can be fetched by a view before it has its counterpart
+    source_model.set_counterpart(target_model)
+    source_model.reset(
+        rows, source_data, target_data, diff_result, source_view_name, True
+    )
+    target_model.reset(
+        rows, target_data, source_data, diff_result, target_view_name, False
+    )
+    source_model.link_counterpart_items()
+
+    for model in (source_model, target_model):
+        yield from model.iter_expand_changed_items(chunk_size)
+    for model in (source_model, target_model):
+        yield from model.iter_build_search_index(chunk_size)
@@ -0,0 +1,84 @@
+from typing import Optional, Set
+
+from hutil.Qt.QtCore import QModelIndex
+
+from ui.constants import PATH_ROLE
+
+
+class ExpansionStore:
+    """
+    Path keyed expansion state of a tree view.
+
+    Only expanded paths are stored, they are updated from expanded
+    and collapsed signals of the view as the user browses, so the tree
+    is never walked to capture its state. A captured snapshot is
+    reapplied only to rows which are present in the filtered model.
+    """
+
+    def __init__(self, treeview):
+        """
+        Initialize the store and start tracking a tree view.
+
+        :param treeview: The tree view, its model has to be set already.
+        """
+        self.treeview = treeview
+        self.expanded_paths: Set[str] = set()
+        self.captured_paths: Optional[Set[str]] = None
+
+        treeview.expanded.connect(self.on_expanded)
+        treeview.collapsed.connect(self.on_collapsed)
+        treeview.model().modelReset.connect(self.clear)
+
+    def on_expanded(self, index: QModelIndex) -> None:
+        """Record an expanded row."""
+        path = index.data(PATH_ROLE)
+        if path:
+            self.expanded_paths.add(path)
+
+    def on_collapsed(self, index: QModelIndex) -> None:
+        """Forget a collapsed row."""
+        self.expanded_paths.discard(index.data(PATH_ROLE))
+
+    def clear(self) -> None:
+        """Forget all paths, e.g. when the model is reset."""
+        self.expanded_paths = set()
+        self.captured_paths = None
+
+    def capture(self) -> None:
+        """Take a snapshot of currently expanded paths."""
+        self.captured_paths = set(self.expanded_paths)
+
+    def has_snapshot(self) -> bool:
+        """Check if a snapshot was captured and not cleared since."""
+        return self.captured_paths is not None
+
+    def restore(self) -> None:
+        """
+        Reapply the captured snapshot.
+
+        Rows expanded since the snapshot are collapsed and captured
+        rows are expanded again, rows hidden by the proxy are skipped.
+        """
+        if self.captured_paths is None:
+            return
+
+        for path in self.expanded_paths - self.captured_paths:
+            index = self._get_visible_index(path)
+            if index.isValid():
+                self.treeview.setExpanded(index, False)
+            self.expanded_paths.discard(path)
+
+        # filtered rows lose their expansion without signals,
+        # so captured rows are expanded even if they are recorded
+        for path in self.captured_paths:
+            index = self._get_visible_index(path)
+            if index.isValid():
+                self.treeview.setExpanded(index, True)
+
+    def _get_visible_index(self, path: str) -> QModelIndex:
+        """Return the view model index of a path, invalid if it's hidden."""
+        model = self.treeview.model()
+        item = model.get_item_by_path(path)
+        if item is None:
+            return QModelIndex()
+        return model.indexFromItem(item)
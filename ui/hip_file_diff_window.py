@@ -11,27 +11,46 @@ from hutil.Qt.QtWidgets import (
     QSplitter,
     QMessageBox,
     QAbstractItemView,
-    QCheckBox
+    QCheckBox,
+    QLabel,
+    QProgressBar
 )
 from hutil.Qt.QtCore import (
     Qt, 
     QSortFilterProxyModel, 
     QEvent, 
-    QItemSelectionModel
+    QItemSelectionModel,
+    QSize,
+    QTimer
 )
 from hutil.Qt.QtGui import QHoverEvent
 
-from api.comparators.houdini_base_comparator import HoudiniComparator, HIP_FILE_FORMATS
+from api.cache.snapshot_cache import SnapshotCache
+from api.comparators.houdini_base_comparator import (
+    DEFAULT_ABS_TOLERANCE,
+    DEFAULT_REL_TOLERANCE,
+    HIP_FILE_FORMATS,
+    HoudiniComparator,
+)
 from api.comparators.hip_comparator import HipFileComparator
+from api.comparators.archive_hip_comparator import ArchiveHipFileComparator
 
+from ui.compare_worker import CompareWorker
 from ui.custom_qtree_view import CustomQTreeView
-from ui.custom_standart_item_model import CustomStandardItemModel
+from ui.diff_tree_model import DiffTreeModel, iter_aligned_population
 from ui.hatched_pattern_item_delegate import HatchedItemDelegate
+from ui.icon_cache import ICON_SIZE
 from ui.file_selector import FileSelector
 from ui.search_line_edit import QTreeViewSearch
 from ui.string_diff_dialog import StringDiffDialog
 
 
+COMPARATOR_BACKENDS = {
+    "hython": HipFileComparator,
+    "archive": ArchiveHipFileComparator,
+}
+
+
 class HipFileDiffWindow(QMainWindow):
     """
     Main window for displaying the differences between two .hip files.
@@ -43,6 +62,9 @@ class HipFileDiffWindow(QMainWindow):
     def __init__(self, args):
         super(HipFileDiffWindow, self).__init__()
         self.houdini_comparator: HoudiniComparator = None
+        self.compare_worker: CompareWorker = None
+        self.population = None
+        self.pending_item_path = None
         self.args = args
         self.init_ui(args)
 
@@ -52,6 +74,7 @@ class HipFileDiffWindow(QMainWindow):
         self.setup_layouts()
         self.setup_tree_views()
         self.setup_checkboxes()
+        self.setup_progress_bar()
         self.setup_signals_and_slots()
         self.apply_stylesheet()
 
@@ -64,19 +87,12 @@ class HipFileDiffWindow(QMainWindow):
         if args.target_file_path:
             self.target_file_line_edit.setText(args.target_file_path)
 
+        # opened once the comparison started below is shown
+        self.pending_item_path = args.item_path
+
         if args.source_file_path and args.target_file_path:
             self.handle_compare_button_click()
 
-        if args.item_path:
-            item = self.source_model.get_item_by_path(args.item_path)
-            if not item:
-                QMessageBox.critical(
-                    None, "Error", "Specified item on this path was not found!"
-                )
-            else:
-                self.source_treeview.expand_to_index(item, self.source_treeview)
-                self.on_item_double_clicked(item.index())
-
         self.show_only_edited_checkbox.setChecked(True)
 
 
@@ -122,9 +138,16 @@ class HipFileDiffWindow(QMainWindow):
         self.load_button.setFixedHeight(30)
         self.load_button.setFixedWidth(100)
 
+        self.cancel_button = QPushButton("Cancel", self)
+        self.cancel_button.setObjectName("cancelButton")
+        self.cancel_button.setFixedHeight(30)
+        self.cancel_button.setFixedWidth(100)
+        self.cancel_button.hide()
+
         self.target_top_hlayout = QHBoxLayout()
         self.target_top_hlayout.addWidget(self.target_file_line_edit)
         self.target_top_hlayout.addWidget(self.load_button)
+        self.target_top_hlayout.addWidget(self.cancel_button)
 
         self.target_widget = QWidget()
         self.target_layout = QVBoxLayout(self.target_widget)
@@ -136,7 +159,7 @@ class HipFileDiffWindow(QMainWindow):
         Setup QTreeViews and associate models for source and target sections.
         """
         self.source_treeview = self.create_tree_view("source")
-        self.source_model = CustomStandardItemModel()
+        self.source_model = DiffTreeModel()
         self.source_model.set_view(self.source_treeview)
         self.source_treeview.setModel(self.source_model)
         self.source_layout.addWidget(self.source_treeview)
@@ -144,7 +167,7 @@ class HipFileDiffWindow(QMainWindow):
         self.target_treeview = self.create_tree_view(
             "target", hide_scrollbar=False
         )
-        self.target_model = CustomStandardItemModel()
+        self.target_model = DiffTreeModel()
         self.target_model.set_view(self.target_treeview)
         self.target_treeview.setModel(self.target_model)
         self.target_layout.addWidget(self.target_treeview)
@@ -172,23 +195,11 @@ class HipFileDiffWindow(QMainWindow):
         self.target_search_qline_edit.secondary_proxy_model = (
             self.source_treeview.model()
         )
-        self.target_model.rowsInserted.connect(
-            self.target_search_qline_edit.proxy_model.invalidate
-        )
-        self.target_model.rowsRemoved.connect(
-            self.target_search_qline_edit.proxy_model.invalidate
-        )
 
         self.source_search_qline_edit.secondary_treeview = self.target_treeview
         self.source_search_qline_edit.secondary_proxy_model = (
             self.target_treeview.model()
         )
-        self.source_model.rowsInserted.connect(
-            self.source_search_qline_edit.proxy_model.invalidate
-        )
-        self.source_model.rowsRemoved.connect(
-            self.source_search_qline_edit.proxy_model.invalidate
-        )
 
     def create_tree_view(
         self, obj_name: str, hide_scrollbar: bool = True
@@ -209,6 +220,7 @@ class HipFileDiffWindow(QMainWindow):
 
         tree_view.setObjectName(obj_name)
         tree_view.header().hide()
+        tree_view.setIconSize(QSize(ICON_SIZE, ICON_SIZE))
         tree_view.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
         tree_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
 
@@ -220,6 +232,7 @@ class HipFileDiffWindow(QMainWindow):
     def setup_signals_and_slots(self) -> None:
         """Connect signals to their respective slots."""
         self.load_button.clicked.connect(self.handle_compare_button_click)
+        self.cancel_button.clicked.connect(self.cancel_comparison)
 
         self.connect_tree_view_expansion(self.source_treeview)
         self.connect_tree_view_expansion(self.target_treeview)
@@ -269,29 +282,7 @@ class HipFileDiffWindow(QMainWindow):
         - index: QModelIndex of the item being hovered/unhovered.
         - hover (bool): If True, item is hovered. If False, it's unhovered.
         """
-        event_proxy_model = index.model()
-        if isinstance(event_proxy_model, QSortFilterProxyModel):
-            event_source_model = event_proxy_model.sourceModel()
-        else:
-            event_source_model = event_proxy_model
-
-        if event_source_model == self.source_model:
-            other_view = self.target_treeview
-        else:
-            other_view = self.source_treeview
-
-        event_item = event_source_model.itemFromIndex(
-            event_proxy_model.mapToSource(index)
-        )
-        event_item_path = event_item.data(event_source_model.path_role)
-
-        item_in_other_source_model = (
-            other_view.model().sourceModel().get_item_by_path(event_item_path)
-        )
-
-        index_in_other_proxy = other_view.model().mapFromSource(
-            other_view.model().sourceModel().indexFromItem(item_in_other_source_model)
-        )
+        other_view, index_in_other_proxy = self.get_index_in_other_model(index)
 
         # Create a QHoverEvent and post it to the other tree view
         pos_in_other_view = other_view.visualRect(index_in_other_proxy).center()
@@ -314,13 +305,13 @@ class HipFileDiffWindow(QMainWindow):
             QMainWindow{{
                 background-color: #3c3c3c;
             }}
-            QPushButton#compareButton {{
+            QPushButton#compareButton, QPushButton#cancelButton {{
                 font: 10pt "Arial";
                 color: #818181;
                 background-color: #464646;
                 border-radius: 10px;
             }}
-            QPushButton#compareButton:hover {{
+            QPushButton#compareButton:hover, QPushButton#cancelButton:hover {{
                 color: #919191;
                 background-color: #555555;
                 border: 1px solid rgb(185, 134, 32);
@@ -416,6 +407,18 @@ class HipFileDiffWindow(QMainWindow):
         self.checkbox_h_layout.setContentsMargins(10, 0, 0, 0)
         self.main_layout.addLayout(self.checkbox_h_layout)
 
+    def setup_progress_bar(self) -> None:
+        """Setup progress label and bar shown while comparing files."""
+        self.progress_label = QLabel(self)
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setFixedWidth(300)
+        self.progress_bar.setTextVisible(False)
+
+        self.checkbox_h_layout.addStretch()
+        self.checkbox_h_layout.addWidget(self.progress_label)
+        self.checkbox_h_layout.addWidget(self.progress_bar)
+        self.set_comparing(False)
+
     def handle_compare_button_click(self) -> None:
         """
         Handle the logic when the "Compare" button is clicked.
@@ -447,20 +450,151 @@ class HipFileDiffWindow(QMainWindow):
             )
             return
 
-        self.houdini_comparator = HipFileComparator(source_path, target_path)
-        self.houdini_comparator.compare()
-
-        # Assuming 'comparison_result' contains the differences,
-        # we can now update our tree views based on the results.
-        self.source_model.populate_with_data(
-            self.houdini_comparator.source_data, self.source_treeview.objectName()
+        comparator_class = COMPARATOR_BACKENDS[
+            getattr(self.args, "backend", None) or "hython"
+        ]
+        self.houdini_comparator = comparator_class(
+            source_path,
+            target_path,
+            parallel=getattr(self.args, "parallel", False),
+            cache=SnapshotCache() if getattr(self.args, "cache", False) else None,
+            extraction_mode=getattr(self.args, "mode", None) or "eval",
+            skip_defaults=getattr(self.args, "skip_defaults", False),
+            abs_tolerance=getattr(
+                self.args, "abs_tolerance", DEFAULT_ABS_TOLERANCE
+            ),
+            rel_tolerance=getattr(
+                self.args, "rel_tolerance", DEFAULT_REL_TOLERANCE
+            ),
+            detect_moves=getattr(self.args, "detect_moves", True),
         )
-        self.target_model.populate_with_data(
-            self.houdini_comparator.target_data, self.target_treeview.objectName()
+
+        # compare off the GUI thread, so the window stays responsive
+        self.compare_worker = CompareWorker(self.houdini_comparator)
+        self.compare_worker.progress.connect(self.on_compare_progress)
+        self.compare_worker.finished.connect(self.on_compare_finished)
+        self.compare_worker.cancelled.connect(self.on_compare_cancelled)
+        self.compare_worker.failed.connect(self.on_compare_failed)
+        self.set_comparing(True)
+        self.compare_worker.start()
+
+    def set_comparing(self, comparing: bool) -> None:
+        """Switch between Compare and Cancel buttons, show progress."""
+        self.load_button.setVisible(not comparing)
+        self.cancel_button.setVisible(comparing)
+        self.progress_label.setVisible(comparing)
+        self.progress_bar.setVisible(comparing)
+        if comparing:
+            self.on_compare_progress("Starting", 0, 0)
+
+    def on_compare_progress(self, phase: str, current: int, total: int) -> None:
+        """
+        Show progress reported by the comparator or model population.
+
+        Args:
+        - phase (str): Human readable name of the current phase.
+        - current (int): Number of items processed so far.
+        - total (int): Total number of items, 0 if unknown.
+        """
+        if total:
+            self.progress_label.setText(f"{phase}: {current} / {total}")
+        else:
+            self.progress_label.setText(f"{phase}: {current}")
+        # zero maximum makes the bar show a busy indicator
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(current)
+
+    def on_compare_finished(self) -> None:
+        """Hand compared data to the models in chunks."""
+        self.release_compare_worker()
+        self.population = iter_aligned_population(
+            self.source_model,
+            self.target_model,
+            self.houdini_comparator.source_data,
+            self.houdini_comparator.target_data,
+            self.houdini_comparator.diff_result,
+            self.source_treeview.objectName(),
+            self.target_treeview.objectName(),
         )
+        QTimer.singleShot(0, self.populate_next_chunk)
+
+    def populate_next_chunk(self) -> None:
+        """
+        Populate models by one chunk and schedule the next one.
 
+        Control returns to the event loop between chunks,
+        so the UI keeps repainting and Cancel stays clickable.
+        """
+        if self.population is None:
+            return
+
+        try:
+            phase, current, total = next(self.population)
+        except StopIteration:
+            self.population = None
+            self.on_population_finished()
+            return
+
+        self.on_compare_progress(phase, current, total)
+        QTimer.singleShot(0, self.populate_next_chunk)
+
+    def on_population_finished(self) -> None:
+        """Refresh filtering and open an item requested by a link."""
         self.source_treeview.model().invalidateFilter()
         self.target_treeview.model().invalidateFilter()
+        self.set_comparing(False)
+
+        item_path, self.pending_item_path = self.pending_item_path, None
+        if not item_path:
+            return
+
+        item = self.source_model.get_item_by_path(item_path)
+        if not item:
+            QMessageBox.critical(
+                None, "Error", "Specified item on this path was not found!"
+            )
+        else:
+            self.source_treeview.expand_to_index(item, self.source_treeview)
+            self.on_item_double_clicked(item.index())
+
+    def cancel_comparison(self) -> None:
+        """Cancel a running comparison or model population."""
+        if self.compare_worker:
+            self.progress_label.setText("Cancelling...")
+            self.compare_worker.cancel()
+            return
+
+        if self.population is not None:
+            self.population = None
+            self.on_compare_cancelled()
+
+    def on_compare_cancelled(self) -> None:
+        """Drop partial results of a cancelled comparison."""
+        self.release_compare_worker()
+        self.pending_item_path = None
+        self.source_model.clear()
+        self.target_model.clear()
+        self.set_comparing(False)
+
+    def on_compare_failed(self, message: str) -> None:
+        """Report an error raised during comparison."""
+        self.on_compare_cancelled()
+        QMessageBox.critical(self, "Comparison failed", message)
+
+    def release_compare_worker(self) -> None:
+        """Wait for the worker thread to finish and drop the worker."""
+        if not self.compare_worker:
+            return
+        self.compare_worker.thread.wait()
+        self.compare_worker = None
+
+    def closeEvent(self, event) -> None:
+        """Stop a running comparison before the window is closed."""
+        if self.compare_worker:
+            self.compare_worker.cancel()
+            self.release_compare_worker()
+        self.population = None
+        super(HipFileDiffWindow, self).closeEvent(event)
 
     def on_checkbox_toggled(self, state) -> None:
         """
@@ -485,10 +619,10 @@ class HipFileDiffWindow(QMainWindow):
             self.source_treeview.model().reset_proxy_view()
             self.target_treeview.model().reset_proxy_view()
 
-            if self.source_search_qline_edit.expanded_state:
+            if self.source_search_qline_edit.expansion_store.has_snapshot():
                 self.source_search_qline_edit.restore_tree_state()
     
-            if self.target_search_qline_edit.expanded_state:
+            if self.target_search_qline_edit.expansion_store.has_snapshot():
                 self.target_search_qline_edit.restore_tree_state()
 
     def sync_expand(self, index, expand: bool = True) -> None:
@@ -503,32 +637,34 @@ class HipFileDiffWindow(QMainWindow):
         other_view.setExpanded(index_in_other_proxy, expand)
 
     def get_index_in_other_model(self, index):
-        event_proxy_model = index.model()
-        if isinstance(event_proxy_model, QSortFilterProxyModel):
-            event_source_model = event_proxy_model.sourceModel()
-        else:
-            event_source_model = event_proxy_model
-            event_proxy_model = event_proxy_model.proxy_model
-            index = event_proxy_model.mapFromSource(index)
+        """
+        Return the other tree view and the index of the same row in it.
+
+        Rows of both models are aligned and linked, so the other row
+        is the counterpart of the item, no paths are looked up.
+
+        Args:
+        - index: QModelIndex of a proxy or a source model.
+
+        Returns:
+        - Tuple of the other tree view and a proxy index in it,
+          the index is invalid if the row is filtered out.
+        """
+        event_model = index.model()
+        if isinstance(event_model, QSortFilterProxyModel):
+            index = event_model.mapToSource(index)
+            event_model = event_model.sourceModel()
 
-        if event_source_model == self.source_model:
+        if event_model is self.source_model:
             other_view = self.target_treeview
         else:
             other_view = self.source_treeview
 
-        event_item = event_source_model.itemFromIndex(
-            event_proxy_model.mapToSource(index)
-        )
-        event_item_path = event_item.data(event_source_model.path_role)
-
-        item_in_other_source_model = (
-            other_view.model().sourceModel().get_item_by_path(event_item_path)
-        )
-
-        index_in_other_proxy = other_view.model().mapFromSource(
-            other_view.model()
-            .sourceModel()
-            .indexFromItem(item_in_other_source_model)
+        item = event_model.itemFromIndex(index)
+        counterpart = item.counterpart if item else None
+        other_proxy_model = other_view.model()
+        index_in_other_proxy = other_proxy_model.mapFromSource(
+            other_proxy_model.sourceModel().indexFromItem(counterpart)
         )
         return other_view, index_in_other_proxy
 
@@ -0,0 +1,138 @@
+"""
+This module provides a process wide cache of icons shown in tree views.
+"""
+import os
+import zipfile
+from typing import Dict, Optional
+
+from hutil.Qt.QtCore import QSize
+from hutil.Qt.QtGui import QIcon, QPixmap
+
+from ui.constants import ICONS_ZIP_PATH, ICON_MAPPINGS
+
+
+ICON_CACHE_DIR_ENV = "HOUDINI_HIP_DIFF_ICON_CACHE_DIR"
+ICON_SIZE = 16
+
+
+def resolve_icon_name(icon: str) -> str:
+    """
+    Resolve a Houdini icon name to a path inside of the icons zip.
+
+    :param icon: Icon name as returned by hou.NodeType.icon(),
+                 e.g. "SOP_attribwrangle".
+    :return: Path of the SVG file, e.g. "SOP/attribwrangle.svg",
+             or an empty string if there is no icon.
+    """
+    if not icon:
+        return ""
+    icon_name = ICON_MAPPINGS.get(icon, icon)
+    return icon_name.replace("_", "/", 1) + ".svg"
+
+
+class IconCache:
+    """
+    Cache of decoded icons keyed by their path inside of the icons zip.
+
+    Every icon is decoded once per process no matter how many rows
+    show it. Optionally icons are also rasterized to PNG files at
+    the tree icon size, so next sessions skip SVG parsing entirely.
+    """
+
+    def __init__(
+        self, cache_dir: Optional[str] = None, icon_size: int = ICON_SIZE
+    ):
+        """
+        Initialize the cache.
+
+        :param cache_dir: Directory to store rasterized PNG icons in.
+                          Defaults to HOUDINI_HIP_DIFF_ICON_CACHE_DIR
+                          environment variable, if it isn't set
+                          icons are kept in memory only.
+        :param icon_size: Size of rasterized icons in pixels.
+        """
+        self.cache_dir = cache_dir or os.environ.get(ICON_CACHE_DIR_ENV)
+        self.icon_size = icon_size
+        self._icons: Dict[str, QIcon] = {}
+        self._icons_zip: Optional[zipfile.ZipFile] = None
+
+    def get_icon(self, icon_path: str) -> Optional[QIcon]:
+        """
+        Return the icon of a given path inside of the icons zip.
+
+        :param icon_path: Path returned by resolve_icon_name.
+        :return: The icon, or None for an empty path. Icons missing
+                 in the zip are cached as null icons.
+        """
+        if not icon_path:
+            return None
+
+        icon = self._icons.get(icon_path)
+        if icon is None:
+            icon = self._load_png(icon_path) or self._load_svg(icon_path)
+            self._icons[icon_path] = icon
+        return icon
+
+    def clear(self) -> None:
+        """Drop all icons decoded in memory."""
+        self._icons = {}
+        if self._icons_zip is not None:
+            self._icons_zip.close()
+            self._icons_zip = None
+
+    def _get_png_path(self, icon_path: str) -> Optional[str]:
+        """Return the path of a rasterized icon in the cache directory."""
+        if not self.cache_dir:
+            return None
+        # Icons zip of another version invalidates rasterized icons.
+        zip_stat = os.stat(ICONS_ZIP_PATH)
+        stamp = f"{zip_stat.st_size:x}{int(zip_stat.st_mtime):x}"
+        file_name = os.path.splitext(icon_path)[0].replace("/", "_") + ".png"
+        return os.path.join(
+            self.cache_dir, f"{self.icon_size}px_{stamp}", file_name
+        )
+
+    def _load_png(self, icon_path: str) -> Optional[QIcon]:
+        """Load a rasterized icon from the cache directory."""
+        try:
+            png_path = self._get_png_path(icon_path)
+        except OSError:
+            return None
+        if not png_path or not os.path.isfile(png_path):
+            return None
+
+        pixmap = QPixmap(png_path)
+        if pixmap.isNull():
+            return None
+        return QIcon(pixmap)
+
+    def _load_svg(self, icon_path: str) -> QIcon:
+        """Decode an icon from the icons zip and rasterize it if enabled."""
+        try:
+            if self._icons_zip is None:
+                self._icons_zip = zipfile.ZipFile(ICONS_ZIP_PATH, "r")
+            with self._icons_zip.open(icon_path) as file:
+                pixmap = QPixmap()
+                pixmap.loadFromData(file.read())
+        except Exception:
+            return QIcon()
+
+        icon = QIcon(pixmap)
+        self._save_png(icon_path, icon)
+        return icon
+
+    def _save_png(self, icon_path: str, icon: QIcon) -> None:
+        """Store an icon rasterized at the icon size in the cache directory."""
+        try:
+            png_path = self._get_png_path(icon_path)
+            if not png_path:
+                return
+            os.makedirs(os.path.dirname(png_path), exist_ok=True)
+            icon.pixmap(QSize(self.icon_size, self.icon_size)).save(
+                png_path, "PNG"
+            )
+        except OSError:
+            pass
+
+
+ICON_CACHE = IconCache()
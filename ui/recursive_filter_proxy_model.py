@@ -1,9 +1,9 @@
 from typing import Optional, Set
 
 from hutil.Qt.QtCore import QSortFilterProxyModel, QModelIndex
-from hutil.Qt.QtGui import QStandardItem
 
 from ui.constants import DATA_ROLE, PATH_ROLE
+from ui.diff_tree_model import DiffTreeItem
 from api.data.item_data import ItemState
 
 
@@ -17,7 +17,7 @@ class RecursiveFilterProxyModel(QSortFilterProxyModel):
         super().__init__(*args, **kwargs)
         self.path_role = PATH_ROLE
         self.data_role = DATA_ROLE
-        self._filtered_paths: Set[str] = set()
+        self._filtered_paths: Optional[Set[str]] = None
 
     def filterAcceptsRow(
         self, source_row: int, source_parent: QModelIndex
@@ -27,7 +27,10 @@ class RecursiveFilterProxyModel(QSortFilterProxyModel):
         item_path = self.sourceModel().data(source_index, self.path_role)
 
         # If there's an active filter for paths and the item's path isn't in it, reject this row.
-        if self._filtered_paths and item_path not in self._filtered_paths:
+        if (
+            self._filtered_paths is not None
+            and item_path not in self._filtered_paths
+        ):
             return False
 
         # If source model has a condition to show only edited items
@@ -59,19 +62,13 @@ class RecursiveFilterProxyModel(QSortFilterProxyModel):
         """
         Check the condition for a given item.
 
+        The source model answers from change counts precomputed
+        by the comparator, so no rows are walked.
+
         :param index: QModelIndex representing the item.
-        :return: True if the item matches the condition, False otherwise.
+        :return: True if the item or any of its descendants has changes.
         """
-        state_value = self.sourceModel().data(index, self.data_role).state
-        if state_value not in [ItemState.UNCHANGED]:
-            return True
-
-        for i in range(self.sourceModel().rowCount(index)):
-            child_index = self.sourceModel().index(i, 0, index)
-            if self.conditionForItem(child_index):
-                return True
-
-        return False
+        return self.sourceModel().has_changes(index)
 
     def filter_accepts_row_itself(
         self, source_row: int, source_parent: QModelIndex
@@ -79,38 +76,39 @@ class RecursiveFilterProxyModel(QSortFilterProxyModel):
         """Check if the source row itself meets the filter criteria."""
         return super().filterAcceptsRow(source_row, source_parent)
 
-    def itemFromIndex(self, proxy_index: QModelIndex) -> QStandardItem:
+    def itemFromIndex(self, proxy_index: QModelIndex) -> DiffTreeItem:
         """Retrieve the item from the source model corresponding to the given proxy index."""
         source_index = self.mapToSource(proxy_index)
         return self.sourceModel().itemFromIndex(source_index)
 
-    def indexFromItem(self, item: QStandardItem) -> QModelIndex:
-        """Retrieve the proxy model index corresponding to the given QStandardItem."""
+    def indexFromItem(self, item: DiffTreeItem) -> QModelIndex:
+        """Retrieve the proxy model index corresponding to the given DiffTreeItem."""
         source_index = self.sourceModel().indexFromItem(item)
         return self.mapFromSource(source_index)
 
-    def get_item_by_path(self, path: str) -> Optional[QStandardItem]:
+    def get_item_by_path(self, path: str) -> Optional[DiffTreeItem]:
         """
         Retrieve an item by its unique path.
 
         :param path: Unique path identifier for the item.
-        :return: QStandardItem if found, otherwise None.
+        :return: DiffTreeItem if found, otherwise None.
         """
-        item_dictionary = getattr(self.sourceModel(), "item_dictionary", None)
-        return item_dictionary.get(path) if item_dictionary else None
+        get_item_by_path = getattr(self.sourceModel(), "get_item_by_path", None)
+        return get_item_by_path(path) if get_item_by_path else None
 
-    def set_filtered_paths(self, paths: Set[str]) -> None:
+    def set_filtered_paths(self, paths: Optional[Set[str]]) -> None:
         """
         Define a set of paths to filter by.
 
-        :param paths: Set of paths to be used for filtering.
+        :param paths: Set of paths to be used for filtering, an empty
+                      set hides all rows and None disables the filter.
         """
         self._filtered_paths = paths
         self.invalidateFilter()
 
     def reset_proxy_view(self) -> None:
         """Reset the view by clearing filters and sorting."""
-        self.set_filtered_paths(set())  # Clear the paths filter
+        self.set_filtered_paths(None)  # Clear the paths filter
         self.setFilterFixedString("")
         self.sort(-1)
         self.invalidateFilter()
@@ -1,16 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 import os
 from typing import Set, Optional
 
 from hutil.Qt.QtWidgets import QWidget, QLineEdit, QAbstractItemView, QAction
-from hutil.Qt.QtCore import Qt
+from hutil.Qt.QtCore import QTimer, Signal
 from hutil.Qt.QtGui import QPixmap, QIcon
 
-from ui.constants import PATH_ROLE, ICONS_PATH
+from api.search_index import IncrementalSearch, SearchResult
+from ui.constants import ICONS_PATH
+from ui.expansion_store import ExpansionStore
 from ui.recursive_filter_proxy_model import RecursiveFilterProxyModel
 
 
+# Milliseconds to wait after the last keystroke before searching.
+SEARCH_DEBOUNCE_INTERVAL = 250
+# Maximum number of matches revealed by expanding their ancestors.
+MAX_EXPANDED_MATCHES = 100
+
+
 class QTreeViewSearch(QLineEdit):
-    """Search widget for filtering items within a QTreeView."""
+    """
+    Search widget for filtering items within a QTreeView.
+
+    Searching starts once typing pauses and runs in a background
+    thread, the search refines matches of the previous query when
+    the query is extended. Results of outdated queries are dropped.
+    """
+
+    # emitted from the search thread with (generation, result)
+    search_finished = Signal(int, object)
 
     def __init__(
         self, treeview, target_model, parent: Optional[QWidget] = None
@@ -29,7 +48,7 @@ class QTreeViewSearch(QLineEdit):
         self.target_model.proxy_model = self.proxy_model
         self.treeview.setModel(self.proxy_model)
 
-        self.expanded_state = {}
+        self.expansion_store = ExpansionStore(self.treeview)
         self.setPlaceholderText("Search")
 
         pixmap = QPixmap(os.path.join(ICONS_PATH, "search.png"))
@@ -41,10 +60,19 @@ class QTreeViewSearch(QLineEdit):
         self.secondary_treeview = None
         self.second_search = None
 
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_INTERVAL)
+        self.search_executor = ThreadPoolExecutor(max_workers=1)
+        self.incremental_search = None
+        self.search_generation = 0
+
     def init_events(self):
         """Connect UI events to their handlers."""
         self.search_action.triggered.connect(self.filter_tree_view)
-        self.textChanged.connect(self.filter_tree_view)
+        self.textChanged.connect(self.search_timer.start)
+        self.search_timer.timeout.connect(self.filter_tree_view)
+        self.search_finished.connect(self.apply_search_result)
         self.returnPressed.connect(self.select_first_match)
 
     def init_styles(self):
@@ -66,59 +94,95 @@ class QTreeViewSearch(QLineEdit):
         )
 
     def filter_tree_view(self):
-        """Apply filter on tree view based on search input."""
-        self.proxy_model.reset_proxy_view()
-        self.secondary_proxy_model.reset_proxy_view()
+        """
+        Start searching for the current input in a background thread.
+
+        An empty input restores both tree views immediately.
+        """
+        self.search_timer.stop()
+        self.search_generation += 1
 
         search_text = self.text().strip()
         if not search_text:
+            self.proxy_model.reset_proxy_view()
+            self.secondary_proxy_model.reset_proxy_view()
             self.restore_tree_state()
             if self.second_search:
                 self.second_search.restore_tree_state()
             return
 
-        self.proxy_model.setFilterRole(Qt.DisplayRole)
-        self.proxy_model.setFilterFixedString(search_text)
-        self.proxy_model.setFilterCaseSensitivity(Qt.CaseInsensitive)
-
-        self.proxy_model.invalidateFilter()
-        self.synchronize_trees()
-
-    def synchronize_trees(self):
-        """Keep the primary and secondary tree views in sync."""
-        visible_paths = self.get_visible_paths()
-        self.filter_secondary_tree(visible_paths)
+        # a new comparison replaces the index of the model
+        search_index = self.target_model.search_index
+        if (
+            self.incremental_search is None
+            or self.incremental_search.index is not search_index
+        ):
+            self.incremental_search = IncrementalSearch(search_index)
+
+        self.search_executor.submit(
+            self.run_search,
+            self.search_generation,
+            self.incremental_search,
+            search_text,
+        )
 
-    def get_visible_paths(self) -> Set[str]:
-        """Retrieve paths that are visible in the primary tree view."""
-        visible_paths = set()
-        root = self.proxy_model.index(0, 0)
-        self.collect_paths(root, visible_paths)
-        return visible_paths
+    def run_search(
+        self, generation: int, search: IncrementalSearch, search_text: str
+    ) -> None:
+        """Resolve a query, runs in the search thread."""
+        if generation != self.search_generation:
+            return
 
-    def collect_paths(self, index, paths: Set[str]):
-        """Recursively gather paths visible from the given index."""
-        if not index.isValid():
+        try:
+            result = search.search(search_text)
+        except ValueError:
+            # incomplete regex while typing, show no matches
+            result = None
+        self.search_finished.emit(generation, result)
+
+    def apply_search_result(
+        self, generation: int, result: Optional[SearchResult]
+    ) -> None:
+        """Filter both tree views by a search result of the current query."""
+        if generation != self.search_generation:
             return
 
-        paths.add(self.proxy_model.data(index, PATH_ROLE))
-        for row in range(self.proxy_model.rowCount(index)):
-            child_index = self.proxy_model.index(row, 0, index)
-            self.collect_paths(child_index, paths)
+        paths = result.paths if result else set()
+        self.filter_secondary_tree(paths)
+        if result:
+            self.expand_matches(result)
 
     def filter_secondary_tree(self, paths: Set[str]):
-        """Update items in the secondary tree view based on provided paths."""
-        self.secondary_proxy_model.setFilterFixedString("")
-        if not paths:
-            self.secondary_proxy_model.setFilterFixedString(
-                "ImpossibleStringThatMatchesNothing"
-            )
+        """Update items in both tree views based on provided paths."""
+        self.target_model.fetch_paths(paths)
+        self.proxy_model.set_filtered_paths(paths)
+        if not self.secondary_proxy_model:
             return
 
+        # trees are aligned, so matched rows exist on both sides
+        self.secondary_proxy_model.sourceModel().fetch_paths(paths)
+        self.secondary_proxy_model.set_filtered_paths(paths)
+
+    def expand_matches(self, result: SearchResult) -> None:
+        """
+        Reveal the first matches in both tree views.
+
+        Only ancestors of the first MAX_EXPANDED_MATCHES matches are
+        expanded, the rest stays under collapsed, but filtered, rows.
+        """
+        matches = islice(
+            result.iter_matches(self.incremental_search.index),
+            MAX_EXPANDED_MATCHES,
+        )
+        views = [(self.treeview, self.proxy_model)]
         if self.secondary_proxy_model:
-            self.secondary_proxy_model.set_filtered_paths(paths)
-            self.proxy_model.set_filtered_paths(paths)
-            self.secondary_treeview.expandAll()
+            views.append((self.secondary_treeview, self.secondary_proxy_model))
+
+        for path in matches:
+            for treeview, proxy_model in views:
+                item = proxy_model.get_item_by_path(path)
+                if item is not None:
+                    treeview.expand_to_index(item, treeview)
 
     def select_first_match(self):
         """Highlight the first item in tree view that matches the search."""
@@ -131,33 +195,11 @@ class QTreeViewSearch(QLineEdit):
 
     def capture_tree_state(self):
         """Remember the current expanded/collapsed state of tree view items."""
-        for row in range(self.treeview.model().rowCount()):
-            index = self.treeview.model().index(row, 0)
-            self._capture_state(index)
-
-    def _capture_state(self, index):
-        """Recursively store the state of tree view items."""
-        if index.isValid():
-            path = self.treeview.model().data(index, PATH_ROLE)
-            self.expanded_state[path] = self.treeview.isExpanded(index)
-            for row in range(self.treeview.model().rowCount(index)):
-                child_index = self.treeview.model().index(row, 0, index)
-                self._capture_state(child_index)
+        self.expansion_store.capture()
 
     def restore_tree_state(self):
         """Restore the expanded/collapsed state of tree view items."""
-        for row in range(self.treeview.model().rowCount()):
-            index = self.treeview.model().index(row, 0)
-            self._restore_state(index)
-
-    def _restore_state(self, index):
-        """Recursively restore the state of tree view items."""
-        if index.isValid():
-            path = self.treeview.model().data(index, PATH_ROLE)
-            self.treeview.setExpanded(index, self.expanded_state.get(path, False))
-            for row in range(self.treeview.model().rowCount(index)):
-                child_index = self.treeview.model().index(row, 0, index)
-                self._restore_state(child_index)
+        self.expansion_store.restore()
 
     def focusInEvent(self, event):
         """Handle the focus-in event and capture the tree state."""
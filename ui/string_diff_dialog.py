@@ -1,11 +1,8 @@
-import difflib
-
-from hutil.Qt.QtWidgets import QDialog, QTextEdit, QVBoxLayout, QHBoxLayout
+from hutil.Qt.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout
 from hutil.Qt.QtGui import QColor, QPalette, QColor
 from hutil.Qt.QtWidgets import (
     QDialog, 
     QWidget, 
-    QTextEdit, 
     QVBoxLayout, 
     QSplitter, 
     QPushButton,  
@@ -14,9 +11,14 @@ from hutil.Qt.QtWidgets import (
 from hutil.Qt.QtCore import Qt, QTimer, QEvent
 
 from ui.constants import PATH_ROLE
-from ui.hatched_text_edit import HatchedTextEdit
+from ui.diff_text_view import (
+    SOURCE_SIDE,
+    TARGET_SIDE,
+    DiffTextView,
+    LineNumberArea,
+)
 from ui.ui_utils import generate_link_to_clipboard
-from api.comparators.houdini_base_comparator import COLORS
+from api.string_diff import StringDiff
 
 
 class Overlay(QWidget):
@@ -79,13 +81,6 @@ class StringDiffDialog(QDialog):
             QDialog{
                 background-color: #333333;
             }
-
-            QTextEdit{
-                font: 10pt "DS Houdini";
-                color: #dfdfdf;
-                background-color: #333333;
-                border:none;
-            }
             """
         )
         
@@ -174,45 +169,13 @@ class StringDiffDialog(QDialog):
         self.top_buttons_hbox_layout.addWidget(self.copy_path_button)
         self.top_buttons_hbox_layout.addWidget(self.node_path_line_edit)
 
-        # Split texts into lines for difflib processing
-        old_lines = source_text.splitlines()
-        new_lines = target_text.splitlines()
-
         # Get diffs
-        diff = difflib.Differ()
-        diffs = list(diff.compare(old_lines, new_lines))
-
-
-        self.new_text_hashed_line_numbers = []
-        self.old_text_hashed_line_numbers = []
-        # Process the diffs and get formatted strings for both QTextEdits
-        old_html, new_html = self.process_diffs(diffs)
-
-        # Create text edits and set their content
-        self.line_nums_qtedit = QTextEdit(self)
-        self.line_nums_qtedit.setReadOnly(True)
-        self.line_nums_qtedit.setLineWrapMode(QTextEdit.NoWrap)
-        self.line_nums_qtedit.setFixedWidth(60)
-        self.line_nums_qtedit.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.line_nums_qtedit.setStyleSheet(
-            """
-                font: 10pt "DS Houdini";
-                color: #dfdfdf;
-                background-color: #333333;
-                border-right: 1px solid #4d4d4d;
-            """
-        )
-
-        line_nums = []
-        for lin_num in range(0, len(old_html)):
-            line_nums.append(f'<div style="text-align: right;">{str(lin_num)}</div>')
-        self.line_nums_qtedit.setHtml(''.join(line_nums))
+        self.string_diff = StringDiff(source_text, target_text)
 
-        text_edit_stylesheet = """
-            QTextEdit {
-                font: 10pt "DS Houdini";
-                color: #dfdfdf;
+        text_view_stylesheet = """
+            QAbstractScrollArea {
                 background-color: #333333;
+                border: none;
             }
             QScrollBar:vertical {
                 border: none;
@@ -257,33 +220,29 @@ class StringDiffDialog(QDialog):
             }
             """
 
-        # Create text edits and set their content
-        self.old_text_edit = HatchedTextEdit(self)
-        self.old_text_edit.setReadOnly(True)
-        self.old_text_edit.setLineWrapMode(QTextEdit.NoWrap)
-        self.old_text_edit.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.old_text_edit.setStyleSheet(text_edit_stylesheet)
-        self.old_text_edit.setHtml(''.join(old_html))
-        self.old_text_edit.text_lines = old_html
+        # Create text views, they paint only rows visible in their viewports
+        self.old_text_view = DiffTextView(SOURCE_SIDE, self)
+        self.old_text_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.old_text_view.setStyleSheet(text_view_stylesheet)
+        self.old_text_view.set_diff(self.string_diff)
+
+        self.line_nums_area = LineNumberArea(self.old_text_view, self)
 
         widget = QWidget()
         hlayout = QHBoxLayout(widget)
         hlayout.setSpacing(0)
         hlayout.setContentsMargins(0, 0, 0, 0)
-        hlayout.addWidget(self.line_nums_qtedit)
-        hlayout.addWidget(self.old_text_edit)
+        hlayout.addWidget(self.line_nums_area)
+        hlayout.addWidget(self.old_text_view)
 
-        self.new_text_edit = HatchedTextEdit(self)
-        self.new_text_edit.setReadOnly(True)
-        self.new_text_edit.setLineWrapMode(QTextEdit.NoWrap)
-        self.new_text_edit.setHtml(''.join(new_html))
-        self.new_text_edit.text_lines = new_html
-        self.new_text_edit.setStyleSheet(text_edit_stylesheet)
+        self.new_text_view = DiffTextView(TARGET_SIDE, self)
+        self.new_text_view.setStyleSheet(text_view_stylesheet)
+        self.new_text_view.set_diff(self.string_diff)
 
-        # Create a splitter and add text edits to it
+        # Create a splitter and add text views to it
         self.splitter = QSplitter(Qt.Horizontal, self)
         self.splitter.addWidget(widget)
-        self.splitter.addWidget(self.new_text_edit)
+        self.splitter.addWidget(self.new_text_view)
         self.splitter.setHandleWidth(1)
         self.splitter.setStyleSheet("""
             QSplitter::handle {
@@ -302,19 +261,19 @@ class StringDiffDialog(QDialog):
         self.overlay = Overlay(self.parent_application)
         self.overlay.show()
 
-        self.old_text_edit.verticalScrollBar().valueChanged.connect(
+        self.old_text_view.verticalScrollBar().valueChanged.connect(
             self.sync_scroll
         )
         
-        self.new_text_edit.verticalScrollBar().valueChanged.connect(
+        self.new_text_view.verticalScrollBar().valueChanged.connect(
             self.sync_scroll
         )
         
-        self.old_text_edit.horizontalScrollBar().valueChanged.connect(
+        self.old_text_view.horizontalScrollBar().valueChanged.connect(
             self.sync_scroll
         )
         
-        self.new_text_edit.horizontalScrollBar().valueChanged.connect(
+        self.new_text_view.horizontalScrollBar().valueChanged.connect(
             self.sync_scroll
         )
 
@@ -361,39 +320,6 @@ class StringDiffDialog(QDialog):
             self.centerOnParent()
         return super().eventFilter(obj, event)
 
-    def process_diffs(self, diffs) -> (list, list):
-        """
-        Processes a list of diffs to generate formatted HTML strings for display.
-
-        Args:
-            diffs (list): A list of diffs generated by difflib.
-
-        Returns:
-            tuple: A tuple containing two lists of HTML strings representing the diffs.
-        """
-        old_html = []
-        new_html = []
-
-        green_with_50_alpha = "#%s" + COLORS["green"][1:]
-        red_with_50_alpha = "#%s" + COLORS["red"][1:]
-
-        for diff in diffs:
-            opcode = diff[0]
-            text = diff[2:]
-
-            text_display = text if text.strip() != "" else "&nbsp;"
-            if opcode == ' ':
-                old_html.append(f'<div>{text_display}</div>')
-                new_html.append(f'<div>{text_display}</div>')
-            elif opcode == '-':
-                old_html.append(f'<div style="background-color: {red_with_50_alpha % 40};">{text_display}</div>')
-                new_html.append(f'<div data_hashed_line=True>&nbsp;</div>')
-            elif opcode == '+':
-                old_html.append(f'<div data_hashed_line=True>&nbsp;</div>')
-                new_html.append(f'<div style="background-color: {green_with_50_alpha % 40};">{text_display}</div>')
-
-        return old_html, new_html
-    
     def sync_scroll(self, value: int) -> None:
         """
         Synchronizes the scrolling between two text edits.
@@ -405,15 +331,15 @@ class StringDiffDialog(QDialog):
         source_scrollbar = self.sender()
 
         # Determine the target scrollbar for synchronization
-        if source_scrollbar == self.old_text_edit.verticalScrollBar():
-            target_scrollbar = self.new_text_edit.verticalScrollBar()
-        elif source_scrollbar == self.new_text_edit.verticalScrollBar():
-            target_scrollbar = self.old_text_edit.verticalScrollBar()
-
-        elif source_scrollbar == self.old_text_edit.horizontalScrollBar():
-            target_scrollbar = self.new_text_edit.horizontalScrollBar()
-        elif source_scrollbar == self.new_text_edit.horizontalScrollBar():
-            target_scrollbar = self.old_text_edit.horizontalScrollBar()
+        if source_scrollbar == self.old_text_view.verticalScrollBar():
+            target_scrollbar = self.new_text_view.verticalScrollBar()
+        elif source_scrollbar == self.new_text_view.verticalScrollBar():
+            target_scrollbar = self.old_text_view.verticalScrollBar()
+
+        elif source_scrollbar == self.old_text_view.horizontalScrollBar():
+            target_scrollbar = self.new_text_view.horizontalScrollBar()
+        elif source_scrollbar == self.new_text_view.horizontalScrollBar():
+            target_scrollbar = self.old_text_view.horizontalScrollBar()
 
         # Update the target's scrollbar position to match the source's
         target_scrollbar.setValue(value)